@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Achievement Index Benchmark
+Compares per-JD achievement and tool scoring through the inverted index against the per-term scans
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+from html_content_processor import HTMLContentProcessor
+from achievement_index import AchievementIndex
+from corpus import RESUME_MARKDOWN, build_jd_corpora, build_jd_corpus
+
+def legacy_scores(processor: HTMLContentProcessor, achievements: list, tools: list) -> tuple:
+    """Reference implementation: every JD term scanned against every achievement and tool"""
+    achievement_scores = [processor._score_achievement(achievement) for achievement in achievements]
+    tool_scores = [processor._score_tool(tool) for tool in tools]
+    return achievement_scores, tool_scores
+
+def index_scores(processor: HTMLContentProcessor, index: AchievementIndex) -> tuple:
+    return index.scores(processor.jd_analysis), index.tool_scores(processor.jd_analysis)
+
+def time_call(func, processors, repeat: int) -> float:
+    """Return best-of-repeat seconds per JD"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for processor in processors:
+            func(processor)
+        best = min(best, time.perf_counter() - started)
+    return best / len(processors)
+
+def main():
+    """Run the achievement index benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark inverted-index achievement scoring')
+    parser.add_argument('--corpus-size', type=int, default=100, help='Synthetic JDs per kind')
+    parser.add_argument('--achievements', type=int, default=500,
+                        help='Synthetic achievements added to the resume for the large case')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+    
+    with redirect_stdout(io.StringIO()):
+        parsed = HTMLContentProcessor().parse_resume(RESUME_MARKDOWN)
+        processors = [HTMLContentProcessor(jd) for corpus in build_jd_corpora(args.corpus_size).values()
+                      for jd in corpus]
+    processors = [processor for processor in processors if processor.jd_analysis]
+    processors.append(HTMLContentProcessor())
+    
+    resume_achievements = [achievement for job in parsed.jobs for achievement in job['achievements']]
+    synthetic = build_jd_corpus(args.achievements, seed=21, min_words=12, max_words=40, keyword_share=0.1)
+    cases = [
+        ("resume", resume_achievements, parsed.tools),
+        (f"resume + {len(synthetic)}", resume_achievements + synthetic, parsed.tools),
+    ]
+    
+    print(f"{'Case':<20} {'build':>9} {'per-term':>11} {'index':>11} {'speedup':>9}")
+    for name, achievements, tools in cases:
+        started = time.perf_counter()
+        index = AchievementIndex(achievements, tools)
+        build_seconds = time.perf_counter() - started
+        
+        # Scores must match the per-term scans exactly before timings mean anything
+        for processor in processors:
+            if processor.jd_analysis is None:
+                expected = [processor._score_achievement(achievement) for achievement in index.achievements]
+                if index.scores(None) != expected:
+                    print("[ERROR] AchievementIndex scores differ from _score_achievement without a JD")
+                    return False
+                continue
+            if index_scores(processor, index) != legacy_scores(processor, index.achievements, tools):
+                print("[ERROR] AchievementIndex scores differ from the per-term scans")
+                return False
+        
+        jd_processors = [processor for processor in processors if processor.jd_analysis]
+        legacy_seconds = time_call(lambda processor: legacy_scores(processor, index.achievements, tools),
+                                   jd_processors, args.repeat)
+        index_seconds = time_call(lambda processor: index_scores(processor, index), jd_processors, args.repeat)
+        print(f"{name:<20} {build_seconds * 1000:>7.2f}ms {legacy_seconds * 1000:>9.3f}ms "
+              f"{index_seconds * 1000:>9.3f}ms {legacy_seconds / index_seconds:>8.1f}x")
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark Corpus
+Synthetic JDs and scaled-up resume markdown for the benchmark suite
+"""
+
+import os
+import re
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+from jd_term_matcher import JD_TERM_CATEGORIES
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+RESUME_MARKDOWN = os.path.join(PROJECT_ROOT, 'cetola_resume.md')
+
+# (min words, max words, share of words drawn from the JD vocabulary)
+JD_KINDS = {
+    "short": (40, 120, 0.08),
+    "long": (800, 1500, 0.08),
+    "keyword_dense": (150, 400, 0.35),
+}
+
+def _load_prose() -> list:
+    with open(os.path.join(PROJECT_ROOT, 'Previous_Successful_Resumes.md'), 'r', encoding='utf-8') as f:
+        return f.read().split()
+
+def _load_vocabulary() -> list:
+    return [term for _, groups in JD_TERM_CATEGORIES for group in groups for term in group]
+
+def build_jd_corpus(count: int, seed: int = 7, min_words: int = 150, max_words: int = 900,
+                    keyword_share: float = 0.08) -> list:
+    """
+    Build synthetic JDs from the repo's own prose salted with vocabulary terms
+    
+    Args:
+        count: Number of JDs
+        seed: Random seed, so runs are comparable
+        min_words: Shortest JD length in words
+        max_words: Longest JD length in words
+        keyword_share: Fraction of words drawn from the JD term vocabulary
+    
+    Returns:
+        list: JD strings
+    """
+    prose = _load_prose()
+    vocabulary = _load_vocabulary()
+    
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(min_words, max_words)):
+            words.append(rng.choice(vocabulary) if rng.random() < keyword_share else rng.choice(prose))
+        corpus.append(' '.join(words))
+    return corpus
+
+def build_jd_corpora(count: int, seed: int = 7) -> dict:
+    """Return {kind: [JD, ...]} for every kind in JD_KINDS"""
+    return {
+        kind: build_jd_corpus(count, seed + index, min_words, max_words, keyword_share)
+        for index, (kind, (min_words, max_words, keyword_share)) in enumerate(JD_KINDS.items())
+    }
+
+def build_scaled_resume(scale: int, output_path: str) -> str:
+    """
+    Write a copy of the source resume with every experience bullet repeated scale times
+    
+    The processor keeps at most three jobs, so resumes grow by achievements per job.
+    
+    Args:
+        scale: How many copies of each Professional Experience bullet to include
+        output_path: Where to write the markdown
+    
+    Returns:
+        str: output_path
+    """
+    with open(RESUME_MARKDOWN, 'r', encoding='utf-8') as f:
+        markdown = f.read()
+    
+    match = re.search(r'^## Professional Experience\s*\n(.*?)(?=^## )', markdown, re.MULTILINE | re.DOTALL)
+    if not match or scale <= 1:
+        scaled = markdown
+    else:
+        experience = re.sub(r'^- .*$', lambda bullet: '\n\n'.join([bullet.group(0)] * scale),
+                            match.group(1), flags=re.MULTILINE)
+        scaled = markdown[:match.start(1)] + experience + markdown[match.end(1):]
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(scaled)
+    return output_path
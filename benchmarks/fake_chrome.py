@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Fake Chrome
+Stand-in browser for benchmarking the Chrome fallback paths without a real Chrome
+
+Supports the three ways the pipeline talks to Chrome:
+  --version                       prints a version string
+  --print-to-pdf=PATH ... FILE    writes a small PDF for FILE and exits
+  --remote-debugging-pipe         serves the DevTools protocol subset used by
+                                  chrome_devtools over fds 3/4
+
+FAKE_CHROME_DELAY (seconds, default 0) is added to every print to model layout cost.
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+
+def _fake_pdf(html: str) -> bytes:
+    """A minimal one-page PDF whose size tracks the input HTML"""
+    body = html.encode('utf-8', 'replace')
+    return b"%PDF-1.4\n% fake chrome output\n" + body + b"\n%%EOF\n"
+
+def _print_delay():
+    time.sleep(float(os.environ.get('FAKE_CHROME_DELAY', '0')))
+
+def _serve_pipe():
+    """Answer DevTools commands read from fd 3 on fd 4"""
+    documents = {}
+    next_target = 0
+    buffer = b''
+    
+    def reply(message, result=None, error=None):
+        response = {"id": message["id"]}
+        if "sessionId" in message:
+            response["sessionId"] = message["sessionId"]
+        if error:
+            response["error"] = {"message": error}
+        else:
+            response["result"] = result or {}
+        os.write(4, json.dumps(response).encode('utf-8') + b'\0')
+    
+    while True:
+        chunk = os.read(3, 1 << 16)
+        if not chunk:
+            return
+        buffer += chunk
+        while b'\0' in buffer:
+            raw, buffer = buffer.split(b'\0', 1)
+            message = json.loads(raw)
+            method = message["method"]
+            params = message.get("params", {})
+            session = message.get("sessionId")
+            
+            if method == "Target.createTarget":
+                next_target += 1
+                reply(message, {"targetId": f"target-{next_target}"})
+            elif method == "Target.attachToTarget":
+                reply(message, {"sessionId": f"session-{params['targetId']}"})
+            elif method == "Target.closeTarget":
+                reply(message, {"success": True})
+            elif method == "Page.navigate":
+                reply(message, {"frameId": f"frame-{session}"})
+            elif method == "Page.getFrameTree":
+                reply(message, {"frameTree": {"frame": {"id": f"frame-{session}"}}})
+            elif method == "Runtime.evaluate":
+                reply(message, {"result": {"type": "string", "value": "complete file:"}})
+            elif method == "Page.setDocumentContent":
+                documents[session] = params["html"]
+                reply(message)
+            elif method == "Page.printToPDF":
+                _print_delay()
+                pdf = _fake_pdf(documents.get(session, ''))
+                reply(message, {"data": base64.b64encode(pdf).decode('ascii')})
+            elif method == "Browser.close":
+                reply(message)
+                return
+            else:
+                reply(message, error=f"Unsupported method: {method}")
+
+def main():
+    args = sys.argv[1:]
+    
+    if '--version' in args:
+        print("FakeChrome 1.0.0")
+        return 0
+    
+    if '--remote-debugging-pipe' in args:
+        _serve_pipe()
+        return 0
+    
+    output = next((arg.split('=', 1)[1] for arg in args if arg.startswith('--print-to-pdf=')), None)
+    if output:
+        source = args[-1]
+        if source.startswith('file://'):
+            source = source[len('file://'):]
+        with open(source, 'r', encoding='utf-8') as f:
+            html = f.read()
+        _print_delay()
+        with open(output, 'wb') as f:
+            f.write(_fake_pdf(html))
+        return 0
+    
+    print("fake_chrome: nothing to do", file=sys.stderr)
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
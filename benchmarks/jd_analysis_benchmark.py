@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+JD Analysis Benchmark
+Compares the single-pass JDTermMatcher against per-pattern re.findall scans
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+from jd_term_matcher import JDTermMatcher, JD_TERM_CATEGORIES
+from corpus import build_jd_corpus
+
+def legacy_extract(jd_text: str) -> dict:
+    """Reference implementation: one uncompiled re.findall per pattern group, as _analyze_jd used to do"""
+    terms = {}
+    for category, groups in JD_TERM_CATEGORIES:
+        terms[category] = []
+        for group in groups:
+            pattern = r'\b(?:' + '|'.join(re.escape(term) for term in group) + r')\b'
+            terms[category].extend(re.findall(pattern, jd_text, re.IGNORECASE))
+    return terms
+
+def time_call(func, texts, repeat: int) -> float:
+    """Return best-of-repeat seconds for running func over all texts"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    """Run the JD analysis benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark single-pass JD term extraction')
+    parser.add_argument('--corpus-size', type=int, default=200, help='Number of synthetic JDs')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+    
+    matcher = JDTermMatcher()
+    corpus = build_jd_corpus(args.corpus_size)
+    long_jd = ' '.join(corpus[:20])
+    
+    # Results must match the legacy scans exactly before timings mean anything
+    for text in corpus + [long_jd]:
+        if matcher.extract(text) != legacy_extract(text):
+            print("[ERROR] JDTermMatcher output differs from re.findall reference")
+            return False
+    
+    cases = [
+        ("long JD", [long_jd]),
+        (f"corpus ({len(corpus)} JDs)", corpus),
+    ]
+    
+    print(f"{'Case':<22} {'re.findall':>12} {'matcher':>12} {'speedup':>9}")
+    for name, texts in cases:
+        legacy_seconds = time_call(legacy_extract, texts, args.repeat)
+        matcher_seconds = time_call(matcher.extract, texts, args.repeat)
+        print(f"{name:<22} {legacy_seconds * 1000:>10.2f}ms {matcher_seconds * 1000:>10.2f}ms "
+              f"{legacy_seconds / matcher_seconds:>8.1f}x")
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
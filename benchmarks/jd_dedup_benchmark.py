@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+JD Dedup Benchmark
+Measures near-duplicate JD lookup time and how reliably boilerplate-edited reposts are matched
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+import jd_dedup
+from jd_dedup import JDFingerprint, JDIndex
+from jd_term_matcher import get_jd_term_matcher
+from corpus import build_jd_corpus
+
+BOILERPLATE = [
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Apply today! Benefits include medical, dental, vision and a 401(k) match.",
+    "This role is remote-friendly within the United States.",
+]
+
+def repost(jd_text: str, rng: random.Random) -> str:
+    """A lightly edited copy of a JD, the way job boards repost it"""
+    words = jd_text.split()
+    for _ in range(max(1, len(words) // 200)):
+        words[rng.randrange(len(words))] = rng.choice(["Team", "role", "you", "we"])
+    return rng.choice(BOILERPLATE) + "\n\n" + ' '.join(words) + "\n\n" + rng.choice(BOILERPLATE)
+
+def main():
+    """Run the JD dedup benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark near-duplicate JD lookup')
+    parser.add_argument('--corpus-size', type=int, default=1000, help='JDs stored in the index')
+    parser.add_argument('--probes', type=int, default=200, help='Reposted and unrelated JDs looked up')
+    parser.add_argument('--threshold', type=float, default=jd_dedup.DEFAULT_THRESHOLD,
+                        help='Similarity threshold')
+    args = parser.parse_args()
+    
+    # The numpy and pure-Python signatures must agree, or indexes written by one would not match the other
+    if jd_dedup.NUMPY_AVAILABLE:
+        hashes = jd_dedup.shingle_hashes("one two three four five six seven eight".split())
+        jd_dedup.NUMPY_AVAILABLE = False
+        pure = jd_dedup.minhash(hashes)
+        jd_dedup.NUMPY_AVAILABLE = True
+        if jd_dedup.minhash(hashes) != pure:
+            print("[ERROR] numpy and pure-Python MinHash signatures differ")
+            return False
+    
+    corpus = build_jd_corpus(args.corpus_size)
+    rng = random.Random(11)
+    reposts = [repost(jd_text, rng) for jd_text in rng.sample(corpus, min(args.probes, len(corpus)))]
+    unrelated = build_jd_corpus(args.probes, seed=8)
+    
+    with tempfile.TemporaryDirectory() as index_dir:
+        index = JDIndex(threshold=args.threshold, index_dir=index_dir)
+        started = time.perf_counter()
+        for jd_text in corpus:
+            index.add(JDFingerprint(jd_text), {}, None)
+        build_seconds = time.perf_counter() - started
+        
+        # A fresh process reads the whole log once
+        started = time.perf_counter()
+        index = JDIndex(threshold=args.threshold, index_dir=index_dir)
+        load_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        found = sum(1 for jd_text in reposts if index.lookup(JDFingerprint(jd_text)))
+        repost_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        false_matches = sum(1 for jd_text in unrelated if index.lookup(JDFingerprint(jd_text)))
+        unrelated_seconds = time.perf_counter() - started
+    
+    matcher = get_jd_term_matcher()
+    started = time.perf_counter()
+    for jd_text in reposts:
+        matcher.extract(jd_text)
+    analysis_seconds = time.perf_counter() - started
+    
+    print(f"Index of {len(corpus)} JDs: built in {build_seconds * 1000:.0f}ms, "
+          f"loaded in {load_seconds * 1000:.1f}ms")
+    print(f"{'Case':<22} {'per JD':>10} {'matched':>10}")
+    print(f"{'reposts':<22} {repost_seconds / len(reposts) * 1000:>8.3f}ms {found:>5}/{len(reposts)}")
+    print(f"{'unrelated JDs':<22} {unrelated_seconds / len(unrelated) * 1000:>8.3f}ms "
+          f"{false_matches:>5}/{len(unrelated)}")
+    print(f"{'JD term extraction':<22} {analysis_seconds / len(reposts) * 1000:>8.3f}ms")
+    
+    # Boilerplate-only reposts should essentially always be found, and unrelated JDs never
+    return found >= 0.95 * len(reposts) and false_matches == 0
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
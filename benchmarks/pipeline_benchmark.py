@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Times each resume generation stage separately and compares the run against a stored baseline
+
+Stages: JD analysis (short, long and keyword-dense JDs), achievement scoring and
+single-page optimization (normal and scaled-up resumes), Jinja render, WeasyPrint
+layout and PDF write, and the Chrome fallbacks (persistent DevTools pool and
+command line) driven by fake_chrome.py unless --browser names a real one.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --output results.json
+    python benchmarks/pipeline_benchmark.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Baselines:
+    Timings only compare on the same machine, Python and browser, so no baseline
+    is committed (benchmarks/baseline.json is git-ignored). Record one on the
+    machine or CI runner that runs the check, from the reference commit:
+        
+        git checkout <reference commit>
+        python benchmarks/pipeline_benchmark.py --output benchmarks/baseline.json
+        git checkout -
+        python benchmarks/pipeline_benchmark.py --baseline benchmarks/baseline.json
+    
+    A CI job keeps the file as a cached artifact keyed by runner type and
+    re-records it whenever the reference commit changes. --baseline fails when
+    the file is missing or shares no stage with the run, and warns when it was
+    recorded on a different platform, Python, browser or template.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import copy
+import platform
+import tempfile
+import argparse
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'modules'))
+
+from corpus import build_jd_corpora, build_scaled_resume
+from html_content_processor import HTMLContentProcessor
+from relevance import get_scorer
+from template_renderer import FragmentRenderer
+from chrome_devtools import ChromeTabPool, ChromeDevToolsError
+
+TEMPLATE_PATH = os.path.join(PROJECT_ROOT, 'templates', 'resume_template.html')
+PHOTO_PATH = os.path.join(PROJECT_ROOT, '039-Dm2VwCrean0.jpeg')
+FAKE_CHROME = os.path.join(BENCHMARK_DIR, 'fake_chrome.py')
+
+# Used for the render stages when the production template is not present
+FALLBACK_TEMPLATE = """<html><body style="font-size: {{ 11 * font_scale_factor }}px">
+<h1>{{ name }}</h1><p>{{ tagline }}</p><p>{{ bio }}</p>
+{% for exp in experiences %}<h2>{{ exp.title }} | {{ exp.company }}</h2>
+<ul>{% for achievement in exp.achievements %}<li>{{ achievement }}</li>{% endfor %}</ul>{% endfor %}
+</body></html>"""
+
+def measure(func, calls: int, setup=None) -> dict:
+    """
+    Time func once per call and summarize
+    
+    Args:
+        func: Callable; receives setup()'s result when setup is given
+        calls: Number of timed calls
+        setup: Optional untimed callable producing each call's argument
+    
+    Returns:
+        dict: median_ms, min_ms, p95_ms and calls
+    """
+    samples = []
+    sink = io.StringIO()
+    for _ in range(calls):
+        argument = setup() if setup else None
+        with redirect_stdout(sink):
+            started = time.perf_counter()
+            func(argument) if setup else func()
+            samples.append((time.perf_counter() - started) * 1000)
+        sink.seek(0)
+        sink.truncate()
+    
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "calls": calls
+    }
+
+def _cycle(items):
+    """Endless iterator over items, for feeding measure() a different input per call"""
+    while True:
+        for item in items:
+            yield item
+
+def bench_analysis(stages: dict, corpora: dict, repeat: int):
+    """Time _analyze_jd per JD for each corpus kind"""
+    with redirect_stdout(io.StringIO()):
+        processor = HTMLContentProcessor()
+    
+    for kind, corpus in corpora.items():
+        jds = _cycle(corpus)
+        stages[f"analyze_jd/{kind}"] = measure(processor._analyze_jd, repeat * len(corpus),
+                                               setup=lambda: next(jds))
+
+def bench_content(stages: dict, corpora: dict, repeat: int, scales: list, scratch_dir: str) -> dict:
+    """Time achievement scoring and single-page optimization on normal and scaled-up resumes"""
+    contents = {}
+    jds = corpora["keyword_dense"]
+    
+    for scale in scales:
+        markdown_path = build_scaled_resume(scale, os.path.join(scratch_dir, f"resume_x{scale}.md"))
+        with redirect_stdout(io.StringIO()):
+            parsed = HTMLContentProcessor().parse_resume(markdown_path)
+            processors = [HTMLContentProcessor(jd) for jd in jds]
+            content = processors[0].process_parsed_resume(parsed, PHOTO_PATH)
+        contents[scale] = content
+        
+        # Scored through the resume's legacy term index, as process_parsed_resume does by default
+        raw_experience = parsed.raw_sections.get('raw_experience', '')
+        index = get_scorer(parsed.jobs, parsed.tools, 'legacy')
+        processor_cycle = _cycle(processors)
+        stages[f"process_experiences/x{scale}"] = measure(
+            lambda processor: processor._process_experiences_for_html(
+                raw_experience, parsed.jobs, index.score_map(processor.jd_analysis)),
+            repeat * len(processors), setup=lambda: next(processor_cycle)
+        )
+        
+        # The whole corpus scored as one window, in one matrix product by the index built above; reported per JD
+        jd_analyses = [processor.jd_analysis for processor in processors]
+        index.score_batch(jd_analyses)  # the first window builds the matrix and its term columns
+        batch = measure(lambda: index.score_batch(jd_analyses), repeat)
+        stages[f"score_achievements_batch/x{scale}"] = {
+            key: round(value / len(processors), 4) if key.endswith('_ms') else value
+            for key, value in batch.items()
+        }
+        
+        # Optimization trims in place, so every call gets a fresh copy
+        stages[f"optimize_for_single_page/x{scale}"] = measure(
+            processors[0].optimize_for_single_page, repeat * len(processors),
+            setup=lambda: copy.deepcopy(content)
+        )
+    
+    return contents
+
+def bench_render(stages: dict, content, repeat: int) -> str:
+    """Time the Jinja render and return the HTML for the PDF stages"""
+    from jinja2 import Template
+    
+    template_source = FALLBACK_TEMPLATE
+    if os.path.exists(TEMPLATE_PATH):
+        with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+            template_source = f.read()
+    template = Template(template_source)
+    renderer = FragmentRenderer(template, template_source)
+    
+    def render(render_func=template.render):
+        return render_func(
+            name=content.name, tagline=content.tagline, contact_parts=content.contact_parts,
+            photo_path=content.photo_path, bio=content.bio, strengths=content.strengths,
+            technical=content.technical, languages=content.languages,
+            experiences=content.experiences, professional_development=content.professional_development,
+            font_scale_factor=content.font_scale_factor
+        )
+    
+    stages["jinja_render"] = measure(render, repeat * 10)
+    stages["jinja_render_fragments"] = measure(lambda: render(renderer.render), repeat * 10)
+    return render()
+
+def bench_weasyprint(stages: dict, html_content: str, repeat: int):
+    """Time WeasyPrint layout and PDF write separately"""
+    try:
+        from html_pdf_generator import HTMLPDFGenerator
+        generator = HTMLPDFGenerator()
+    except Exception as e:
+        reason = f"WeasyPrint unavailable: {e}"
+        stages["weasyprint_layout"] = {"skipped": reason}
+        stages["weasyprint_pdf"] = {"skipped": reason}
+        return
+    
+    base_url = os.path.dirname(TEMPLATE_PATH)
+    stages["weasyprint_layout"] = measure(lambda: generator.render_document(html_content, base_url), repeat)
+    document = generator.render_document(html_content, base_url)
+    stages["weasyprint_pdf"] = measure(lambda: generator.document_to_pdf_bytes(document), repeat)
+
+def bench_chrome(stages: dict, html_content: str, repeat: int, browser: str, scratch_dir: str):
+    """Time the persistent DevTools pool against one browser launch per render"""
+    try:
+        pool = ChromeTabPool(browser, max_tabs=1)
+    except ChromeDevToolsError as e:
+        stages["chrome_pool"] = {"skipped": str(e)}
+    else:
+        try:
+            pool.render_pdf(html_content, base_dir=scratch_dir)  # open and navigate the tab
+            stages["chrome_pool"] = measure(lambda: pool.render_pdf(html_content, base_dir=scratch_dir), repeat)
+        except ChromeDevToolsError as e:
+            stages["chrome_pool"] = {"skipped": str(e)}
+        finally:
+            pool.close()
+    
+    html_path = os.path.join(scratch_dir, 'resume.html')
+    pdf_path = os.path.join(scratch_dir, 'resume.pdf')
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    command = [browser, '--headless', '--disable-gpu', '--no-sandbox',
+               f'--print-to-pdf={pdf_path}', '--print-to-pdf-no-header', html_path]
+    stages["chrome_cli"] = measure(
+        lambda: subprocess.run(command, capture_output=True, timeout=60, check=True),
+        max(1, repeat // 4)
+    )
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """
+    Find stages whose median slowed beyond threshold
+    
+    Args:
+        results: This run's stages
+        baseline: Baseline run's stages
+        threshold: Allowed fractional slowdown (0.25 = 25%)
+        min_delta_ms: Ignore slowdowns smaller than this in absolute terms
+    
+    Returns:
+        list: (stage, baseline ms, current ms) for each regression
+    """
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get(stage, {})
+        if "median_ms" not in current or "median_ms" not in previous:
+            continue
+        delta = current["median_ms"] - previous["median_ms"]
+        if delta > min_delta_ms and current["median_ms"] > previous["median_ms"] * (1 + threshold):
+            regressions.append((stage, previous["median_ms"], current["median_ms"]))
+    return regressions
+
+def print_table(stages: dict, baseline_stages: dict):
+    """Print one line per stage, with the change against the baseline when there is one"""
+    print(f"{'Stage':<34} {'median':>11} {'p95':>11} {'baseline':>11} {'change':>8}")
+    for stage, result in stages.items():
+        if "skipped" in result:
+            print(f"{stage:<34} {'skipped':>11}  {result['skipped']}")
+            continue
+        previous = baseline_stages.get(stage, {}).get("median_ms")
+        baseline_text = f"{previous:>9.3f}ms" if previous else f"{'-':>11}"
+        change_text = f"{(result['median_ms'] / previous - 1) * 100:>+7.1f}%" if previous else f"{'-':>8}"
+        print(f"{stage:<34} {result['median_ms']:>9.3f}ms {result['p95_ms']:>9.3f}ms {baseline_text} {change_text}")
+
+def main():
+    """Run the pipeline benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark each resume generation stage')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed calls per input (default: 20)')
+    parser.add_argument('--corpus-size', type=int, default=10, help='JDs per corpus kind (default: 10)')
+    parser.add_argument('--resume-scale', type=int, nargs='+', default=[1, 4],
+                        help='Resume sizes, as multiples of the experience bullets (default: 1 4)')
+    parser.add_argument('--browser', default=FAKE_CHROME,
+                        help='Browser for the Chrome stages (default: benchmarks/fake_chrome.py)')
+    parser.add_argument('--skip-pdf', action='store_true', help='Skip the WeasyPrint and Chrome stages')
+    parser.add_argument('--output', metavar='PATH', help='Write results as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='Compare against a previous --output file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Fail when a stage median is this much slower than baseline (default: 0.25)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help='Ignore regressions smaller than this many ms (default: 0.05)')
+    args = parser.parse_args()
+    
+    stages = {}
+    corpora = build_jd_corpora(args.corpus_size)
+    
+    with tempfile.TemporaryDirectory(prefix='resume-bench-') as scratch_dir:
+        bench_analysis(stages, corpora, args.repeat)
+        contents = bench_content(stages, corpora, args.repeat, args.resume_scale, scratch_dir)
+        html_content = bench_render(stages, contents[args.resume_scale[0]], args.repeat)
+        
+        if not args.skip_pdf:
+            bench_weasyprint(stages, html_content, args.repeat)
+            bench_chrome(stages, html_content, args.repeat, args.browser, scratch_dir)
+    
+    results = {
+        "meta": {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "corpus_size": args.corpus_size,
+            "resume_scale": args.resume_scale,
+            "browser": args.browser,
+            "template": TEMPLATE_PATH if os.path.exists(TEMPLATE_PATH) else "builtin fallback"
+        },
+        "stages": stages
+    }
+    
+    baseline_stages = {}
+    if args.baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Cannot read baseline {args.baseline}: {e} (record one with --output, see Baselines in this script's docstring)")
+            return False
+        baseline_stages = baseline.get("stages", {})
+        for key in ("platform", "python", "browser", "template"):
+            recorded = baseline.get("meta", {}).get(key)
+            if recorded != results["meta"][key]:
+                print(f"[WARNING] Baseline {key} was {recorded!r}, this run uses {results['meta'][key]!r}")
+    
+    print_table(stages, baseline_stages)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"[BENCH] Results written to {args.output}")
+    
+    if args.baseline:
+        measured = [stage for stage, result in stages.items() if "median_ms" in result]
+        missing = [stage for stage in measured if "median_ms" not in baseline_stages.get(stage, {})]
+        if len(missing) == len(measured):
+            print(f"[ERROR] Baseline {args.baseline} has none of this run's stages")
+            return False
+        if missing:
+            print(f"[WARNING] Not in baseline, not compared: {', '.join(missing)}")
+    
+    regressions = compare(stages, baseline_stages, args.threshold, args.min_delta_ms)
+    for stage, previous, current in regressions:
+        print(f"[REGRESSION] {stage}: {previous:.3f}ms -> {current:.3f}ms "
+              f"(+{(current / previous - 1) * 100:.0f}%, threshold {args.threshold * 100:.0f}%)")
+    
+    return not regressions
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Scorer Benchmark
+Compares the BM25 relevance scorer with the legacy additive scoring: build cost, per-JD cost, ranking overlap
+and how often each job keeps as many bullets under the scorer's selection thresholds
+"""
+
+import os
+import io
+import sys
+import time
+import heapq
+import argparse
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'modules'))
+from html_content_processor import HTMLContentProcessor
+from relevance import SCORERS, get_scorer
+from corpus import RESUME_MARKDOWN, build_jd_corpora, build_jd_corpus
+
+def top_k(scores: list, k: int) -> list:
+    """Indices of the k best scores, ties in list order, as the processor selects them"""
+    return heapq.nsmallest(k, range(len(scores)), key=lambda index: (-scores[index], index))
+
+def selected_counts(scorer, scores: list, jobs: list) -> list:
+    """Bullets HTMLContentProcessor keeps per job under the scorer's selection thresholds"""
+    high, medium = scorer.selection_thresholds
+    index = {achievement: position for position, achievement in enumerate(scorer.achievements)}
+    counts = []
+    for job in jobs:
+        job_scores = [scores[index[achievement]] for achievement in job['achievements']]
+        if len(job_scores) >= 6:
+            counts.append(min(6, max(4, sum(1 for score in job_scores if score >= high))))
+        elif len(job_scores) >= 4:
+            counts.append(min(5, max(3, sum(1 for score in job_scores if score >= medium))))
+        else:
+            counts.append(len(job_scores))
+    return counts
+
+def score_jd(scorer, jd_analysis):
+    return scorer.scores(jd_analysis), scorer.tool_scores(jd_analysis)
+
+def main():
+    """Run the scorer benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark BM25 against legacy achievement scoring')
+    parser.add_argument('--corpus-size', type=int, default=100, help='Synthetic JDs per kind')
+    parser.add_argument('--achievements', type=int, default=500,
+                        help='Synthetic achievements added to the resume for the large case')
+    parser.add_argument('--top', type=int, default=6, help='Achievements compared for ranking overlap')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+    
+    with redirect_stdout(io.StringIO()):
+        parsed = HTMLContentProcessor().parse_resume(RESUME_MARKDOWN)
+        jd_analyses = [HTMLContentProcessor(jd).jd_analysis for corpus in build_jd_corpora(args.corpus_size).values()
+                       for jd in corpus]
+    jd_analyses = [jd_analysis for jd_analysis in jd_analyses if jd_analysis]
+    
+    synthetic = build_jd_corpus(args.achievements, seed=21, min_words=12, max_words=40, keyword_share=0.1)
+    cases = [
+        ("resume", parsed.jobs),
+        (f"resume + {len(synthetic)}", parsed.jobs + [{'achievements': synthetic}]),
+    ]
+    
+    print(f"{'Case':<20} {'scorer':<8} {'build':>9} {'per JD':>10} {'top-' + str(args.top) + ' overlap':>15} "
+          f"{'same count':>11}")
+    for name, jobs in cases:
+        scorers, rankings, counts = {}, {}, {}
+        for scorer_name in SCORERS:
+            started = time.perf_counter()
+            scorer = scorers[scorer_name] = get_scorer(jobs, parsed.tools, scorer_name)
+            build_seconds = time.perf_counter() - started
+            
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = [score_jd(scorer, jd_analysis) for jd_analysis in jd_analyses]
+                best = min(best, time.perf_counter() - started)
+            rankings[scorer_name] = [set(top_k(scores, args.top)) for scores, _ in results]
+            counts[scorer_name] = [count for scores, _ in results for count in selected_counts(scorer, scores, jobs)]
+            
+            overlap = same_count = ""
+            if scorer_name != 'legacy':
+                shared = sum(len(ranking & legacy) for ranking, legacy in zip(rankings[scorer_name], rankings['legacy']))
+                overlap = f"{shared / (len(jd_analyses) * args.top):.0%}"
+                same = sum(1 for count, legacy in zip(counts[scorer_name], counts['legacy']) if count == legacy)
+                same_count = f"{same / len(counts['legacy']):.0%}"
+            print(f"{name:<20} {scorer_name:<8} {build_seconds * 1000:>7.2f}ms "
+                  f"{best / len(jd_analyses) * 1000:>8.3f}ms {overlap:>15} {same_count:>11}")
+        
+        if scorers['bm25'].achievements != scorers['legacy'].achievements:
+            print("[ERROR] Scorers disagree on the achievement order")
+            return False
+    
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Startup Budget
+Measures each CLI's import cost with -X importtime and fails when an entry point exceeds its budget
+
+Each entry point also lists modules it must not import at all (e.g. WeasyPrint
+for --preview), which catches an eager import long before it shows up as time.
+
+Usage:
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --scale 2 --output startup.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Stacks that only the rendering stages need
+HEAVY_MODULES = ('weasyprint', 'jinja2', 'PIL', 'numpy', 'content_processor', 'markdown', 'lxml', 'reportlab')
+
+# (label, command line, import budget in ms, modules that must not be imported)
+ENTRY_POINTS = [
+    ("generate_dynamic_resume --help", ['generate_dynamic_resume.py', '--help'], 100, HEAVY_MODULES),
+    ("html_resume_generator --help", ['html_resume_generator.py', '--help'], 60, HEAVY_MODULES),
+    ("html_resume_generator --preview", ['html_resume_generator.py', '--preview'], 250, ('weasyprint', 'jinja2')),
+    ("simple_resume_generator --help", ['simple_resume_generator.py', '--help'], 80, HEAVY_MODULES),
+    ("simple_resume_generator --preview", ['simple_resume_generator.py', '--preview'], 250, ('weasyprint', 'jinja2')),
+]
+
+def measure_imports(argv: list) -> dict:
+    """
+    Run a command under -X importtime
+    
+    Args:
+        argv: Arguments after the interpreter (script and options)
+    
+    Returns:
+        dict: returncode, total_ms (top-level cumulative import time), modules
+              (every imported module name) and top (heaviest top-level imports)
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + argv, cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, timeout=120)
+    
+    total_us = 0
+    modules = set()
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        if not name[1:].startswith(' '):  # top-level imports have a single leading space
+            total_us += int(cumulative)
+            top_level.append((int(cumulative), name.strip()))
+    
+    top_level.sort(reverse=True)
+    return {
+        "returncode": result.returncode,
+        "total_ms": total_us / 1000,
+        "modules": modules,
+        "top": [(name, round(us / 1000, 1)) for us, name in top_level[:5]],
+        "stderr": [line for line in result.stderr.splitlines() if not line.startswith('import time:')][-5:]
+    }
+
+def main():
+    """Check every entry point against its startup budget"""
+    parser = argparse.ArgumentParser(description='Enforce per-entry-point import time budgets')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per entry point; the median is used (default: 5)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every budget, for slower machines or CI (default: 1.0)')
+    parser.add_argument('--output', metavar='PATH', help='Write results as JSON')
+    args = parser.parse_args()
+    
+    # Interpreter startup imports (site, encodings, ...) are paid by every script alike
+    baseline_ms = statistics.median(measure_imports(['-c', 'pass'])['total_ms'] for _ in range(args.repeat))
+    
+    results = {}
+    failures = []
+    print(f"{'Entry point':<36} {'imports':>10} {'budget':>9}  heaviest imports")
+    for label, argv, budget_ms, forbidden in ENTRY_POINTS:
+        runs = [measure_imports(argv) for _ in range(args.repeat)]
+        imports_ms = max(0.0, statistics.median(run['total_ms'] for run in runs) - baseline_ms)
+        budget_ms *= args.scale
+        last = runs[-1]
+        loaded = sorted(name for name in forbidden
+                        if any(module == name or module.startswith(name + '.') for module in last['modules']))
+        
+        problems = []
+        if imports_ms > budget_ms:
+            problems.append(f"{imports_ms:.0f}ms over {budget_ms:.0f}ms budget")
+        if loaded:
+            problems.append(f"imports {', '.join(loaded)}")
+        if last['returncode'] != 0:
+            problems.append(f"exited {last['returncode']}: {' / '.join(last['stderr'])}")
+        
+        heaviest = ', '.join(f"{name} {ms}ms" for name, ms in last['top'][:3])
+        print(f"{label:<36} {imports_ms:>8.1f}ms {budget_ms:>7.0f}ms  {heaviest}")
+        for problem in problems:
+            print(f"[BUDGET] {label}: {problem}")
+            failures.append(label)
+        
+        results[label] = {"imports_ms": round(imports_ms, 1), "budget_ms": budget_ms,
+                          "forbidden_imported": loaded, "returncode": last['returncode'], "top": last['top']}
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"baseline_ms": round(baseline_ms, 1), "entry_points": results}, f, indent=2)
+        print(f"[BENCH] Results written to {args.output}")
+    
+    return not failures
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -5,47 +5,143 @@ Generate dynamic resume with JD analysis
 
 import sys
 import os
+import re
+import json
+import time
+import hashlib
+import argparse
+import functools
 sys.path.insert(0, 'modules')
-from html_content_processor import HTMLContentProcessor
+from render_daemon import RenderClient, serve, DEFAULT_PORT
+from resume_cache import load_parsed_resume
+from pdf_cache import PDFCache
+from stage_timing import Trace, activate, span, traced, write_chrome_trace, write_json_trace
+import events
 
-# For PDF generation, try WeasyPrint approach
-from jinja2 import Template
-import tempfile
-import os
+# The content processor, Jinja, WeasyPrint and Chrome modules are imported by the
+# stage that first needs them: handing a JD to a running daemon, --help and --serve
+# startup never pay for them (benchmarks/startup_budget.py enforces this)
+
+RESUME_MARKDOWN = 'cetola_resume.md'
+PHOTO_PATH = '039-Dm2VwCrean0.jpeg'
+TEMPLATE_PATH = 'templates/resume_template.html'
+
+# JD-independent pipeline state, loaded once per process (and once per batch worker)
+_resources = {}
+
+# Environment settings renders depend on; a daemon only serves clients with the same values
+DAEMON_SETTINGS = ('RESUME_SCORER', 'RESUME_JD_DEDUP_THRESHOLD', 'RESUME_PDF_CACHE_MB', 'RESUME_CACHE_DIR')
+
+# Resources built from the source files, reloaded when one of them changes
+SOURCE_FILES = (RESUME_MARKDOWN, TEMPLATE_PATH, PHOTO_PATH)
+SOURCE_RESOURCES = ('parsed_resume', 'template', 'jd_index', 'source_stamp')
 
-# Try to import HTMLPDFGenerator, but don't fail if WeasyPrint is unavailable
-try:
-    from modules.html_pdf_generator import HTMLPDFGenerator
-    WEASYPRINT_AVAILABLE = True
-except ImportError as e:
-    HTMLPDFGenerator = None
-    WEASYPRINT_AVAILABLE = False
-    print(f"[INFO] WeasyPrint not available: {e}")
-except Exception as e:
-    HTMLPDFGenerator = None
-    WEASYPRINT_AVAILABLE = False
-    print(f"[INFO] WeasyPrint dependencies missing: {e}")
-
-def generate_dynamic_resume(jd_text, output_filename):
-    """Generate resume tailored to job description"""
+# JDs batch mode analyzes and scores together before the workers render them
+SCORE_WINDOW = 64
+
+def _load_resources():
+    """Parse the source resume and compile the template once per process"""
+    if 'parsed_resume' not in _resources:
+        with span("load_resources"):
+            _resources['source_stamp'] = _source_stamp()
+            _resources['parsed_resume'] = _load_parsed_resume()
+            
+            from template_env import get_fragment_renderer
+            
+            # Unescaped, as this entry point has always rendered the template
+            _resources['template'] = get_fragment_renderer(
+                os.path.basename(TEMPLATE_PATH), os.path.dirname(os.path.abspath(TEMPLATE_PATH)), autoescape=False
+            )
+            
+            if 'pdf_cache' not in _resources:
+                _resources['pdf_cache'] = PDFCache()
     
-    # Create processor with JD analysis
-    processor = HTMLContentProcessor(jd_text)
+    return _resources
+
+def _daemon_settings():
+    """This process's values of DAEMON_SETTINGS, after the CLI exported its options"""
+    return {name: os.environ.get(name) for name in DAEMON_SETTINGS}
+
+def _source_stamp():
+    """Modification time and size of each source file (None when missing)"""
+    stamp = []
+    for path in SOURCE_FILES:
+        try:
+            stat = os.stat(path)
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def _refresh_resources():
+    """
+    Drop the resources built from a source file that changed since they were loaded
     
-    # Process resume with dynamic content
-    content = processor.process_for_html_template('cetola_resume.md', '039-Dm2VwCrean0.jpeg')
+    Called once per render, so a daemon or long batch picks up edits to the
+    resume, template or photo; the reload re-hashes them as a cold start would.
+    """
+    if 'source_stamp' in _resources and _resources['source_stamp'] != _source_stamp():
+        events.info("resources.reloaded", "Source resume, template or photo changed, reloading")
+        for name in SOURCE_RESOURCES:
+            _resources.pop(name, None)
+
+def _load_parsed_resume():
+    """Read the parsed source resume from the on-disk cache, re-parsing only when the file changed"""
+    from html_content_processor import HTMLContentProcessor
     
-    # Optimize for single page
-    content = processor.optimize_for_single_page(content)
+    return load_parsed_resume(RESUME_MARKDOWN, HTMLContentProcessor().parse_resume)
+
+def _get_pdf_generator():
+    """Create the WeasyPrint generator on first use and keep it for later resumes"""
+    resources = _load_resources()
     
-    # Load template
-    with open('templates/resume_template.html', 'r', encoding='utf-8') as f:
-        template_content = f.read()
+    if 'pdf_generator' not in resources:
+        resources['pdf_generator'] = None
+        resources['pdf_page_css'] = ""
+        
+        # Try to import HTMLPDFGenerator, but don't fail if WeasyPrint is unavailable
+        try:
+            from modules.html_pdf_generator import HTMLPDFGenerator, PDF_PAGE_CSS
+            from font_config import bundled_font_css
+            # Cached PDFs depend on the bundled fonts as much as on the page CSS
+            resources['pdf_page_css'] = bundled_font_css() + PDF_PAGE_CSS
+            resources['pdf_generator'] = HTMLPDFGenerator()
+        except ImportError as e:
+            events.info("render.weasyprint_unavailable", "WeasyPrint not available: {error}", error=str(e))
+        except Exception as e:
+            events.warning("render.weasyprint_init_failed",
+                           "WeasyPrint failed to initialize ({error}), Chrome fallback will be used", error=str(e))
     
-    template = Template(template_content)
+    return resources['pdf_generator']
+
+def _get_jd_index():
+    """Open the near-duplicate JD index on first use, or None when dedup is off"""
+    resources = _load_resources()
+    
+    if 'jd_index' not in resources:
+        from jd_dedup import JDIndex, DEFAULT_THRESHOLD
+        
+        resources['jd_index'] = None
+        threshold = float(os.environ.get('RESUME_JD_DEDUP_THRESHOLD', DEFAULT_THRESHOLD))
+        if threshold > 0:
+            from resume_cache import hash_file
+            
+            from relevance import scorer_name
+            from html_content_processor import CONTENT_VERSION
+            
+            # Stored PDFs and analyses are only reusable for the resume, template, photo, scorer and code they came from
+            context = [resources['parsed_resume'].source_hash, hash_file(TEMPLATE_PATH), scorer_name(),
+                       f"content-v{CONTENT_VERSION}"]
+            if os.path.exists(PHOTO_PATH):
+                context.append(hash_file(PHOTO_PATH))
+            resources['jd_index'] = JDIndex(' '.join(context), threshold)
     
-    # Render HTML
-    html_content = template.render(
+    return resources['jd_index']
+
+@traced("jinja_render")
+def _render_html(content):
+    """Render structured content through the resume template, reusing its JD-invariant blocks"""
+    return _load_resources()['template'].render(
         name=content.name,
         tagline=content.tagline,
         contact_parts=content.contact_parts,
@@ -58,93 +154,1350 @@ def generate_dynamic_resume(jd_text, output_filename):
         professional_development=content.professional_development,
         font_scale_factor=content.font_scale_factor
     )
+
+def _render_with_weasyprint(content, pdf_generator, pdf_cache):
+    """
+    Fit content to one page by measured layout and return the fitted document's PDF bytes
+    
+    Fitting is deterministic, so the cache key is taken from the untrimmed
+    render and a hit skips every layout pass.
+    
+    Returns:
+        tuple: (PDF bytes, renderer label, PDF cache key)
+    """
+    from page_fitter import SinglePageFitter, FIT_CACHE_TAG
+    
+    untrimmed_html = _render_html(content)
+    with span("pdf_cache_lookup"):
+        cache_key = pdf_cache.make_key(untrimmed_html, _resources['pdf_page_css'] + FIT_CACHE_TAG,
+                                       content.photo_path)
+        pdf_bytes = pdf_cache.get_bytes(cache_key)
+    if pdf_bytes is not None:
+        return pdf_bytes, "cache", cache_key
+    
+    template_dir = os.path.dirname(os.path.abspath(TEMPLATE_PATH))
+    fitter = SinglePageFitter(pdf_generator, _render_html, base_url=template_dir)
+    fit = fitter.fit(content, first_html=untrimmed_html)
+    if not fit.fits:
+        events.warning("fit.overflow", "Content still spans {pages} page(s) after fitting", pages=fit.pages)
+    
+    pdf_bytes = pdf_generator.document_to_pdf_bytes(fit.document)
+    pdf_cache.put_bytes(cache_key, pdf_bytes)
+    return pdf_bytes, "WeasyPrint", cache_key
+
+def _render_with_chrome_pool(html_content, timeout=None):
+    """
+    Print HTML to PDF bytes with the persistent Chrome tab pool
     
-    # Generate PDF using WeasyPrint
-    temp_html_path = output_filename.replace('.pdf', '_temp.html')
+    Args:
+        html_content: Complete HTML document
+        timeout: Seconds allowed for each DevTools step (default: the pool's)
+    
+    Returns:
+        bytes or None: PDF data, or None when the pool is unavailable or failed
+    """
+    from chrome_devtools import get_chrome_pool, ChromeDevToolsError, DEFAULT_TIMEOUT
+    
+    pool = get_chrome_pool()
+    if not pool:
+        return None
     
     try:
-        # Write HTML to temporary file
+        template_dir = os.path.dirname(os.path.abspath(TEMPLATE_PATH))
+        return pool.render_pdf(html_content, base_dir=template_dir, timeout=timeout or DEFAULT_TIMEOUT)
+    except ChromeDevToolsError as e:
+        events.info("chrome.render_failed", "Persistent Chrome render failed ({error}), trying Chrome command line...",
+                    error=str(e))
+        return None
+
+def _chrome_cli_command(chrome_path, html_path, pdf_path):
+    """Command line that prints html_path to pdf_path with headless Chrome"""
+    return [
+        chrome_path,
+        '--headless',
+        '--disable-gpu',
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        f'--print-to-pdf={pdf_path}',
+        '--print-to-pdf-no-header',
+        '--disable-extensions',
+        '--run-all-compositor-stages-before-draw',
+        '--virtual-time-budget=5000',
+        html_path
+    ]
+
+@traced("chrome_cli")
+def _render_with_chrome_cli(html_content):
+    """
+    Print HTML to PDF bytes by launching Chrome once, via files in a scratch directory
+    
+    Returns:
+        bytes or None: PDF data, or None when no browser is found or it failed
+    """
+    import subprocess
+    import tempfile
+    from browser_discovery import find_browser_path
+    
+    chrome_path = find_browser_path()
+    if not chrome_path:
+        events.warning("chrome.not_found", "No Chrome, Chromium or Edge browser found")
+        return None
+    
+    # Chrome command line renders from a file on disk
+    with tempfile.TemporaryDirectory(prefix='resume-') as scratch_dir:
+        temp_html_path = os.path.join(scratch_dir, 'resume.html')
+        temp_pdf_path = os.path.join(scratch_dir, 'resume.pdf')
         with open(temp_html_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
-        # Try WeasyPrint first if available
-        if WEASYPRINT_AVAILABLE and HTMLPDFGenerator:
-            try:
-                pdf_generator = HTMLPDFGenerator()
-                success = pdf_generator.convert_html_to_pdf(temp_html_path, output_filename)
-                
-                if success:
-                    print(f"[OK] Dynamic resume generated: {output_filename}")
-                    return output_filename
-                else:
-                    print("[INFO] WeasyPrint PDF generation failed, trying Chrome fallback...")
-                    
-            except Exception as e:
-                print(f"[INFO] WeasyPrint failed ({e}), trying Chrome fallback...")
+        cmd = _chrome_cli_command(chrome_path, temp_html_path, temp_pdf_path)
+        
+        events.debug("chrome.launch", "Using Chrome at: {path}", path=chrome_path)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, cwd=os.getcwd())
+        
+        if result.returncode == 0 and os.path.exists(temp_pdf_path):
+            with open(temp_pdf_path, 'rb') as f:
+                return f.read()
+        
+        events.warning("chrome.failed", "Chrome PDF generation failed with code {returncode}",
+                       returncode=result.returncode, stderr=result.stderr)
+        return None
+
+def _render_with_chrome(html_content):
+    """
+    Print HTML with persistent Chrome, launching Chrome directly if that fails
+    
+    Returns:
+        tuple: (PDF bytes or None, renderer label)
+    """
+    # Persistent Chrome over DevTools: no browser launch or temp file per resume
+    pdf_bytes = _render_with_chrome_pool(html_content)
+    if pdf_bytes is not None:
+        return pdf_bytes, "persistent Chrome"
+    
+    try:
+        return _render_with_chrome_cli(html_content), "Chrome"
+    except Exception as e:
+        events.warning("chrome.fallback_failed", "Chrome fallback failed: {error}", error=str(e))
+        return None, "Chrome"
+
+def _render_before_chrome(jd_text, scored=None):
+    """
+    Run the pipeline for one JD up to the point where Chrome would be needed
+    
+    Everything here is CPU-bound and runs in the calling process, which is
+    what lets the asyncio API hand it to an executor.
+    
+    Args:
+        jd_text: Job description text
+        scored: JD analysis and achievement scores from _score_jobs, used
+                unless the source resume changed since they were made
+    
+    Returns:
+        tuple: (PDF bytes or None, rendered HTML for Chrome and the print
+                fallback, renderer label, PDF cache key for a Chrome render)
+    """
+    from html_content_processor import HTMLContentProcessor
+    
+    _refresh_resources()
+    resources = _load_resources()
+    pdf_cache = resources['pdf_cache']
+    if scored is not None and scored['resume_hash'] != resources['parsed_resume'].source_hash:
+        scored = None
+    
+    # A repost of an earlier JD reuses its PDF, or at least its analysis
+    jd_index = _get_jd_index()
+    fingerprint = match = None
+    if jd_index is not None:
+        from jd_dedup import JDFingerprint
+        
+        with span("jd_dedup"):
+            fingerprint = JDFingerprint(jd_text)
+            match = jd_index.lookup(fingerprint)
+            pdf_bytes = pdf_cache.get_bytes(match.pdf_key, probe=True) if match and match.pdf_key else None
+        if pdf_bytes is not None:
+            events.info("dedup.reused", "Reused the resume of a {similarity:.0%} similar JD",
+                        similarity=match.similarity, jd=match.key[:16])
+            return pdf_bytes, None, "cache", None
+    
+    # Create processor with JD analysis
+    if scored is not None:
+        processor = HTMLContentProcessor(jd_text, jd_analysis=scored['jd_analysis'])
+        achievement_scores = scored['achievement_scores']
+    else:
+        processor = HTMLContentProcessor(jd_text, jd_analysis=match.analysis if match else None)
+        achievement_scores = None
+    
+    # Process resume with dynamic content
+    content = processor.process_parsed_resume(resources['parsed_resume'], PHOTO_PATH, achievement_scores)
+    
+    # Try WeasyPrint first if available, fitting to one page by measured layout
+    pdf_generator = _get_pdf_generator()
+    if pdf_generator:
+        try:
+            pdf_bytes, renderer, cache_key = _render_with_weasyprint(content, pdf_generator, pdf_cache)
+            if fingerprint is not None:
+                jd_index.add(fingerprint, processor.jd_analysis, cache_key)
+            return pdf_bytes, None, renderer, None
+        except Exception as e:
+            events.warning("render.weasyprint_failed", "WeasyPrint failed ({error}), trying Chrome fallback...",
+                           error=str(e))
+    else:
+        events.debug("render.chrome_fallback", "WeasyPrint not available, using Chrome fallback...")
+    
+    # Chrome and HTML fallbacks size content with the length heuristic
+    content = processor.optimize_for_single_page(content)
+    html_content = _render_html(content)
+    
+    # Reposted or lightly edited JDs often render identically - reuse the earlier PDF
+    with span("pdf_cache_lookup"):
+        cache_key = pdf_cache.make_key(html_content, resources['pdf_page_css'], content.photo_path)
+        pdf_bytes = pdf_cache.get_bytes(cache_key)
+    if fingerprint is not None:
+        # Registered before Chrome prints it; a lookup that finds no cached PDF reuses the analysis
+        jd_index.add(fingerprint, processor.jd_analysis, cache_key)
+    if pdf_bytes is not None:
+        return pdf_bytes, html_content, "cache", None
+    
+    return None, html_content, None, cache_key
+
+def _cache_chrome_pdf(cache_key, pdf_bytes):
+    """Store a PDF printed by Chrome under the key _render_before_chrome returned"""
+    _load_resources()['pdf_cache'].put_bytes(cache_key, pdf_bytes)
+
+def _render_resume(jd_text, scored=None):
+    """
+    Run the pipeline for one JD, trying each PDF renderer in turn
+    
+    Returns:
+        tuple: (PDF bytes or None, rendered HTML for the print fallback,
+                renderer label)
+    """
+    pdf_bytes, html_content, renderer, cache_key = _render_before_chrome(jd_text, scored)
+    if cache_key is None:
+        return pdf_bytes, html_content, renderer
+    
+    pdf_bytes, renderer = _render_with_chrome(html_content)
+    if pdf_bytes is not None:
+        _cache_chrome_pdf(cache_key, pdf_bytes)
+    return pdf_bytes, html_content, renderer
+
+def render_pdf_bytes(jd_text, scored=None):
+    """
+    Generate the resume tailored to a job description as in-memory PDF bytes
+    
+    Nothing is written to the output location, so daemons, batch runs and
+    archive writers can stream the result directly.
+    
+    Args:
+        jd_text: Job description text
+        scored: Optional analysis and achievement scores batch mode prepared for the JD
+        
+    Returns:
+        bytes: PDF data
+        
+    Raises:
+        RuntimeError: If neither WeasyPrint nor Chrome could produce a PDF
+    """
+    pdf_bytes, _, _ = _render_resume(jd_text, scored)
+    if pdf_bytes is None:
+        raise RuntimeError("No PDF renderer available (install WeasyPrint or Chrome)")
+    return pdf_bytes
+
+@traced("write_output")
+def _write_pdf(pdf_bytes, output_filename):
+    """Write PDF bytes to output_filename, creating its directory"""
+    output_dir = os.path.dirname(os.path.abspath(output_filename))
+    os.makedirs(output_dir, exist_ok=True)
+    with open(output_filename, 'wb') as f:
+        f.write(pdf_bytes)
+
+def _warm_renderers():
+    """Start the renderer a daemon will use: WeasyPrint, or persistent Chrome without it"""
+    if not _get_pdf_generator():
+        from chrome_devtools import get_chrome_pool
+        get_chrome_pool()
+
+def generate_dynamic_resume(jd_text, output_filename, variants=None, scored=None):
+    """
+    Generate resume tailored to job description
+    
+    Args:
+        jd_text: Job description text
+        output_filename: Output PDF path
+        variants: Optional variant dicts; when given, every variant is generated
+                  by generate_resume_variants and its result list is returned
+        scored: Optional analysis and achievement scores batch mode prepared for the JD
+    
+    Returns:
+        str: Path written (the PDF, or the print-optimized HTML fallback), or
+             the list of variant results when variants are given
+    """
+    if variants is not None:
+        return generate_resume_variants(jd_text, variants, output_filename)
+    
+    pdf_bytes, html_content, renderer = _render_resume(jd_text, scored)
+    return _write_result(pdf_bytes, html_content, renderer, output_filename)
+    
+def _write_result(pdf_bytes, html_content, renderer, output_filename):
+    """
+    Write a rendered resume to output_filename, or its HTML when no renderer produced a PDF
+    
+    Returns:
+        str: Path written
+    """
+    if pdf_bytes is not None:
+        _write_pdf(pdf_bytes, output_filename)
+        if renderer == "cache":
+            events.info("cache.reused", "Dynamic resume reused from cache: {output}", output=output_filename)
         else:
-            print("[INFO] WeasyPrint not available, using Chrome fallback...")
+            events.info("resume.generated", "Dynamic resume generated via {renderer}: {output}",
+                        renderer=renderer, output=output_filename)
+        return output_filename
+    
+    # Fallback: create print-optimized HTML
+    html_output = output_filename.replace('.pdf', '.html')
+    with open(html_output, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    events.warning("fallback.html", "Created print-optimized HTML: {output} - open it in a browser and use "
+                   "Ctrl+P to generate the PDF", output=html_output)
+    return html_output
+
+# Options a variant may pin; whatever it leaves out is chosen as for a single resume
+VARIANT_KEYS = ('id', 'achievement_cap', 'font_scale', 'title_segment', 'output')
+TITLE_SEGMENTS = ('benefits', 'saas', 'revenue', 'operations')
+
+def _normalize_variant(variant, index, output_filename):
+    """Validate one variant spec and fill in its id and output path"""
+    unknown = set(variant) - set(VARIANT_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown variant option(s): {', '.join(sorted(unknown))}")
+    
+    cap = variant.get('achievement_cap')
+    scale = variant.get('font_scale')
+    segment = variant.get('title_segment')
+    if cap is not None and (not isinstance(cap, int) or cap < 1):
+        raise ValueError(f"achievement_cap must be a positive integer, got {cap!r}")
+    if scale is not None and not (isinstance(scale, (int, float)) and 0.5 <= scale <= 1.5):
+        raise ValueError(f"font_scale must be between 0.5 and 1.5, got {scale!r}")
+    if segment is not None and segment not in TITLE_SEGMENTS:
+        raise ValueError(f"title_segment must be one of {', '.join(TITLE_SEGMENTS)}, got {segment!r}")
+    
+    variant_id = str(variant.get('id') or index + 1)
+    stem, extension = os.path.splitext(output_filename)
+    output = variant.get('output') or f"{stem}_{variant_id}{extension or '.pdf'}"
+    
+    return {'id': variant_id, 'achievement_cap': cap, 'font_scale': scale,
+            'title_segment': segment, 'output': output}
+
+@traced("prepare_variants")
+def _prepare_variants(jd_text, variants):
+    """
+    Build each variant's content from one JD analysis and one achievement scoring
+    
+    The resume is processed once per distinct title segment; caps and font
+    scales are applied to copies of that content.
+    """
+    from dataclasses import replace
+    from html_content_processor import HTMLContentProcessor
+    from relevance import get_scorer
+    
+    _refresh_resources()
+    parsed_resume = _load_resources()['parsed_resume']
+    processor = HTMLContentProcessor(jd_text)
+    scores = get_scorer(parsed_resume.jobs, parsed_resume.tools).score_map(processor.jd_analysis)
+    
+    processed = {}
+    contents = []
+    for variant in variants:
+        segment = variant['title_segment']
+        if segment not in processed:
+            processed[segment] = processor.process_parsed_resume(parsed_resume, PHOTO_PATH, scores, segment)
+        content = processed[segment]
         
-        # Fallback: try Chrome headless approach with absolute paths
-        import subprocess
+        # Fresh experience dicts per variant: the heuristic trim edits them in place
+        experiences = [dict(exp, achievements=exp['achievements'][:variant['achievement_cap']])
+                       for exp in content.experiences]
+        contents.append(replace(content, experiences=experiences,
+                                font_scale_factor=variant['font_scale'] or content.font_scale_factor))
+    
+    return contents
+
+def _render_variant(content, variant):
+    """
+    Render one prepared variant, searching only what the variant leaves open
+    
+    Returns:
+        tuple: (PDF bytes, fit metrics dict)
+    """
+    pdf_generator = _get_pdf_generator()
+    if pdf_generator:
+        from page_fitter import SinglePageFitter, MIN_ACHIEVEMENT_CAP
+        
+        template_dir = os.path.dirname(os.path.abspath(TEMPLATE_PATH))
+        fitter = SinglePageFitter(pdf_generator, _render_html, base_url=template_dir)
+        fit = fitter.fit(content,
+                         font_scales=[variant['font_scale']] if variant['font_scale'] else None,
+                         min_cap=variant['achievement_cap'] or MIN_ACHIEVEMENT_CAP)
+        metrics = {
+            'renderer': "WeasyPrint",
+            'achievement_cap': fit.achievement_cap,
+            'font_scale': fit.font_scale,
+            'pages': fit.pages,
+            'fill_ratio': round(fit.fill_ratio, 4) if fit.fill_ratio is not None else None,
+            'fits': fit.fits,
+            'layouts': fit.layouts
+        }
+        return pdf_generator.document_to_pdf_bytes(fit.document), metrics
+    
+    # Chrome sizes content with the length heuristic, which also resets the font scale
+    if variant['achievement_cap'] is None:
+        from html_content_processor import HTMLContentProcessor
+        content = HTMLContentProcessor().optimize_for_single_page(content)
+        content.font_scale_factor = variant['font_scale'] or content.font_scale_factor
+    
+    pdf_bytes, renderer = _render_with_chrome(_render_html(content))
+    if pdf_bytes is None:
+        raise RuntimeError("No PDF renderer available (install WeasyPrint or Chrome)")
+    
+    metrics = {
+        'renderer': renderer,
+        'achievement_cap': max((len(exp['achievements']) for exp in content.experiences), default=0),
+        'font_scale': content.font_scale_factor,
+        'pages': None,
+        'fill_ratio': None,
+        'fits': None,
+        'layouts': 0
+    }
+    return pdf_bytes, metrics
+
+def _run_variant(content, variant):
+    """Render one variant to its output path and report its fit metrics and timing"""
+    started = time.perf_counter()
+    result = {'id': variant['id'], 'output': None, 'ok': False, 'error': None,
+              'title_segment': variant['title_segment']}
+    
+    with span("variant"):
         try:
-            # Convert to absolute paths to avoid permission issues
-            abs_temp_html = os.path.abspath(temp_html_path)
-            abs_output = os.path.abspath(output_filename)
-            
-            for chrome_path in [
-                r'C:\Program Files\Google\Chrome\Application\chrome.exe',
-                r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
-                'chrome', 'google-chrome', 'chromium', 'chromium-browser'
-            ]:
+            pdf_bytes, metrics = _render_variant(content, variant)
+            _write_pdf(pdf_bytes, variant['output'])
+            result.update(metrics, output=variant['output'], ok=True, size_bytes=len(pdf_bytes))
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+    
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    return result
+
+def generate_resume_variants(jd_text, variants, output_filename='MarkCetola_AIO_Dynamic.pdf', workers=None):
+    """
+    Generate several variants of the resume for one JD in a single pass
+    
+    The JD is analyzed and the achievements scored once for all variants, and
+    every renderer process loads the parsed resume, template and fonts once.
+    Variants are rendered concurrently across a process pool. They always lay
+    out from scratch rather than reading the PDF cache, since the fit metrics
+    are part of the result.
+    
+    Args:
+        jd_text: Job description text
+        variants: Variant dicts, each optionally pinning "achievement_cap" (max
+                  achievements per job), "font_scale" (e.g. 0.95) and
+                  "title_segment" (benefits, saas, revenue or operations, for
+                  alternate job titles), with optional "id" and "output"
+        output_filename: Base path; variant "x" is written to <stem>_x.pdf
+        workers: Renderer processes (default: one per variant up to the CPU count, 1 renders in-process)
+    
+    Returns:
+        list: Per-variant result dicts with "id", "output", "ok", "error", "renderer",
+              "achievement_cap", "font_scale", "title_segment", "pages", "fill_ratio",
+              "fits", "layouts", "size_bytes" and "seconds", in input order
+    """
+    variants = [_normalize_variant(variant, index, output_filename) for index, variant in enumerate(variants)]
+    if not variants:
+        return []
+    
+    contents = _prepare_variants(jd_text, variants)
+    workers = min(workers or os.cpu_count() or 1, len(variants))
+    
+    if workers == 1:
+        return [_run_variant(content, variant) for content, variant in zip(contents, variants)]
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_run_variant, contents, variants))
+
+def load_variants(spec):
+    """
+    Read variant specs from a JSON file or an inline JSON list
+    
+    Args:
+        spec: Path to a JSON file holding a list of variant dicts, or the list itself as JSON
+    
+    Returns:
+        list: Variant dicts for generate_resume_variants
+    
+    Raises:
+        ValueError: If the JSON is malformed or a variant has invalid options
+    """
+    if os.path.exists(spec):
+        with open(spec, 'r', encoding='utf-8') as f:
+            variants = json.load(f)
+    else:
+        variants = json.loads(spec)
+    
+    if not isinstance(variants, list) or not all(isinstance(variant, dict) for variant in variants):
+        raise ValueError("Variants must be a JSON list of objects")
+    for index, variant in enumerate(variants):
+        _normalize_variant(variant, index, 'resume.pdf')
+    return variants
+
+def load_jobs(path):
+    """
+    Load JDs for batch generation
+    
+    Args:
+        path: JSONL file (one object per line with "jd_text" or "jd", and
+              optional "id" and "output") or a directory of .txt/.md JD files
+              
+    Returns:
+        list: Job dicts with "id", "jd_text" and optional "output"
+    """
+    jobs = []
+    
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.endswith(('.txt', '.md')):
+                continue
+            with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                jobs.append({'id': os.path.splitext(name)[0], 'jd_text': f.read()})
+        return jobs
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            job = _job_from_line(line, line_number)
+            if job:
+                jobs.append(job)
+    
+    return jobs
+
+def _job_from_line(line, line_number):
+    """Parse one JSONL record into a job dict (None for blank lines, ValueError for bad JSON)"""
+    line = line.strip()
+    if not line:
+        return None
+    
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError(f"Expected a JSON object, got {type(record).__name__}")
+    
+    return {
+        'id': str(record.get('id', line_number)),
+        'jd_text': record.get('jd_text') or record.get('jd', ''),
+        'output': record.get('output')
+    }
+
+def iter_jobs(lines):
+    """
+    Lazily parse a JSONL feed of JDs, one record per line
+    
+    Lines are read only as they are needed, so an endless feed (a pipe from a
+    scraper) is never held in memory. A malformed line becomes a job carrying
+    an "error" instead of stopping the feed.
+    
+    Args:
+        lines: Iterable of JSONL lines, e.g. sys.stdin or an open file
+    
+    Yields:
+        dict: Job dicts with "id", "jd_text" and optional "output" (or "error")
+    """
+    for line_number, line in enumerate(lines, 1):
+        try:
+            job = _job_from_line(line, line_number)
+        except ValueError as e:
+            job = {'id': str(line_number), 'jd_text': '', 'error': f"Invalid JSONL record: {e}"}
+        if job:
+            yield job
+
+def _normalize_job(job, index, output_dir):
+    """Accept job dicts or bare JD strings and fill in id and output path"""
+    if isinstance(job, str):
+        job = {'jd_text': job}
+    
+    job_id = str(job.get('id') or index + 1)
+    output = job.get('output') or os.path.join(output_dir, f"MarkCetola_{job_id}.pdf")
+    
+    return {'id': job_id, 'jd_text': job.get('jd_text', ''), 'output': output}
+
+def _score_jobs(jobs):
+    """
+    Analyze a window of jobs and score their achievements in one scorer batch
+    
+    Each job gets a "scored" entry that its worker renders from instead of
+    analyzing and scoring the JD itself; the legacy scorer scores the whole
+    window in one AchievementMatrix product. Jobs that cannot be analyzed
+    here are left for the worker to analyze and report.
+    
+    Args:
+        jobs: Normalized job dicts
+    
+    Returns:
+        list: The same jobs
+    """
+    from html_content_processor import HTMLContentProcessor
+    from relevance import get_scorer
+    
+    analyzed = []
+    for job in jobs:
+        if not job['jd_text'].strip():
+            continue
+        try:
+            analyzed.append((job, HTMLContentProcessor(job['jd_text']).jd_analysis))
+        except Exception:
+            continue
+    if not analyzed:
+        return jobs
+    
+    _refresh_resources()
+    parsed_resume = _load_resources()['parsed_resume']
+    scorer = get_scorer(parsed_resume.jobs, parsed_resume.tools)
+    score_maps = scorer.score_maps([jd_analysis for _, jd_analysis in analyzed])
+    for (job, jd_analysis), achievement_scores in zip(analyzed, score_maps):
+        job['scored'] = {'resume_hash': parsed_resume.source_hash, 'jd_analysis': jd_analysis,
+                         'achievement_scores': achievement_scores}
+    return jobs
+
+# Words left out of title abbreviations
+TITLE_STOPWORDS = {'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'the', 'to', 'with'}
+
+def jd_title(jd_text):
+    """The JD's job title: its first non-empty line, without markdown emphasis"""
+    for line in jd_text.splitlines():
+        line = line.strip().strip('#*_ ').strip()
+        if line:
+            return line[:120]
+    return ''
+
+def title_abbreviation(title):
+    """
+    Abbreviate a job title for file names, as the /jd command does (MarkCetola_CSM.pdf)
+    
+    Words after a comma, dash or bracket qualify the role and are dropped;
+    short all-caps words such as AI or VP are kept whole.
+    
+    Args:
+        title: Job title, e.g. "Customer Success Manager, Enterprise"
+    
+    Returns:
+        str: Up to 8 capitals, e.g. "CSM", or "JD" when the title has no words
+    """
+    role = re.split(r',|\(|\[|\s[-|\u2013\u2014]\s', title)[0]
+    words = re.findall(r"[A-Za-z][A-Za-z0-9+']*", role)
+    letters = ''.join(word if word.isupper() and len(word) <= 4 else word[0].upper()
+                      for word in words if word.lower() not in TITLE_STOPWORDS)
+    return letters[:8] or 'JD'
+
+def _run_job(job, trace=False, in_memory=False):
+    """Generate one batch job and report its outcome and timing"""
+    started = time.perf_counter()
+    result = {'id': job['id'], 'output': None, 'ok': False, 'error': None, 'cache_hit': False}
+    job_trace = Trace(_trace_name(job['output']), id=job['id'], output=job['output']) if trace else None
+    
+    with activate(job_trace), span("resume"):
+        try:
+            if not job['jd_text'].strip():
+                raise ValueError("Empty job description")
+            pdf_cache = _load_resources()['pdf_cache']
+            hits_before = pdf_cache.stats['hits']
+            if in_memory:
+                # Bundles take the PDF itself; the output path only names the archive member
+                result['jd_sha256'] = hashlib.sha256(job['jd_text'].encode('utf-8')).hexdigest()
+                result['title'] = jd_title(job['jd_text'])
+                result['abbreviation'] = title_abbreviation(result['title'])
+                result['pdf'] = render_pdf_bytes(job['jd_text'], job.get('scored'))
+                output = job['output']
+                # render_pdf_bytes returns PDF bytes or raises; the member name need not end in .pdf
+                result['ok'] = True
+            else:
+                output = generate_dynamic_resume(job['jd_text'], job['output'], scored=job.get('scored'))
+                result['ok'] = output.endswith('.pdf')
+                if not result['ok']:
+                    result['error'] = "PDF generation failed, wrote print-optimized HTML instead"
+            result['cache_hit'] = pdf_cache.stats['hits'] > hits_before
+            result['output'] = output
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+    
+    result['seconds'] = round(time.perf_counter() - started, 4)
+    if job_trace:
+        result['trace'] = job_trace.to_dict()
+    return result
+
+def _trace_name(output_filename):
+    """Name traces after the output file so they sort next to it"""
+    return os.path.splitext(os.path.basename(output_filename))[0]
+
+def _write_traces(traces, trace_dir=None, chrome_trace=None):
+    """Write per-resume JSON traces and/or one combined Chrome trace"""
+    if trace_dir:
+        for trace in traces:
+            write_json_trace(trace, os.path.join(trace_dir, f"{trace['name']}.trace.json"))
+        events.info("trace.written", "Wrote {count} stage trace(s) to {path}", count=len(traces), path=trace_dir)
+    if chrome_trace:
+        write_chrome_trace(traces, chrome_trace)
+        events.info("trace.chrome_written", "Wrote Chrome trace: {path}", path=chrome_trace)
+
+def _init_worker():
+    """Warm each pool worker once so every job reuses the parsed resume and template"""
+    _load_resources()
+
+def generate_dynamic_resumes(jobs, workers=None, output_dir='.', trace=False):
+    """
+    Generate resumes for many JDs across a process pool
+    
+    Args:
+        jobs: Iterable of job dicts ({"jd_text", optional "id", "output"}) or JD strings
+        workers: Number of worker processes (default: CPU count, 1 runs in-process)
+        output_dir: Directory for jobs that don't specify an output path
+        trace: Record per-stage timings for each job under the result's "trace" key
+        
+    Returns:
+        list: Per-job result dicts with "id", "output", "ok", "error", "cache_hit"
+              and "seconds", in input order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [_normalize_job(job, index, output_dir) for index, job in enumerate(jobs)]
+    workers = workers or os.cpu_count() or 1
+    
+    run_job = functools.partial(_run_job, trace=trace)
+    
+    if workers == 1 or len(jobs) <= 1:
+        _init_worker()
+        return [run_job(job) for start in range(0, len(jobs), SCORE_WINDOW)
+                for job in _score_jobs(jobs[start:start + SCORE_WINDOW])]
+    
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker) as pool:
+        # Each window is scored here while the workers render the previous ones. Scoring loads the
+        # parsed resume first, refreshing its cache once; workers then only read it
+        futures = {}
+        for start in range(0, len(jobs), SCORE_WINDOW):
+            for index, job in enumerate(_score_jobs(jobs[start:start + SCORE_WINDOW]), start):
+                futures[pool.submit(run_job, job)] = index
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    return results
+
+def _init_stream_worker():
+    """Send a stream worker's pipeline logging to stderr, leaving stdout to the result lines"""
+    sys.stdout = sys.stderr
+    _init_worker()
+
+def _read_jobs(jobs, job_queue):
+    """Feed jobs into the bounded queue from a thread, so a slow feed never holds up finished results"""
+    try:
+        for job in jobs:
+            job_queue.put(job)
+    except Exception as e:
+        job_queue.put({'id': 'input', 'jd_text': '', 'error': f"Reading JDs failed: {type(e).__name__}: {e}"})
+    finally:
+        job_queue.put(None)
+
+def stream_dynamic_resumes(jobs, workers=None, output_dir='.', window=None, ordered=True, trace=False,
+                           in_memory=False):
+    """
+    Generate resumes from a lazily read, possibly endless JD feed
+    
+    At most `window` jobs are in flight at once, counting finished results held
+    back for ordering, so memory stays flat however long the feed is. Each
+    result is yielded as soon as it can be.
+    
+    Args:
+        jobs: Iterable of job dicts or JD strings, e.g. iter_jobs(sys.stdin)
+        workers: Number of worker processes (default: CPU count, 1 runs in-process)
+        output_dir: Directory for jobs that don't specify an output path
+        window: Maximum jobs in flight (default: twice the worker count)
+        ordered: Yield results in input order; False yields them in completion order
+        trace: Record per-stage timings for each job under the result's "trace" key
+        in_memory: Return each PDF under the result's "pdf" key, with the JD's
+                   "jd_sha256", "title" and "abbreviation", instead of writing it to "output"
+    
+    Yields:
+        dict: Per-job result dicts, as from generate_dynamic_resumes
+    """
+    if not in_memory:
+        os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    window = max(1, window or 2 * workers)
+    run_job = functools.partial(_run_job, trace=trace, in_memory=in_memory)
+    
+    def prepare(index, job):
+        """Normalized job, or a finished result for a record that could not be parsed"""
+        if isinstance(job, dict) and job.get('error'):
+            return None, {'id': job['id'], 'output': None, 'ok': False, 'error': job['error'],
+                          'cache_hit': False, 'seconds': 0.0}
+        return _normalize_job(job, index, output_dir), None
+    
+    if workers == 1:
+        _init_worker()
+        for index, job in enumerate(jobs):
+            job, result = prepare(index, job)
+            yield result or run_job(job)
+        return
+    
+    import queue
+    import threading
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    
+    def finished(item):
+        return isinstance(item, dict) or item.done()
+    
+    def outcome(item):
+        return item if isinstance(item, dict) else item.result()
+    
+    in_flight = {}      # input index -> Future (or finished result dict), until yielded
+    next_index = 0      # next input index to read
+    next_yield = 0      # next input index to yield when ordered
+    exhausted = False
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_stream_worker) as pool:
+        # Start the workers before the reader thread: a child forked while that thread
+        # holds the stdin lock deadlocks when multiprocessing closes its stdin
+        pool.submit(int).result()
+        
+        job_queue = queue.Queue(maxsize=window)
+        threading.Thread(target=_read_jobs, args=(jobs, job_queue), daemon=True).start()
+        
+        while True:
+            # Top up the window; block on the feed only when nothing is rendering
+            arrived = []
+            while not exhausted and len(in_flight) + len(arrived) < window:
                 try:
-                    cmd = [
-                        chrome_path,
-                        '--headless',
-                        '--disable-gpu',
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        f'--print-to-pdf={abs_output}',
-                        '--print-to-pdf-no-header',
-                        '--disable-extensions',
-                        '--run-all-compositor-stages-before-draw',
-                        '--virtual-time-budget=5000',
-                        abs_temp_html
-                    ]
-                    
-                    print(f"[DEBUG] Trying Chrome at: {chrome_path}")
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, cwd=os.getcwd())
-                    
-                    if result.returncode == 0 and os.path.exists(abs_output):
-                        print(f"[OK] Dynamic resume generated via Chrome: {abs_output}")
-                        return abs_output
-                    else:
-                        print(f"[DEBUG] Chrome failed with code {result.returncode}")
-                        if result.stderr:
-                            print(f"[DEBUG] Chrome stderr: {result.stderr}")
-                            
-                except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError) as e:
-                    print(f"[DEBUG] Chrome attempt failed: {e}")
-                    continue
+                    job = job_queue.get(block=not (in_flight or arrived), timeout=None)
+                except queue.Empty:
+                    break
+                if job is None:
+                    exhausted = True
+                    break
+                arrived.append(job)
             
-            print("[INFO] Chrome PDF generation failed on all attempts")
-        except Exception as e:
-            print(f"[INFO] Chrome fallback failed: {e}")
+            # Jobs that arrived together are analyzed and scored as one window
+            prepared = [prepare(next_index + offset, job) for offset, job in enumerate(arrived)]
+            _score_jobs([job for job, result in prepared if result is None])
+            for job, result in prepared:
+                in_flight[next_index] = result or pool.submit(run_job, job)
+                next_index += 1
+            
+            if not in_flight:
+                if exhausted:
+                    return
+                continue
+            
+            # Poll the feed again shortly unless the window is full or the feed has ended
+            running = [item for item in in_flight.values() if not finished(item)]
+            if running:
+                can_read = not exhausted and len(in_flight) < window
+                wait(running, timeout=0.05 if can_read else None, return_when=FIRST_COMPLETED)
+            
+            if ordered:
+                while next_yield in in_flight and finished(in_flight[next_yield]):
+                    yield outcome(in_flight.pop(next_yield))
+                    next_yield += 1
+            else:
+                for index in [index for index, item in in_flight.items() if finished(item)]:
+                    yield outcome(in_flight.pop(index))
+
+# Resumes an AsyncResumeGenerator renders at once unless configured otherwise
+DEFAULT_ASYNC_CONCURRENCY = int(os.environ.get('RESUME_ASYNC_CONCURRENCY', '0')) or os.cpu_count() or 1
+DEFAULT_ASYNC_TIMEOUT = 120.0
+CHROME_CLI_TIMEOUT = 30
+
+class AsyncResumeGenerator:
+    """
+    asyncio front end to the resume pipeline, for services that render on demand
+    
+    Calls are admitted through a semaphore. Content processing, templating and
+    WeasyPrint fitting are CPU-bound and run in an executor, so the event loop
+    stays responsive; Chrome runs as an asyncio subprocess, or through the
+    persistent tab pool on a worker thread. Every call has a deadline, and a
+    timed-out or cancelled call kills the Chrome it launched. Work already
+    handed to an executor runs to completion in the background.
+    """
+    
+    def __init__(self, concurrency=None, semaphore=None, executor=None, timeout=DEFAULT_ASYNC_TIMEOUT):
+        """
+        Initialize generator
+        
+        Args:
+            concurrency: Resumes rendered at once (default: RESUME_ASYNC_CONCURRENCY
+                         env var or the CPU count)
+            semaphore: asyncio.Semaphore to admit calls through instead, e.g. one
+                       shared with the caller's other rendering work
+            executor: concurrent.futures executor for the CPU-bound stages
+                      (default: a process pool of `concurrency` warmed workers,
+                      started on first use and shut down by close())
+            timeout: Seconds allowed per resume, including the wait for a slot;
+                     None for no limit
+        """
+        self.concurrency = concurrency or DEFAULT_ASYNC_CONCURRENCY
+        self.timeout = timeout
+        self._semaphore = semaphore
+        self._owns_semaphore = semaphore is None
+        self._semaphore_loop = None
+        self._executor = executor
+        self._owns_executor = executor is None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        import asyncio
+        
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+    
+    def close(self):
+        """Shut down the executor this generator started"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    async def render_pdf_bytes(self, jd_text, timeout=None):
+        """
+        Generate the resume tailored to a job description as in-memory PDF bytes
+        
+        Args:
+            jd_text: Job description text
+            timeout: Seconds allowed (default: the generator's timeout)
+        
+        Returns:
+            bytes: PDF data
+        
+        Raises:
+            RuntimeError: If neither WeasyPrint nor Chrome could produce a PDF
+            asyncio.TimeoutError: If the deadline passed first
+        """
+        pdf_bytes, _, _ = await self._render(jd_text, timeout)
+        if pdf_bytes is None:
+            raise RuntimeError("No PDF renderer available (install WeasyPrint or Chrome)")
+        return pdf_bytes
+    
+    async def generate(self, jd_text, output_filename, timeout=None):
+        """
+        Generate resume tailored to job description, as generate_dynamic_resume does
+        
+        Args:
+            jd_text: Job description text
+            output_filename: Output PDF path
+            timeout: Seconds allowed (default: the generator's timeout)
+        
+        Returns:
+            str: Path written (the PDF, or the print-optimized HTML fallback)
+        
+        Raises:
+            asyncio.TimeoutError: If the deadline passed first
+        """
+        import asyncio
+        
+        pdf_bytes, html_content, renderer = await self._render(jd_text, timeout)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _write_result, pdf_bytes, html_content, renderer, output_filename
+        )
+    
+    async def _render(self, jd_text, timeout):
+        """Render one resume within its deadline: (PDF bytes or None, HTML, renderer label)"""
+        import asyncio
+        
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+        return await asyncio.wait_for(self._render_admitted(jd_text, deadline), timeout)
+    
+    async def _render_admitted(self, jd_text, deadline):
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            pdf_bytes, html_content, renderer, cache_key = await loop.run_in_executor(
+                self._get_executor(), _render_before_chrome, jd_text
+            )
+            if cache_key is None:
+                return pdf_bytes, html_content, renderer
+            
+            remaining = None if deadline is None else max(deadline - loop.time(), 1.0)
+            pdf_bytes, renderer = await _arender_with_chrome(html_content, remaining)
+            if pdf_bytes is not None:
+                await loop.run_in_executor(self._get_executor(), _cache_chrome_pdf, cache_key, pdf_bytes)
+            return pdf_bytes, html_content, renderer
+    
+    def _get_semaphore(self, loop):
+        """The caller's semaphore, or one of our own created for the running event loop"""
+        import asyncio
         
-        # Fallback: create print-optimized HTML
-        html_output = output_filename.replace('.pdf', '.html')
-        with open(html_output, 'w', encoding='utf-8') as f:
+        if self._owns_semaphore and self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    def _get_executor(self):
+        """The caller's executor, or a process pool started on first use"""
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            # Forking a process that runs an event loop and its threads can deadlock the child
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.concurrency, mp_context=context,
+                                                 initializer=_init_worker)
+        return self._executor
+
+async def _arender_with_chrome(html_content, timeout=None):
+    """
+    Print HTML with persistent Chrome, launching Chrome directly if that fails, without blocking the loop
+    
+    Args:
+        html_content: Complete HTML document
+        timeout: Seconds left for this resume, bounding each DevTools step
+    
+    Returns:
+        tuple: (PDF bytes or None, renderer label)
+    """
+    import asyncio
+    
+    # The tab pool is thread-safe and blocks only the worker thread driving it
+    loop = asyncio.get_running_loop()
+    pdf_bytes = await loop.run_in_executor(None, _render_with_chrome_pool, html_content, timeout)
+    if pdf_bytes is not None:
+        return pdf_bytes, "persistent Chrome"
+    
+    try:
+        return await _arender_with_chrome_cli(html_content), "Chrome"
+    except Exception as e:
+        events.warning("chrome.fallback_failed", "Chrome fallback failed: {error}", error=str(e) or type(e).__name__)
+        return None, "Chrome"
+
+async def _arender_with_chrome_cli(html_content):
+    """
+    Print HTML to PDF bytes by launching Chrome as an asyncio subprocess
+    
+    Chrome is killed if the render times out or the calling task is cancelled.
+    
+    Returns:
+        bytes or None: PDF data, or None when no browser is found or it failed
+    """
+    import asyncio
+    import tempfile
+    from browser_discovery import find_browser_path
+    
+    loop = asyncio.get_running_loop()
+    chrome_path = await loop.run_in_executor(None, find_browser_path)
+    if not chrome_path:
+        events.warning("chrome.not_found", "No Chrome, Chromium or Edge browser found")
+        return None
+    
+    with tempfile.TemporaryDirectory(prefix='resume-') as scratch_dir:
+        temp_html_path = os.path.join(scratch_dir, 'resume.html')
+        temp_pdf_path = os.path.join(scratch_dir, 'resume.pdf')
+        with open(temp_html_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
-        print(f"[FALLBACK] Created print-optimized HTML: {html_output}")
-        print("Please open in browser and use Ctrl+P to generate PDF")
-        return html_output
         
+        cmd = _chrome_cli_command(chrome_path, temp_html_path, temp_pdf_path)
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE, cwd=os.getcwd()
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), CHROME_CLI_TIMEOUT)
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+        
+        if process.returncode == 0 and os.path.exists(temp_pdf_path):
+            with open(temp_pdf_path, 'rb') as f:
+                return f.read()
+        
+        events.warning("chrome.failed", "Chrome PDF generation failed with code {returncode}",
+                       returncode=process.returncode, stderr=stderr.decode('utf-8', 'replace'))
+        return None
+
+_async_generator = None
+
+async def agenerate_dynamic_resume(jd_text, output_filename, generator=None, timeout=None):
+    """
+    Generate resume tailored to job description from a coroutine
+    
+    Concurrent calls share one AsyncResumeGenerator, so at most
+    DEFAULT_ASYNC_CONCURRENCY resumes render at once; pass a generator to
+    choose the concurrency, semaphore or executor.
+    
+    Args:
+        jd_text: Job description text
+        output_filename: Output PDF path
+        generator: AsyncResumeGenerator to render with (default: a shared one)
+        timeout: Seconds allowed (default: the generator's timeout)
+    
+    Returns:
+        str: Path written (the PDF, or the print-optimized HTML fallback)
+    
+    Raises:
+        asyncio.TimeoutError: If the deadline passed first
+    """
+    global _async_generator
+    
+    if generator is None:
+        if _async_generator is None:
+            _async_generator = AsyncResumeGenerator()
+        generator = _async_generator
+    return await generator.generate(jd_text, output_filename, timeout)
+
+def _stream_main(args):
+    """Stream mode: JSON result lines on stdout, pipeline logging on stderr"""
+    if args.chrome_trace:
+        print("[ERROR] --chrome-trace needs the whole run; use --trace-dir with --stream", file=sys.stderr)
+        return False
+    
+    results_out = sys.stdout
+    sys.stdout = sys.stderr
+    
+    feed = sys.stdin if args.stream == '-' else open(args.stream, 'r', encoding='utf-8')
+    generated = failed = 0
+    try:
+        for result in stream_dynamic_resumes(iter_jobs(feed), workers=args.workers, output_dir=args.output_dir,
+                                             window=args.window, ordered=args.order == 'input',
+                                             trace=bool(args.trace_dir)):
+            if args.trace_dir:
+                _write_traces([result.pop('trace')], args.trace_dir)
+            results_out.write(json.dumps(result) + "\n")
+            results_out.flush()
+            generated += result['ok']
+            failed += not result['ok']
     finally:
-        if os.path.exists(temp_html_path):
-            os.unlink(temp_html_path)
+        if feed is not sys.stdin:
+            feed.close()
+    
+    events.info("stream.done", "{generated} resumes generated, {failed} failed", generated=generated, failed=failed)
+    return not failed
 
-if __name__ == "__main__":
-    # AI Optimization JD
-    jd_text = """AI Optimization Specialist, Support
+def _bundle_main(args):
+    """Bundle mode: PDFs rendered in memory and streamed into one archive with a manifest"""
+    from resume_bundle import ResumeBundle
+    
+    if not (args.batch or args.stream):
+        print("[ERROR] --bundle needs JDs from --batch or --stream", file=sys.stderr)
+        return False
+    if args.chrome_trace:
+        print("[ERROR] --chrome-trace needs the whole run; use --trace-dir with --bundle", file=sys.stderr)
+        return False
+    
+    # An archive written to stdout owns it; pipeline logging goes to stderr
+    if args.bundle == '-':
+        sys.stdout = sys.stderr
+    
+    if args.stream:
+        feed = sys.stdin if args.stream == '-' else open(args.stream, 'r', encoding='utf-8')
+        jobs = iter_jobs(feed)
+    else:
+        feed = None
+        jobs = load_jobs(args.batch)
+    
+    started = time.perf_counter()
+    try:
+        with ResumeBundle(args.bundle, args.bundle_format) as bundle:
+            for result in stream_dynamic_resumes(jobs, workers=args.workers, window=args.window,
+                                                 ordered=args.order == 'input', trace=bool(args.trace_dir),
+                                                 in_memory=True):
+                if args.trace_dir:
+                    _write_traces([result.pop('trace')], args.trace_dir)
+                pdf_bytes = result.pop('pdf', None)
+                bundle.add(result, pdf_bytes if result['ok'] else None)
+                if not result['ok']:
+                    events.warning("bundle.job_failed", "Job {id} failed: {error}", id=result['id'],
+                                   error=result['error'])
+    finally:
+        if feed not in (None, sys.stdin):
+            feed.close()
+    
+    entries = bundle.entries
+    failed = sum(1 for entry in entries if not entry['ok'])
+    cache_hits = sum(1 for entry in entries if entry['cache_hit'])
+    target = 'stdout' if args.bundle == '-' else args.bundle
+    events.info("bundle.done", "{generated}/{total} resumes written to {target} ({format}) in {seconds:.1f}s "
+                "({cache_hits} served from PDF cache)", generated=len(entries) - failed, total=len(entries),
+                target=target, format=bundle.format, seconds=time.perf_counter() - started, cache_hits=cache_hits)
+    
+    if args.results:
+        with open(args.results, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+    
+    return not failed
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description='Generate JD-tailored resumes')
+    parser.add_argument('--batch', metavar='PATH',
+                       help='JSONL file or directory of JD text files to generate in one run')
+    parser.add_argument('--stream', metavar='PATH', nargs='?', const='-',
+                       help='Read a JSONL feed of JDs lazily from PATH or stdin ("-") and print one '
+                            'JSON result line per resume as it finishes')
+    parser.add_argument('--bundle', metavar='PATH',
+                       help='Stream the --batch or --stream PDFs into one zip or tar archive with a '
+                            'manifest.json, instead of loose files ("-" writes to stdout)')
+    parser.add_argument('--bundle-format', choices=['zip', 'tar', 'tgz'], default=None,
+                       help='Archive format for --bundle (default: from its extension, else zip)')
+    parser.add_argument('--window', type=int, default=None,
+                       help='Maximum resumes in flight in stream and bundle modes '
+                            '(default: twice the worker count)')
+    parser.add_argument('--order', choices=['input', 'completion'], default='input',
+                       help='Stream result and bundle member order (default: input)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for batch and variant modes (default: CPU count)')
+    parser.add_argument('--output-dir', default='.',
+                       help='Output directory for batch mode, and the only directory a --serve daemon '
+                            'writes PDFs to (default: current directory)')
+    parser.add_argument('--results', metavar='PATH',
+                       help='Write per-job batch or per-variant results as JSON to this path')
+    parser.add_argument('--pdf-cache-mb', type=float, default=None,
+                       help='Size cap for the rendered PDF cache in MB (0 disables it)')
+    parser.add_argument('--dedup-threshold', type=float, default=None,
+                       help='Estimated similarity at which a JD reuses an earlier near-duplicate JD\'s '
+                            'resume (default: RESUME_JD_DEDUP_THRESHOLD or 0.85; 0 disables)')
+    parser.add_argument('--scorer', choices=['legacy', 'bm25'], default=None,
+                       help='Achievement and tool ranking: hand-tuned weights or BM25 against the JD text '
+                            '(default: RESUME_SCORER or legacy)')
+    parser.add_argument('--jd-file', metavar='PATH',
+                       help='Read a single JD from this file (default: built-in sample JD)')
+    parser.add_argument('-o', '--output', default='MarkCetola_AIO_Dynamic.pdf',
+                       help='Output PDF path for a single JD')
+    parser.add_argument('--variants', metavar='JSON',
+                       help='Generate variants of the single JD: a JSON file or inline JSON list of '
+                            '{"id", "achievement_cap", "font_scale", "title_segment"} objects')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run a warm render daemon on localhost instead of generating')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help=f'Render daemon port (default: {DEFAULT_PORT})')
+    parser.add_argument('--no-daemon', action='store_true',
+                       help='Render in this process even if a daemon is running')
+    parser.add_argument('--trace-dir', metavar='DIR',
+                       help='Write a JSON stage-timing trace per resume to this directory '
+                            '(renders in-process)')
+    parser.add_argument('--chrome-trace', metavar='PATH',
+                       help='Write stage timings for the run as a Chrome trace (chrome://tracing, Perfetto)')
+    parser.add_argument('--log-level', choices=list(events.LEVELS), default=None,
+                       help='Lowest pipeline event level to print (default: RESUME_LOG_LEVEL or info)')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                       help='Print only warnings and errors, with no per-resume output (--log-level warning)')
+    parser.add_argument('--log-format', choices=list(events.LOG_FORMATS), default=None,
+                       help='Pipeline events as [TAG] text lines or one JSON object per line '
+                            '(default: RESUME_LOG_FORMAT or text)')
+    
+    args = parser.parse_args()
+    
+    # Also exported to the environment, for batch and variant worker processes
+    events.configure(level='warning' if args.quiet else args.log_level, format=args.log_format)
+    
+    # Environment rather than globals so batch worker processes pick it up too
+    if args.pdf_cache_mb is not None:
+        os.environ['RESUME_PDF_CACHE_MB'] = str(args.pdf_cache_mb)
+    if args.dedup_threshold is not None:
+        os.environ['RESUME_JD_DEDUP_THRESHOLD'] = str(args.dedup_threshold)
+    if args.scorer is not None:
+        os.environ['RESUME_SCORER'] = args.scorer
+    
+    if args.serve:
+        serve(generate_dynamic_resume, port=args.port, warmup=_warm_renderers,
+              render_bytes_func=render_pdf_bytes, output_dir=args.output_dir, settings=_daemon_settings())
+        return True
+    
+    tracing = bool(args.trace_dir or args.chrome_trace)
+    
+    if args.bundle:
+        return _bundle_main(args)
+    
+    if args.stream:
+        return _stream_main(args)
+    
+    if args.batch:
+        jobs = load_jobs(args.batch)
+        started = time.perf_counter()
+        results = generate_dynamic_resumes(jobs, workers=args.workers, output_dir=args.output_dir,
+                                           trace=tracing)
+        elapsed = time.perf_counter() - started
+        
+        if tracing:
+            _write_traces([r.pop('trace') for r in results], args.trace_dir, args.chrome_trace)
+        
+        failures = [r for r in results if not r['ok']]
+        cache_hits = sum(1 for r in results if r['cache_hit'])
+        events.info("batch.done", "{generated}/{total} resumes generated in {seconds:.1f}s "
+                    "({cache_hits} served from PDF cache)", generated=len(results) - len(failures),
+                    total=len(results), seconds=elapsed, cache_hits=cache_hits)
+        for failure in failures:
+            events.warning("batch.job_failed", "Job {id} failed: {error}", id=failure['id'], error=failure['error'])
+        
+        if args.results:
+            with open(args.results, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+        
+        return not failures
+    
+    if args.jd_file:
+        with open(args.jd_file, 'r', encoding='utf-8') as f:
+            jd_text = f.read()
+    else:
+        jd_text = SAMPLE_JD
+    
+    if args.variants:
+        try:
+            variants = load_variants(args.variants)
+        except ValueError as e:
+            print(f"[ERROR] Invalid --variants: {e}")
+            return False
+        
+        trace = Trace(_trace_name(args.output), output=args.output) if tracing else None
+        # Spans are only recorded in this process, so tracing renders variants in-process
+        with activate(trace), span("resume"):
+            results = generate_resume_variants(jd_text, variants, args.output,
+                                               workers=1 if tracing else args.workers)
+        if trace:
+            _write_traces([trace.to_dict()], args.trace_dir, args.chrome_trace)
+        
+        for result in results:
+            if not result['ok']:
+                events.warning("variant.failed", "{id} failed: {error}", id=result['id'], error=result['error'])
+                continue
+            if events.enabled(events.INFO):
+                pages = f"{result['pages']} page(s)" if result['pages'] is not None else "pages not measured"
+                fill = f", fill {result['fill_ratio']:.0%}" if result['fill_ratio'] is not None else ""
+                events.info("variant.done", "{id}: {output} - {achievement_cap} achievements/job at {font_scale}x, "
+                            "{layout} via {renderer} ({seconds:.2f}s)", layout=pages + fill,
+                            **{key: result[key] for key in ('id', 'output', 'achievement_cap', 'font_scale',
+                                                            'renderer', 'seconds', 'pages', 'fill_ratio')})
+        
+        if args.results:
+            with open(args.results, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+        
+        return all(result['ok'] for result in results)
+    
+    # Hand off to a warm daemon when one is running (tracing needs the stages in this process)
+    if not args.no_daemon and not tracing:
+        output = RenderClient(port=args.port, settings=_daemon_settings()).render(jd_text, args.output)
+        if output:
+            return output.endswith('.pdf')
+    
+    trace = Trace(_trace_name(args.output), output=args.output) if tracing else None
+    with activate(trace), span("resume"):
+        output = generate_dynamic_resume(jd_text, args.output)
+    
+    if trace:
+        _write_traces([trace.to_dict()], args.trace_dir, args.chrome_trace)
+    
+    return output.endswith('.pdf')
+
+# AI Optimization JD
+SAMPLE_JD = """AI Optimization Specialist, Support
     At Vanta, our mission is to help businesses earn and prove trust. As a Support Conversation Designer, you will empower both our customers and Support team by building and maintaining the AI-powered knowledge that fuels our customer-facing chatbot and internal AI Copilot. You'll collaborate closely with Support, Customer Education, Product, and Engineering teams to ensure our AI tools deliver accurate, helpful responses while enhancing customer experience and support efficiency at scale.
     
     Key requirements:
@@ -153,5 +1506,7 @@ if __name__ == "__main__":
     - Technical Skills: Familiarity with APIs, JSON, or scripting languages (e.g., Python, JavaScript)
     - Data-Driven Mindset: Ability to interpret AI performance data and make insights-driven decisions
     - Support Expertise: Proven experience in technical troubleshooting and customer inquiries"""
-    
-    generate_dynamic_resume(jd_text, "MarkCetola_AIO_Dynamic.pdf")
\ No newline at end of file
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
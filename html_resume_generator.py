@@ -12,20 +12,8 @@ from pathlib import Path
 # Add modules to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
 
-try:
-    from modules.html_generator import HTMLResumeGenerator
-    from modules.html_content_processor import HTMLContentProcessor
-    
-    # Try WeasyPrint first, fall back to simple generator
-    try:
-        from modules.html_pdf_generator import HTMLPDFGenerator
-        PDF_GENERATOR_TYPE = "weasyprint"
-    except ImportError:
-        print("⚠️ WeasyPrint not available, using browser-based PDF generation")
-        from modules.simple_html_pdf import SimpleHTMLPDFGenerator as HTMLPDFGenerator
-        PDF_GENERATOR_TYPE = "browser"
-        
-except ImportError as e:
+def _import_error_exit(e: ImportError):
+    """Explain a missing dependency and exit"""
     print(f"❌ Error importing modules: {e}")
     print("💡 Make sure all required dependencies are installed:")
     print("   pip install jinja2")
@@ -34,13 +22,49 @@ except ImportError as e:
 class ProfessionalResumeGenerator:
     """
     Main class for generating professional PDF resumes using HTML/CSS approach
+    
+    The content processor, Jinja and WeasyPrint are imported the first time a
+    stage needs them, so --preview, --validate and HTML-only runs start fast.
     """
     
     def __init__(self):
-        self.pdf_generator = HTMLPDFGenerator()
-        self.html_generator = HTMLResumeGenerator()
-        self.content_processor = HTMLContentProcessor()
-        self.generator_type = PDF_GENERATOR_TYPE
+        self._pdf_generator = None
+        self._html_generator = None
+        self.generator_type = None
+    
+    @property
+    def pdf_generator(self):
+        """WeasyPrint generator when it can load, otherwise browser-based PDF generation"""
+        if self._pdf_generator is None:
+            try:
+                from modules.html_pdf_generator import HTMLPDFGenerator
+                self._pdf_generator = HTMLPDFGenerator()
+                self.generator_type = "weasyprint"
+            except ImportError:
+                print("⚠️ WeasyPrint not available, using browser-based PDF generation")
+                try:
+                    from modules.simple_html_pdf import SimpleHTMLPDFGenerator
+                except ImportError as e:
+                    _import_error_exit(e)
+                self._pdf_generator = SimpleHTMLPDFGenerator()
+                self.generator_type = "browser"
+        return self._pdf_generator
+    
+    @property
+    def html_generator(self):
+        """Markdown-to-HTML generator"""
+        if self._html_generator is None:
+            try:
+                from modules.html_generator import HTMLResumeGenerator
+            except ImportError as e:
+                _import_error_exit(e)
+            self._html_generator = HTMLResumeGenerator()
+        return self._html_generator
+    
+    @property
+    def content_processor(self):
+        """Content processor shared with the HTML generator"""
+        return self.html_generator.content_processor
     
     def generate_resume(self, 
                        markdown_path: str, 
@@ -177,10 +201,11 @@ class ProfessionalResumeGenerator:
     def validate_system(self) -> bool:
         """Validate that all system dependencies are available"""
         print("🔧 Validating system dependencies...")
+        pdf_generator = self.pdf_generator
         print(f"📄 Using PDF generator: {self.generator_type}")
         
         # Check PDF generation dependencies
-        pdf_valid = self.pdf_generator.validate_dependencies()
+        pdf_valid = pdf_generator.validate_dependencies()
         
         # Check template directory
         template_dir = Path(__file__).parent / "templates"
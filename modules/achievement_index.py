@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Achievement Index
+Inverted index from JD terms to the resume achievements and tools that contain them
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from html_content_processor import (
+    METRIC_RESULT_RE, SEGMENT_ACHIEVEMENT_RES, AI_FOCUS_RE, LEADERSHIP_RE, TOOL_MENTION_RE,
+    METRIC_RESULT_WEIGHT, PRIMARY_TERM_WEIGHT, PRIMARY_PATTERN_WEIGHT, SEGMENT_TERM_WEIGHT,
+    OPERATIONS_PATTERN_WEIGHT, JD_SKILL_WEIGHT, JD_METRIC_WEIGHT, AI_FOCUS_WEIGHT,
+    LEADERSHIP_WEIGHT, TOOL_MENTION_WEIGHT, DETAIL_WEIGHT, DETAIL_MIN_LENGTH, FOCUSED_SEGMENTS,
+    TOOL_SKILL_WEIGHT, TOOL_PLATFORM_WEIGHT, TOOL_SEGMENT_WEIGHT, TOOL_PROFESSIONAL_WEIGHT,
+    SEGMENT_TOOL_TERMS, PROFESSIONAL_TOOL_TERMS
+)
+from jd_term_matcher import JD_TERM_CATEGORIES
+from relevance import AchievementScorer
+from stage_timing import traced
+
+def achievement_priors(achievements: List[str]) -> Dict[Optional[str], List[int]]:
+    """
+    JD-independent points of each achievement, per kind of JD focus
+    
+    Metric results, leadership, tool mentions and detail count for every JD;
+    the focus adds its segment's pattern points, and without a JD the AI
+    focus pattern is scored instead.
+    
+    Args:
+        achievements: Achievement texts
+    
+    Returns:
+        dict: None (no JD), each of FOCUSED_SEGMENTS and 'operations' -> points in achievements order
+    """
+    base = [_base_score(achievement) for achievement in achievements]
+    priors = {
+        None: [score + (AI_FOCUS_WEIGHT if AI_FOCUS_RE.search(achievement) else 0)
+               for score, achievement in zip(base, achievements)]
+    }
+    for segment in FOCUSED_SEGMENTS + ('operations',):
+        weight = PRIMARY_PATTERN_WEIGHT if segment in FOCUSED_SEGMENTS else OPERATIONS_PATTERN_WEIGHT
+        pattern = SEGMENT_ACHIEVEMENT_RES[segment]
+        priors[segment] = [score + (weight if pattern.search(achievement) else 0)
+                           for score, achievement in zip(base, achievements)]
+    return priors
+
+def tool_priors(tools: List[str]) -> Dict[Optional[str], List[int]]:
+    """
+    JD-independent points of each tool, per primary JD segment
+    
+    Args:
+        tools: Technical Skills entries
+    
+    Returns:
+        dict: None (no or other focus) and each segment of SEGMENT_TOOL_TERMS -> points in tools order
+    """
+    tools_lowered = [tool.lower() for tool in tools]
+    professional = [TOOL_PROFESSIONAL_WEIGHT if any(term in tool for term in PROFESSIONAL_TOOL_TERMS) else 0
+                    for tool in tools_lowered]
+    priors = {None: professional}
+    for segment, terms in SEGMENT_TOOL_TERMS.items():
+        priors[segment] = [score + (TOOL_SEGMENT_WEIGHT if any(term in tool for term in terms) else 0)
+                           for score, tool in zip(professional, tools_lowered)]
+    return priors
+
+def jd_term_weights(jd_analysis: Optional[Dict]) -> Tuple[Optional[str], List[Tuple[str, int]]]:
+    """
+    Legacy weights one JD gives to terms found in an achievement
+    
+    Args:
+        jd_analysis: HTMLContentProcessor.jd_analysis, or None for the no-JD scoring
+    
+    Returns:
+        tuple: (achievement_priors key for the JD's focus, [(lowercased term, weight)]);
+               a repeated JD term is listed again, as its points add up
+    """
+    if not jd_analysis or 'primary_focus' not in jd_analysis:
+        return None, []
+    
+    focus = jd_analysis['primary_focus']
+    primary_segment = focus.get('primary')
+    segment_terms = focus.get('segment_terms', {})
+    
+    # Repeated JD terms add up, as in the per-term loops of _score_achievement
+    if primary_segment in FOCUSED_SEGMENTS:
+        focus_key = primary_segment
+        weighted_terms = [(term, PRIMARY_TERM_WEIGHT) for term in segment_terms.get(primary_segment, [])]
+    else:
+        focus_key = 'operations'
+        weighted_terms = [(term, SEGMENT_TERM_WEIGHT) for segment in segment_terms
+                          for term in segment_terms[segment]]
+    weighted_terms += [(skill, JD_SKILL_WEIGHT) for skill in jd_analysis.get('must_have_skills', [])]
+    weighted_terms += [(metric, JD_METRIC_WEIGHT) for metric in jd_analysis.get('success_metrics', [])]
+    return focus_key, [(term.lower(), weight) for term, weight in weighted_terms]
+
+def _base_score(achievement: str) -> int:
+    """Points that do not depend on the JD"""
+    score = 0
+    if METRIC_RESULT_RE.search(achievement):
+        score += METRIC_RESULT_WEIGHT
+    if LEADERSHIP_RE.search(achievement):
+        score += LEADERSHIP_WEIGHT
+    if TOOL_MENTION_RE.search(achievement):
+        score += TOOL_MENTION_WEIGHT
+    if len(achievement) > DETAIL_MIN_LENGTH:
+        score += DETAIL_WEIGHT
+    return score
+
+class AchievementIndex(AchievementScorer):
+    """
+    Postings from lowercased JD terms to achievement and tool IDs
+    
+    HTMLContentProcessor scores an achievement by testing every JD term as a
+    lowercased substring of it, and a tool by testing JD skills and platforms
+    against it in both directions. Those tests depend only on the term and the
+    resume, so they are run once per resume: at construction for the whole JD
+    term vocabulary, and on first use for any other term. Scoring a JD then
+    starts from precomputed per-segment base scores and walks only the
+    postings of the JD's terms. Scores are identical to
+    HTMLContentProcessor._score_achievement and _score_tool. This is the
+    "legacy" scorer of relevance.get_scorer.
+    """
+    
+    name = 'legacy'
+    
+    def __init__(self, achievements: List[str], tools: List[str]):
+        """
+        Build the index
+        
+        Args:
+            achievements: Achievement texts, usually every bullet of the parsed resume
+            tools: Technical Skills entries, in resume order
+        """
+        super().__init__(achievements, tools)
+        self._lowered = [achievement.lower() for achievement in self.achievements]
+        self._tools_lowered = [tool.lower() for tool in self.tools]
+        self._postings = {}
+        self._tool_postings = {}
+        
+        # JD-independent points, then the pattern points each kind of JD focus adds
+        self._base = achievement_priors(self.achievements)
+        self._tool_base = tool_priors(self.tools)
+        self._matrix = None
+        
+        for _, groups in JD_TERM_CATEGORIES:
+            for group in groups:
+                for term in group:
+                    self._achievement_ids(term.lower())
+                    self._tool_ids(term.lower())
+    
+    def _achievement_ids(self, term_lower: str) -> Tuple[int, ...]:
+        """IDs of the achievements containing a lowercased term"""
+        postings = self._postings.get(term_lower)
+        if postings is None:
+            postings = self._postings[term_lower] = tuple(
+                index for index, achievement in enumerate(self._lowered) if term_lower in achievement
+            )
+        return postings
+    
+    def _tool_ids(self, term_lower: str) -> Tuple[int, ...]:
+        """IDs of the tools containing a lowercased term or contained in it"""
+        postings = self._tool_postings.get(term_lower)
+        if postings is None:
+            postings = self._tool_postings[term_lower] = tuple(
+                index for index, tool in enumerate(self._tools_lowered) if term_lower in tool or tool in term_lower
+            )
+        return postings
+    
+    @traced("score_achievements_index")
+    def scores(self, jd_analysis: Optional[Dict]) -> List[int]:
+        """
+        Score every achievement against one JD
+        
+        Args:
+            jd_analysis: HTMLContentProcessor.jd_analysis, or None for the no-JD scoring
+        
+        Returns:
+            list: Achievement scores in self.achievements order
+        """
+        focus_key, weighted_terms = jd_term_weights(jd_analysis)
+        scores = list(self._base[focus_key])
+        for term_lower, weight in weighted_terms:
+            for index in self._achievement_ids(term_lower):
+                scores[index] += weight
+        return scores
+    
+    def score_batch(self, jd_analyses: List[Optional[Dict]]) -> List[List[int]]:
+        """
+        Score a window of JDs in one AchievementMatrix product
+        
+        Falls back to scoring each JD through the postings when NumPy is
+        missing or the window holds a single JD.
+        
+        Args:
+            jd_analyses: One HTMLContentProcessor.jd_analysis per JD
+        
+        Returns:
+            list: One row per JD, equal to scores(jd_analysis)
+        """
+        from achievement_matrix import NUMPY_AVAILABLE, AchievementMatrix
+        
+        if not NUMPY_AVAILABLE or len(jd_analyses) < 2:
+            return super().score_batch(jd_analyses)
+        if self._matrix is None:
+            self._matrix = AchievementMatrix(self.achievements, self._base)
+        return self._matrix.score(jd_analyses)
+    
+    def tool_scores(self, jd_analysis: Dict) -> List[int]:
+        """
+        Score every tool against one JD
+        
+        Args:
+            jd_analysis: HTMLContentProcessor.jd_analysis with a primary focus
+        
+        Returns:
+            list: Tool scores in self.tools order
+        """
+        scores = list(self._tool_base.get(jd_analysis['primary_focus'].get('primary'), self._tool_base[None]))
+        
+        for terms, weight in ((jd_analysis.get('must_have_skills', []), TOOL_SKILL_WEIGHT),
+                              (jd_analysis.get('platform_nouns', []), TOOL_PLATFORM_WEIGHT)):
+            for term in terms:
+                for index in self._tool_ids(term.lower()):
+                    scores[index] += weight
+        return scores
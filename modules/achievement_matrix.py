@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Achievement Matrix
+Scores every resume achievement against a window of JDs with one matrix product
+"""
+
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from achievement_index import achievement_priors, jd_term_weights
+from stage_timing import traced
+
+# Term columns kept between windows; a long stream starts over once it has seen more distinct terms
+MAX_TERM_COLUMNS = 20000
+
+class AchievementMatrix:
+    """
+    Resume achievements precomputed into a term-feature matrix
+    
+    Columns are 0/1 features of each achievement, one per lowercased JD term
+    ("is this term a substring of the achievement"), added the first time a
+    JD uses the term. Each JD of a window becomes a weight vector over the
+    columns its terms use, with the legacy weights of jd_term_weights, plus a
+    row of JD-independent priors picked by its focus (metric results,
+    leadership, tool mentions, detail and focus patterns), so
+        
+        scores = P + W @ F
+    
+    gives every (JD, achievement) score of the window in one product. Scores
+    are identical to AchievementIndex.scores. Needs NumPy.
+    """
+    
+    def __init__(self, achievements: List[str], priors: Optional[Dict[Optional[str], List[int]]] = None):
+        """
+        Initialize matrix
+        
+        Args:
+            achievements: Achievement texts, usually every bullet of the parsed resume
+            priors: achievement_priors of the achievements, when the caller already has them
+        """
+        self.achievements = list(dict.fromkeys(achievements))
+        self._lowered = [achievement.lower() for achievement in self.achievements]
+        self._priors = priors or achievement_priors(self.achievements)
+        self._columns = {}
+        self._features = np.zeros((0, len(self.achievements)), dtype=np.int64)
+    
+    @classmethod
+    def for_jobs(cls, jobs: List[Dict[str, any]]) -> 'AchievementMatrix':
+        """Build the matrix from ParsedResume.jobs"""
+        return cls([achievement for job in jobs for achievement in job['achievements']])
+    
+    def _add_columns(self, terms: List[str]):
+        """Feature rows for the distinct lowercased terms the matrix has no column for yet"""
+        new_terms = [term for term in terms if term not in self._columns]
+        if not new_terms:
+            return
+        if len(self._columns) + len(new_terms) > MAX_TERM_COLUMNS:
+            self._columns = {}
+            self._features = self._features[:0]
+            new_terms = list(terms)
+        
+        rows = [[1 if term in achievement else 0 for achievement in self._lowered] for term in new_terms]
+        for term in new_terms:
+            self._columns[term] = len(self._columns)
+        self._features = np.vstack([self._features,
+                                    np.array(rows, dtype=np.int64).reshape(len(rows), len(self.achievements))])
+    
+    @traced("score_achievements_batch")
+    def score(self, jd_analyses: List[Optional[Dict]]) -> List[List[int]]:
+        """
+        Score every achievement against every JD of a window
+        
+        Args:
+            jd_analyses: One HTMLContentProcessor.jd_analysis per JD
+        
+        Returns:
+            list: One row of achievement scores per JD, in self.achievements order
+        """
+        jd_weights = [jd_term_weights(jd_analysis) for jd_analysis in jd_analyses]
+        
+        # Only the columns this window uses take part in the product
+        window_columns = {}
+        rows, columns, weights = [], [], []
+        for row, (_, weighted_terms) in enumerate(jd_weights):
+            rows.extend([row] * len(weighted_terms))
+            columns.extend([window_columns.setdefault(term, len(window_columns)) for term, _ in weighted_terms])
+            weights.extend([weight for _, weight in weighted_terms])
+        self._add_columns(list(window_columns))
+        
+        # Repeated terms of a JD add up
+        weight_matrix = np.zeros((len(jd_weights), len(window_columns)), dtype=np.int64)
+        np.add.at(weight_matrix, (rows, columns), weights)
+        
+        features = self._features[[self._columns[term] for term in window_columns]]
+        priors = np.array([self._priors[focus_key] for focus_key, _ in jd_weights],
+                          dtype=np.int64).reshape(len(jd_weights), len(self.achievements))
+        return (priors + weight_matrix @ features).tolist()
+    
+    def score_maps(self, jd_analyses: List[Optional[Dict]]) -> List[Dict[str, int]]:
+        """
+        Score a JD window as {achievement: score} dicts
+        
+        Each dict can be passed as achievement_scores to
+        HTMLContentProcessor.process_parsed_resume for the matching JD.
+        """
+        return [dict(zip(self.achievements, row)) for row in self.score(jd_analyses)]
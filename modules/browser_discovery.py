@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Browser Discovery
+Finds a Chromium-based browser once and remembers it in a small capability file
+"""
+
+import os
+import json
+import shutil
+import subprocess
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from cache_paths import get_cache_dir
+import events
+
+# Command names looked up on PATH, in order of preference
+BROWSER_COMMANDS = [
+    'chrome', 'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+    'msedge', 'microsoft-edge'
+]
+
+# Install locations that are usually not on PATH
+KNOWN_BROWSER_PATHS = [
+    r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+    r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    r'C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe',
+    r'C:\Program Files\Microsoft\Edge\Application\msedge.exe',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    '/Applications/Chromium.app/Contents/MacOS/Chromium'
+]
+
+CAPABILITY_FILE = 'browser.json'
+
+@dataclass
+class BrowserInfo:
+    """
+    Discovered browser binary, with the file stats used to notice upgrades or removal
+    
+    path is the command as found on PATH and is what gets executed: launchers
+    such as /snap/bin/chromium are symlinks to a multi-call binary that picks
+    the program by the name it was run as. The stats are those of the
+    resolved target (os.stat follows links), so an upgrade or a relinked
+    alternative still invalidates the record.
+    """
+    path: str
+    version: str
+    size: int
+    mtime_ns: int
+    
+    def is_current(self) -> bool:
+        """Whether the binary still exists unchanged"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+_discovered = None
+
+def discover_browser(refresh: bool = False, cache_dir: Optional[str] = None) -> Optional[BrowserInfo]:
+    """
+    Return the browser to print PDFs with
+    
+    The answer comes from memory, then from .cache/browser/browser.json, and
+    only when neither is valid (browser moved, upgraded or removed) from a
+    PATH lookup plus a single --version probe of the chosen binary.
+    
+    Args:
+        refresh: Ignore remembered results and probe again
+        cache_dir: Cache directory (default: .cache/browser)
+    
+    Returns:
+        BrowserInfo, or None when no supported browser is installed
+    """
+    global _discovered
+    
+    if not refresh and _discovered is not None and _discovered.is_current():
+        return _discovered
+    
+    cache_path = os.path.join(cache_dir or get_cache_dir('browser'), CAPABILITY_FILE)
+    
+    if not refresh:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = BrowserInfo(**json.load(f))
+            if cached.is_current():
+                _discovered = cached
+                return cached
+        except (OSError, ValueError, TypeError):
+            pass
+    
+    path = _locate_browser()
+    if not path:
+        _discovered = None
+        return None
+    
+    stat = os.stat(path)
+    _discovered = BrowserInfo(path, _probe_version(path), stat.st_size, stat.st_mtime_ns)
+    
+    try:
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(_discovered), f, indent=2)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        events.warning("browser.cache_write_failed", "Could not write browser capability file: {error}", error=str(e))
+    
+    events.info("browser.discovered", "Discovered browser: {path} {version}", path=_discovered.path,
+                version=_discovered.version)
+    return _discovered
+
+def find_browser_path() -> Optional[str]:
+    """Return the discovered browser's executable path, or None"""
+    info = discover_browser()
+    return info.path if info else None
+
+def _locate_browser() -> Optional[str]:
+    """Find a browser binary without running anything"""
+    for command in BROWSER_COMMANDS:
+        path = shutil.which(command)
+        if path:
+            return os.path.abspath(path)
+    
+    for path in KNOWN_BROWSER_PATHS:
+        if os.path.exists(path):
+            return path
+    
+    return None
+
+def _probe_version(path: str) -> str:
+    """Ask the browser for its version string (best effort; Windows builds don't print one)"""
+    if os.name == 'nt':
+        return ""
+    
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+        return result.stdout.strip()
+    except (subprocess.TimeoutExpired, OSError):
+        return ""
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Cache Paths
+Shared location for on-disk caches used by the resume pipeline
+"""
+
+import os
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def get_cache_dir(name: str) -> str:
+    """
+    Return (and create) a named cache directory
+    
+    Caches live under <project>/.cache unless RESUME_CACHE_DIR points elsewhere.
+    
+    Args:
+        name: Cache subdirectory name
+    
+    Returns:
+        str: Absolute path to the cache directory
+    """
+    base_dir = os.environ.get('RESUME_CACHE_DIR') or os.path.join(PROJECT_ROOT, '.cache')
+    path = os.path.join(base_dir, name)
+    os.makedirs(path, exist_ok=True)
+    return path
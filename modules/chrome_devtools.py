@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Chrome DevTools Renderer
+Persistent headless Chrome driven over the DevTools protocol, with a pool of reusable tabs
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import base64
+import shutil
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from browser_discovery import find_browser_path
+from stage_timing import span, traced
+import events
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_TABS = int(os.environ.get('RESUME_CHROME_TABS', '4'))
+
+# US Letter, no margins - matches the command-line --print-to-pdf settings
+PRINT_PARAMS = {
+    "printBackground": True,
+    "displayHeaderFooter": False,
+    "preferCSSPageSize": True,
+    "paperWidth": 8.5,
+    "paperHeight": 11.0,
+    "marginTop": 0,
+    "marginBottom": 0,
+    "marginLeft": 0,
+    "marginRight": 0
+}
+
+# Resolves once every image has loaded (or failed) and web fonts are ready
+READY_SCRIPT = (
+    "Promise.all(Array.from(document.images).filter(img => !img.complete)"
+    ".map(img => new Promise(done => { img.onload = img.onerror = done; })))"
+    ".then(() => document.fonts.ready).then(() => true)"
+)
+
+# Moves the inherited pipe ends to fds 3 and 4 (via fds >= 5, so they cannot clobber each other) and execs Chrome
+_FD_TRAMPOLINE = (
+    "import os, sys, fcntl\n"
+    "fds = [fcntl.fcntl(int(fd), fcntl.F_DUPFD, 5) for fd in sys.argv[1:3]]\n"
+    "for target, fd in zip((3, 4), fds):\n"
+    "    os.dup2(fd, target)\n"
+    "    os.close(fd)\n"
+    "os.execv(sys.argv[3], sys.argv[3:])\n"
+)
+
+class ChromeDevToolsError(Exception):
+    """Raised when Chrome cannot be launched or a protocol command fails"""
+
+class _PipeConnection:
+    """
+    DevTools protocol connection over --remote-debugging-pipe
+    
+    Chrome reads NUL-terminated JSON commands from fd 3 and writes responses
+    and events to fd 4. A reader thread routes responses to waiting callers,
+    so commands may be sent from several threads at once.
+    """
+    
+    def __init__(self, browser_path: str, extra_args: Optional[list] = None):
+        if os.name != 'posix':
+            raise ChromeDevToolsError("DevTools pipe transport requires a POSIX platform")
+        
+        self.user_data_dir = tempfile.mkdtemp(prefix='resume-chrome-')
+        args = [
+            '--headless',
+            '--disable-gpu',
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-extensions',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--remote-debugging-pipe',
+            f'--user-data-dir={self.user_data_dir}'
+        ] + (extra_args or []) + ['about:blank']
+        
+        # Chrome expects the pipe ends on fds 3 and 4; a small exec trampoline places them there
+        command_read, self._command_write = os.pipe()
+        self._response_read, response_write = os.pipe()
+        
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, '-c', _FD_TRAMPOLINE, str(command_read), str(response_write),
+                 browser_path] + args,
+                pass_fds=(command_read, response_write),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            self._close_fds()
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            raise ChromeDevToolsError(f"Could not launch {browser_path}: {e}")
+        finally:
+            os.close(command_read)
+            os.close(response_write)
+        
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending = {}
+        self.closed = False
+        
+        self._reader = threading.Thread(target=self._read_loop, name='chrome-devtools-reader', daemon=True)
+        self._reader.start()
+    
+    def send(self, method: str, params: Optional[dict] = None,
+             session_id: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT) -> dict:
+        """
+        Send a protocol command and wait for its result
+        
+        Args:
+            method: DevTools method, e.g. "Page.printToPDF"
+            params: Method parameters
+            session_id: Target session for page-level commands
+            timeout: Seconds to wait for the response
+        
+        Returns:
+            dict: The command's result object
+        """
+        waiter = {"event": threading.Event(), "response": None}
+        
+        with self._lock:
+            if self.closed:
+                raise ChromeDevToolsError("Chrome connection is closed")
+            self._next_id += 1
+            message_id = self._next_id
+            self._pending[message_id] = waiter
+            
+            message = {"id": message_id, "method": method, "params": params or {}}
+            if session_id:
+                message["sessionId"] = session_id
+            data = json.dumps(message).encode('utf-8') + b'\0'
+            
+            try:
+                while data:
+                    written = os.write(self._command_write, data)
+                    data = data[written:]
+            except OSError as e:
+                self._pending.pop(message_id, None)
+                raise ChromeDevToolsError(f"Could not send {method}: {e}")
+        
+        if not waiter["event"].wait(timeout):
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise ChromeDevToolsError(f"{method} timed out after {timeout}s")
+        
+        response = waiter["response"]
+        if "error" in response:
+            raise ChromeDevToolsError(f"{method}: {response['error'].get('message', response['error'])}")
+        return response.get("result", {})
+    
+    def _read_loop(self):
+        """Split the response stream on NUL and hand each response to its waiter"""
+        parts = []
+        while True:
+            try:
+                chunk = os.read(self._response_read, 1 << 16)
+            except OSError:
+                chunk = b''
+            if not chunk:
+                break
+            
+            # Only the new chunk is scanned, so large PDF responses stay linear
+            end = chunk.find(b'\0')
+            while end >= 0:
+                parts.append(chunk[:end])
+                self._dispatch(b''.join(parts))
+                parts = []
+                chunk = chunk[end + 1:]
+                end = chunk.find(b'\0')
+            if chunk:
+                parts.append(chunk)
+        
+        # Chrome exited: fail everything still waiting
+        with self._lock:
+            self.closed = True
+            pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter["response"] = {"error": {"message": "Chrome exited"}}
+            waiter["event"].set()
+    
+    def _dispatch(self, raw: bytes):
+        """Wake the caller waiting on a response; events carry no id and are ignored"""
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if "id" in message:
+            with self._lock:
+                waiter = self._pending.pop(message["id"], None)
+            if waiter:
+                waiter["response"] = message
+                waiter["event"].set()
+    
+    def close(self):
+        """Ask Chrome to exit, then make sure it did and clean up its profile"""
+        if not self.closed:
+            try:
+                self.send("Browser.close", timeout=2)
+            except ChromeDevToolsError:
+                pass
+        
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        
+        self.closed = True
+        self._close_fds()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+    
+    def _close_fds(self):
+        for fd in (self._command_write, self._response_read):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+class _Tab:
+    """Page target attached with a flat session, remembering the directory it is based in"""
+    
+    def __init__(self, target_id: str, session_id: str):
+        self.target_id = target_id
+        self.session_id = session_id
+        self.base_dir = None
+        self.frame_id = None
+
+class ChromeTabPool:
+    """
+    One headless Chrome process serving PDF renders from a pool of reusable tabs
+    
+    Tabs are created on demand up to max_tabs and returned to the pool after
+    each render, so concurrent callers render in parallel and a warm render is
+    a few protocol round trips rather than a browser launch.
+    """
+    
+    def __init__(self, browser_path: str, max_tabs: int = DEFAULT_MAX_TABS):
+        """
+        Launch Chrome
+        
+        Args:
+            browser_path: Chrome/Chromium/Edge executable
+            max_tabs: Upper bound on concurrently rendering tabs
+        """
+        self.browser_path = browser_path
+        self.max_tabs = max(1, max_tabs)
+        self.connection = _PipeConnection(browser_path)
+        self._idle = queue.Queue()
+        self._tab_count = 0
+        self._tab_lock = threading.Lock()
+    
+    @property
+    def alive(self) -> bool:
+        return not self.connection.closed
+    
+    @traced("chrome_print")
+    def render_pdf(self, html_content: str, base_dir: Optional[str] = None,
+                   timeout: float = DEFAULT_TIMEOUT) -> bytes:
+        """
+        Render an HTML string to PDF bytes
+        
+        Args:
+            html_content: Complete HTML document
+            base_dir: Directory the document is treated as living in, so
+                      relative and absolute file paths resolve as they would
+                      from a file on disk (default: current directory)
+            timeout: Seconds allowed for each protocol step
+        
+        Returns:
+            bytes: PDF data
+        """
+        base_dir = os.path.abspath(base_dir or os.getcwd())
+        tab = self._acquire_tab(timeout)
+        
+        try:
+            if tab.base_dir != base_dir:
+                self._navigate(tab, base_dir, timeout)
+            
+            send = self.connection.send
+            send("Page.setDocumentContent", {"frameId": tab.frame_id, "html": html_content},
+                 tab.session_id, timeout)
+            send("Runtime.evaluate", {"expression": READY_SCRIPT, "awaitPromise": True,
+                                      "returnByValue": True}, tab.session_id, timeout)
+            result = send("Page.printToPDF", PRINT_PARAMS, tab.session_id, timeout)
+        
+        except ChromeDevToolsError:
+            # The tab may be mid-load or wedged; drop it rather than reuse it
+            self._discard_tab(tab)
+            raise
+        
+        self._idle.put(tab)
+        return base64.b64decode(result["data"])
+    
+    def _acquire_tab(self, timeout: float) -> _Tab:
+        """Take an idle tab, opening a new one while under max_tabs"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            
+            with self._tab_lock:
+                create = self._tab_count < self.max_tabs
+                if create:
+                    self._tab_count += 1
+            if create:
+                break
+            
+            # Re-check capacity periodically, since discarded tabs free a slot without being queued
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                if time.monotonic() > deadline:
+                    raise ChromeDevToolsError(f"No Chrome tab became free within {timeout}s")
+        
+        try:
+            send = self.connection.send
+            target_id = send("Target.createTarget", {"url": "about:blank"})["targetId"]
+            session_id = send("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+            return _Tab(target_id, session_id)
+        except (ChromeDevToolsError, KeyError) as e:
+            with self._tab_lock:
+                self._tab_count -= 1
+            raise ChromeDevToolsError(f"Could not open Chrome tab: {e}")
+    
+    def _navigate(self, tab: _Tab, base_dir: str, timeout: float):
+        """Point the tab at base_dir so the document it receives gets a file:// URL"""
+        send = self.connection.send
+        send("Page.navigate", {"url": Path(base_dir).as_uri() + '/'}, tab.session_id, timeout)
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            state = send("Runtime.evaluate", {"expression": "document.readyState + ' ' + location.protocol",
+                                              "returnByValue": True}, tab.session_id, timeout)
+            if state.get("result", {}).get("value") == "complete file:":
+                break
+            if time.monotonic() > deadline:
+                raise ChromeDevToolsError(f"Navigation to {base_dir} did not finish")
+            time.sleep(0.01)
+        
+        tab.frame_id = send("Page.getFrameTree", {}, tab.session_id, timeout)["frameTree"]["frame"]["id"]
+        tab.base_dir = base_dir
+    
+    def _discard_tab(self, tab: _Tab):
+        try:
+            self.connection.send("Target.closeTarget", {"targetId": tab.target_id}, timeout=2)
+        except ChromeDevToolsError:
+            pass
+        with self._tab_lock:
+            self._tab_count -= 1
+    
+    def close(self):
+        """Shut down Chrome"""
+        self.connection.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_chrome_pool(browser_path: Optional[str] = None) -> Optional[ChromeTabPool]:
+    """
+    Return the process-wide Chrome tab pool, launching Chrome on first use
+    
+    A pool whose Chrome has exited is closed and replaced on the next call.
+    
+    Args:
+        browser_path: Browser executable (default: the discovered browser)
+    
+    Returns:
+        ChromeTabPool, or None when no browser is found or the pipe transport
+        is unsupported (callers fall back to the command-line renderer)
+    """
+    global _pool
+    
+    if os.name != 'posix':
+        return None
+    
+    with _pool_lock:
+        if _pool is not None:
+            if _pool.alive:
+                return _pool
+            # Reap the dead Chrome and remove its profile directory before launching another
+            _pool.close()
+            _pool = None
+        
+        browser_path = browser_path or find_browser_path()
+        if not browser_path:
+            return None
+        
+        try:
+            with span("chrome_launch"):
+                _pool = ChromeTabPool(browser_path)
+        except ChromeDevToolsError as e:
+            events.info("chrome.unavailable", "Persistent Chrome unavailable: {error}", error=str(e))
+            _pool = None
+            return None
+        
+        events.info("chrome.started", "Started persistent Chrome: {path}", path=browser_path)
+        return _pool
+
+def close_chrome_pool():
+    """Shut down the process-wide pool if one is running"""
+    global _pool
+    
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+atexit.register(close_chrome_pool)
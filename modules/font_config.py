@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Font Config
+Bundled resume fonts, one shared WeasyPrint font configuration and a cache of subset fonts
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cache_paths import PROJECT_ROOT, get_cache_dir
+import events
+
+FONT_DIR = os.path.join(PROJECT_ROOT, 'fonts')
+FONT_FORMATS = {'.ttf': 'truetype', '.otf': 'opentype', '.woff': 'woff', '.woff2': 'woff2'}
+
+# Style suffixes of bundled font file names, e.g. Inter-SemiBoldItalic.ttf
+FONT_WEIGHTS = {
+    'thin': 100, 'extralight': 200, 'light': 300, 'regular': 400, 'medium': 500,
+    'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900
+}
+FONT_STYLE_RE = re.compile(r'^(?P<weight>[a-z]*?)(?P<italic>italic)?$')
+
+# Subset fonts kept in memory per process
+MAX_MEMORY_SUBSETS = 256
+
+# On-disk subset cache cap (RESUME_FONT_CACHE_MB overrides); eviction trims to EVICT_TO of it
+DEFAULT_DISK_MB = 64
+EVICT_TO = 0.9
+
+# WeasyPrint major versions whose private Font.clean(font, glyphs, hinting) the subset cache was
+# checked against; other versions keep their own behavior until checked and added here
+SUBSET_CACHE_VERSIONS = range(63, 71)
+
+_font_faces = {}
+_font_config = None
+_font_stylesheets = None
+_subsets = {}
+_subset_stats = {"hits": 0, "misses": 0}
+_disk_size = None
+
+def bundled_font_faces(font_dir: Optional[str] = None) -> List[Dict[str, any]]:
+    """
+    Describe every font file in the bundled font directory
+    
+    Files are named <Family>-<Style>.<ext>, with underscores for spaces in the
+    family and the style one of FONT_WEIGHTS optionally followed by Italic
+    (Source_Sans_3-BoldItalic.ttf). A file without a style is Regular.
+    
+    Args:
+        font_dir: Directory to scan (default: <project>/fonts)
+    
+    Returns:
+        list: {family, weight, style, path, format, sha256} per font file, sorted by file name
+    """
+    font_dir = os.path.abspath(font_dir or FONT_DIR)
+    if font_dir in _font_faces:
+        return _font_faces[font_dir]
+    
+    faces = []
+    file_names = sorted(os.listdir(font_dir)) if os.path.isdir(font_dir) else []
+    for file_name in file_names:
+        stem, extension = os.path.splitext(file_name)
+        if extension.lower() not in FONT_FORMATS:
+            continue
+        
+        family, _, style_name = stem.partition('-')
+        match = FONT_STYLE_RE.match(style_name.lower())
+        if not match or (match.group('weight') and match.group('weight') not in FONT_WEIGHTS):
+            events.warning("fonts.unrecognized_style", "Skipping font with unrecognized style: {file}", file=file_name)
+            continue
+        
+        path = os.path.join(font_dir, file_name)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        
+        faces.append({
+            "family": family.replace('_', ' '),
+            "weight": FONT_WEIGHTS.get(match.group('weight') or 'regular'),
+            "style": 'italic' if match.group('italic') else 'normal',
+            "path": path,
+            "format": FONT_FORMATS[extension.lower()],
+            "sha256": digest
+        })
+    
+    _font_faces[font_dir] = faces
+    return faces
+
+def bundled_font_css(font_dir: Optional[str] = None) -> str:
+    """
+    Build @font-face rules for the bundled fonts
+    
+    Faces declared here take precedence over installed fonts of the same
+    family, so a template naming a bundled family renders the same on every
+    machine. The leading comment carries a digest of the font files, which
+    makes the CSS usable as a cache-key component.
+    
+    Args:
+        font_dir: Directory to scan (default: <project>/fonts)
+    
+    Returns:
+        str: CSS text, empty when no fonts are bundled
+    """
+    faces = bundled_font_faces(font_dir)
+    if not faces:
+        return ""
+    
+    digest = hashlib.sha256(''.join(face['sha256'] for face in faces).encode('utf-8')).hexdigest()
+    rules = [f"/* Bundled fonts {digest[:16]} */"]
+    for face in faces:
+        rules.append(
+            "@font-face {\n"
+            f"    font-family: '{face['family']}';\n"
+            f"    src: url('{Path(face['path']).as_uri()}') format('{face['format']}');\n"
+            f"    font-weight: {face['weight']};\n"
+            f"    font-style: {face['style']};\n"
+            "}"
+        )
+    return "\n".join(rules) + "\n"
+
+def get_font_configuration():
+    """
+    Return the process-wide WeasyPrint FontConfiguration
+    
+    Creating one runs fontconfig's discovery of installed fonts, so every
+    generator in the process shares a single instance. The first call also
+    installs the subset cache.
+    
+    Returns:
+        weasyprint.text.fonts.FontConfiguration
+    """
+    global _font_config
+    
+    if _font_config is None:
+        from weasyprint.text.fonts import FontConfiguration
+        _font_config = FontConfiguration()
+        install_subset_cache()
+    return _font_config
+
+def get_font_stylesheets() -> list:
+    """
+    Return the bundled @font-face stylesheet, parsed once per process
+    
+    Parsing it registers each font file with the shared FontConfiguration,
+    which copies it into fontconfig's search path; later renders reuse that.
+    
+    Returns:
+        list: [weasyprint.CSS], or [] when no fonts are bundled
+    """
+    global _font_stylesheets
+    
+    if _font_stylesheets is None:
+        from weasyprint import CSS
+        
+        font_css = bundled_font_css()
+        _font_stylesheets = [CSS(string=font_css, font_config=get_font_configuration())] if font_css else []
+        if font_css:
+            events.info("fonts.registered", "Registered {count} bundled font file(s)", count=len(bundled_font_faces()))
+    return _font_stylesheets
+
+def install_subset_cache() -> bool:
+    """
+    Reuse subset fonts across renders, keyed by font file and glyph set
+    
+    WeasyPrint subsets every embedded font from scratch for each PDF. Its
+    Font.clean step (subsetting plus variable-font instancing) is a pure
+    function of the font data, the glyphs used and a few font properties,
+    so its output is cached in memory and under .cache/fonts (size-capped,
+    least recently used subsets evicted first). WeasyPrint has no public hook
+    for this, so the cache only wraps Font.clean in SUBSET_CACHE_VERSIONS.
+    Keys include the WeasyPrint, HarfBuzz and fontTools versions and the
+    subsetter in use, so an upgrade never serves subsets made by older code.
+    
+    Returns:
+        bool: True if the cache is active
+    """
+    try:
+        import weasyprint
+        from weasyprint.pdf import fonts as pdf_fonts
+    except (ImportError, OSError):
+        return False
+    
+    try:
+        major = int(weasyprint.__version__.split('.')[0])
+    except (AttributeError, ValueError):
+        major = None
+    if major not in SUBSET_CACHE_VERSIONS:
+        events.debug("fonts.subset_cache_unsupported", "Font subset cache not checked against WeasyPrint "
+                     "{version}, subsetting every render", version=getattr(weasyprint, '__version__', '?'))
+        return False
+    
+    font_class = getattr(pdf_fonts, 'Font', None)
+    clean = getattr(font_class, 'clean', None)
+    if clean is None:
+        return False
+    if getattr(clean, '_subset_cache', False):
+        return True
+    
+    environment = _subset_environment(weasyprint.__version__)
+    
+    def cached_clean(font, to_unicode, hinting):
+        key = _subset_key(font, to_unicode, hinting, environment)
+        if key is None:
+            return clean(font, to_unicode, hinting)
+        
+        cached = _subsets.get(key) or _read_subset(key)
+        if cached is not None:
+            _subset_stats["hits"] += 1
+            font.file_content, variations = cached
+            font.variations.update(variations)
+            return None
+        
+        _subset_stats["misses"] += 1
+        result = clean(font, to_unicode, hinting)
+        _store_subset(key, font.file_content, font.variations)
+        return result
+    
+    cached_clean._subset_cache = True
+    font_class.clean = cached_clean
+    return True
+
+def subset_cache_stats() -> Dict[str, int]:
+    """Subset cache hits and misses in this process"""
+    return dict(_subset_stats)
+
+def _subset_environment(weasyprint_version: str) -> str:
+    """The library versions and subsetter that Font.clean's output depends on"""
+    import fontTools
+    from weasyprint.text.ffi import harfbuzz, harfbuzz_subset
+    
+    # Same choice as Font.subset in the checked WeasyPrint versions
+    subsetter = 'harfbuzz' if harfbuzz_subset and harfbuzz.hb_version_atleast(4, 1, 0) else 'fonttools'
+    return json.dumps({
+        "weasyprint": weasyprint_version,
+        "harfbuzz": _harfbuzz_version(harfbuzz),
+        "fonttools": getattr(fontTools, 'version', '?'),
+        "subsetter": subsetter
+    }, sort_keys=True)
+
+def _harfbuzz_version(harfbuzz) -> str:
+    """HarfBuzz version, found through hb_version_atleast (the only version call WeasyPrint declares)"""
+    version = [0, 0, 0]
+    for position in range(3):
+        while version[position] < 1000:
+            version[position] += 1
+            if not harfbuzz.hb_version_atleast(*version):
+                version[position] -= 1
+                break
+    return '.'.join(str(part) for part in version)
+
+def _subset_key(font, to_unicode: Dict, hinting: bool, environment: str) -> Optional[str]:
+    """Digest of everything Font.clean reads, or None for fonts it can't describe"""
+    try:
+        properties = {
+            "index": font.index,
+            "glyphs": sorted(to_unicode),
+            "hinting": bool(hinting),
+            "missing": sorted(font.missing.items()),
+            "variations": sorted(font.variations.items()),
+            "weight": font.weight,
+            "style": font.style,
+            "font_size": font.font_size,
+            "color": [bool(font.png), bool(font.svg), bool(font.colr)]
+        }
+        digest = hashlib.sha256(bytes(font.file_content))
+        digest.update(json.dumps(properties, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(environment.encode('utf-8'))
+    except (AttributeError, TypeError):
+        return None
+    return digest.hexdigest()
+
+def _read_subset(key: str):
+    """Load a subset font stored by an earlier process"""
+    cache_path = os.path.join(get_cache_dir('fonts'), f"{key}.font")
+    try:
+        with open(cache_path, 'rb') as f:
+            header, _, file_content = f.read().partition(b'\n')
+        cached = (file_content, json.loads(header))
+        os.utime(cache_path)
+    except (OSError, ValueError):
+        return None
+    _remember_subset(key, cached)
+    return cached
+
+def _store_subset(key: str, file_content: bytes, variations: Dict):
+    """Keep a subset font in memory and on disk"""
+    cached = (bytes(file_content), dict(variations))
+    _remember_subset(key, cached)
+    
+    global _disk_size
+    
+    max_bytes = int(float(os.environ.get('RESUME_FONT_CACHE_MB', DEFAULT_DISK_MB)) * 1024 * 1024)
+    if max_bytes <= 0:
+        return
+    
+    # One line of JSON (the variations clean() settled on) followed by the font data
+    data = json.dumps(cached[1]).encode('utf-8') + b'\n' + cached[0]
+    cache_dir = get_cache_dir('fonts')
+    try:
+        if _disk_size is None:
+            _scan_subsets(cache_dir)
+        cache_path = os.path.join(cache_dir, f"{key}.font")
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        events.warning("fonts.cache_write_failed", "Could not write font subset cache: {error}", error=str(e))
+        return
+    
+    # A running total of this process's stores, as in PDFCache; the directory is listed again only past the cap
+    _disk_size += len(data)
+    if _disk_size > max_bytes:
+        _evict_subsets(cache_dir, max_bytes)
+
+def _scan_subsets(cache_dir: str) -> list:
+    """List stored subsets as (mtime, size, path) and reset the running size total"""
+    global _disk_size
+    
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.font'):
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    _disk_size = sum(size for _, size, _ in entries)
+    return entries
+
+def _evict_subsets(cache_dir: str, max_bytes: int):
+    """Remove least recently used subsets until the cache is back under EVICT_TO of max_bytes"""
+    global _disk_size
+    
+    try:
+        entries = _scan_subsets(cache_dir)
+    except OSError:
+        return
+    for _, size, path in sorted(entries):
+        if _disk_size <= max_bytes * EVICT_TO:
+            break
+        try:
+            os.unlink(path)
+            _disk_size -= size
+        except OSError:
+            pass
+
+def _remember_subset(key: str, cached: tuple):
+    if len(_subsets) >= MAX_MEMORY_SUBSETS:
+        _subsets.clear()
+    _subsets[key] = cached
@@ -5,13 +5,63 @@ Enhanced content processor that formats resume data specifically for HTML templa
 """
 
 import re
-from typing import Dict, List, Optional
+import heapq
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import sys
 import os
 # Add archive modules to path for base ContentProcessor
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'archive', 'modules'))
 from content_processor import ContentProcessor, ProcessedContent
+from jd_term_matcher import get_jd_term_matcher, SEGMENT_CATEGORIES
+from resume_cache import ParsedResume, load_parsed_resume
+from photo_processor import prepare_photo
+from stage_timing import traced
+import events
+
+# Bump when JD analysis, achievement or tool scoring (including relevance scorers) or content
+# selection change, so near-duplicate JDs stop reusing analyses and PDFs made by older code
+CONTENT_VERSION = 1
+
+# Achievement scoring patterns, compiled once instead of per achievement
+METRIC_RESULT_RE = re.compile(r'\d+[%KMB$]|\$[\d,]+|\d+\+|increased.*\d+|grew.*\d+|reduced.*\d+', re.IGNORECASE)
+SEGMENT_ACHIEVEMENT_RES = {
+    'benefits': re.compile(r'carrier|legal|compliance|Salesforce|plan design|rate|voluntary', re.IGNORECASE),
+    'saas': re.compile(r'adoption|retention|expansion|growth|onboarding|utilization|product', re.IGNORECASE),
+    'revenue': re.compile(r'CRM|deal|conversion|close|quota|commission', re.IGNORECASE),
+    'operations': re.compile(r'support|client|troubleshooting|resolution|satisfaction|service|efficiency', re.IGNORECASE),
+}
+AI_FOCUS_RE = re.compile(r'AI|automation|intelligent|machine|data|analytics|optimization', re.IGNORECASE)
+LEADERSHIP_RE = re.compile(r'led|managed|orchestrated|spearheaded|architected', re.IGNORECASE)
+TOOL_MENTION_RE = re.compile(r'Python|SQL|ChatGPT|Make\.com|LangChain|prompt|API|Salesforce|Zendesk', re.IGNORECASE)
+
+# Achievement scoring weights, shared with the relevance scorers in achievement_index
+METRIC_RESULT_WEIGHT = 100
+PRIMARY_TERM_WEIGHT = 75
+PRIMARY_PATTERN_WEIGHT = 60
+SEGMENT_TERM_WEIGHT = 50
+OPERATIONS_PATTERN_WEIGHT = 40
+JD_SKILL_WEIGHT = 30
+JD_METRIC_WEIGHT = 25
+AI_FOCUS_WEIGHT = 50
+LEADERSHIP_WEIGHT = 30
+TOOL_MENTION_WEIGHT = 25
+DETAIL_WEIGHT = 10
+DETAIL_MIN_LENGTH = 100
+FOCUSED_SEGMENTS = ('benefits', 'saas', 'revenue')
+
+# Tool prioritization weights and term lists, shared with the inverted index in achievement_index
+TOOL_SKILL_WEIGHT = 100
+TOOL_PLATFORM_WEIGHT = 90
+TOOL_SEGMENT_WEIGHT = 75
+TOOL_PROFESSIONAL_WEIGHT = 25
+SEGMENT_TOOL_TERMS = {
+    'benefits': ['salesforce', 'excel', 'powerbi', 'smartsheet'],
+    'saas': ['analytics', 'api', 'automation', 'python', 'sql'],
+    'revenue': ['crm', 'salesforce', 'analytics', 'hubspot'],
+    'operations': ['automation', 'python', 'sql', 'make.com'],
+}
+PROFESSIONAL_TOOL_TERMS = ['certified', 'certification', 'master', 'analytics', 'automation']
 
 @dataclass
 class StructuredContent:
@@ -34,10 +84,21 @@ class HTMLContentProcessor(ContentProcessor):
     Enhanced content processor that structures data for HTML template rendering
     """
     
-    def __init__(self, jd_text=None):
+    def __init__(self, jd_text=None, jd_analysis=None):
+        """
+        Initialize processor
+        
+        Args:
+            jd_text: Job description text
+            jd_analysis: Analysis already made for this JD or a near-duplicate of it,
+                         used instead of analyzing jd_text again
+        """
         super().__init__()
         self.jd_text = jd_text
-        self.jd_analysis = self._analyze_jd(jd_text) if jd_text else None
+        if jd_analysis is not None:
+            self.jd_analysis = dict(jd_analysis, raw_jd_text=jd_text)
+        else:
+            self.jd_analysis = self._analyze_jd(jd_text) if jd_text else None
         
     def process_for_html_template(self, md_file_path: str, photo_path: Optional[str] = None) -> StructuredContent:
         """
@@ -50,12 +111,65 @@ class HTMLContentProcessor(ContentProcessor):
         Returns:
             StructuredContent object ready for template rendering
         """
-        # Parse raw content from markdown
+        # Parse raw content from markdown (cached on disk by file hash)
+        parsed_resume = load_parsed_resume(md_file_path, self.parse_resume)
+        
+        return self.process_parsed_resume(parsed_resume, photo_path)
+    
+    @traced("parse_markdown")
+    def parse_resume(self, md_file_path: str) -> ParsedResume:
+        """
+        Parse the JD-independent parts of a markdown resume
+        
+        Args:
+            md_file_path: Path to markdown resume file
+            
+        Returns:
+            ParsedResume with raw sections, cleaned job entries and technical tools
+        """
         raw_sections = self.parse_markdown_resume(md_file_path)
         
         if not raw_sections:
             raise ValueError("Failed to extract content from resume markdown")
         
+        return ParsedResume(
+            raw_sections=raw_sections,
+            jobs=self._parse_experience_sections(raw_sections.get('raw_experience', '')),
+            tools=self._parse_technical_tools(raw_sections.get('raw_technical', ''))
+        )
+    
+    @traced("process_content")
+    def process_parsed_resume(self, parsed_resume: ParsedResume, photo_path: Optional[str] = None,
+                              achievement_scores: Optional[Dict[str, int]] = None,
+                              title_segment: Optional[str] = None) -> StructuredContent:
+        """
+        Process a parsed resume into structured data for HTML template
+        
+        Lets callers that tailor many JDs against the same resume parse the
+        markdown once and reuse the parse for every JD.
+        
+        Args:
+            parsed_resume: ParsedResume from parse_resume or the resume cache
+            photo_path: Optional path to photo file
+            achievement_scores: Optional {achievement: score} for this JD, e.g. from
+                the scorer's score_maps for a window of JDs (default:
+                scored by the configured relevance scorer, whose selection
+                thresholds apply either way)
+            title_segment: Tailor job titles toward this segment instead of the JD's
+                primary focus, for alternate-title variants
+            
+        Returns:
+            StructuredContent object ready for template rendering
+        """
+        from relevance import get_scorer
+        
+        raw_sections = parsed_resume.raw_sections
+        
+        # Scorer postings are built once per resume; each JD only walks the postings of its own terms
+        scorer = get_scorer(parsed_resume.jobs, parsed_resume.tools)
+        if achievement_scores is None:
+            achievement_scores = scorer.score_map(self.jd_analysis)
+        
         # Process each section with enhanced formatting
         return StructuredContent(
             name=self._process_name_for_html(raw_sections.get('raw_name', '')),
@@ -66,8 +180,11 @@ class HTMLContentProcessor(ContentProcessor):
             strengths=self._process_strengths_for_html(raw_sections.get('raw_strengths', '')),
             education=self._process_education_for_html(raw_sections.get('raw_education', '')),
             languages=self._process_languages_for_html(raw_sections.get('raw_languages', '')),
-            technical=self._process_technical_for_html(raw_sections.get('raw_technical', '')),
-            experiences=self._process_experiences_for_html(raw_sections.get('raw_experience', '')),
+            technical=self._process_technical_for_html(raw_sections.get('raw_technical', ''), parsed_resume.tools,
+                                                       scorer),
+            experiences=self._process_experiences_for_html(raw_sections.get('raw_experience', ''), parsed_resume.jobs,
+                                                           achievement_scores, title_segment,
+                                                           scorer.selection_thresholds),
             professional_development=self._process_professional_development(raw_sections)
         )
     
@@ -101,76 +218,24 @@ class HTMLContentProcessor(ContentProcessor):
         
         return processed_parts
     
+    @traced("jd_analysis")
     def _analyze_jd(self, jd_text: str) -> Optional[Dict]:
         """Dynamic JD analysis following v1JSON.json instruction engine approach"""
         if not jd_text:
             return None
             
-        import re
-        
         # v1JSON Step 1: "parse JD for must-have skills/tools, customer segment, delivery modes, lifecycle moments, success metrics, cross-functional partners, analytics stack, platform nouns"
+        # Single pass over the JD for skills, segments, cross-functional partners, metrics and platforms
+        jd_terms = get_jd_term_matcher().extract(jd_text)
         
-        # Dynamic skills/tools extraction (expanded beyond hardcoded list)
-        skill_patterns = [
-            r'\b(?:Salesforce|PowerBI|Excel|Smartsheet|Python|JavaScript|SQL|API|CRM|HubSpot|Zendesk|Intercom|Notion)\b',
-            r'\b(?:automation|analytics|data analysis|troubleshooting|onboarding|retention|expansion|adoption)\b',
-            r'\b(?:enrollment|planning|implementation|optimization|integration|migration)\b'
-        ]
-        must_have_skills = []
-        for pattern in skill_patterns:
-            must_have_skills.extend(re.findall(pattern, jd_text, re.IGNORECASE))
+        must_have_skills = jd_terms['must_have_skills']
         
         # Dynamic customer segment identification (mine JD content for segment indicators)
-        segment_indicators = {}
-        
-        # Benefits/Healthcare segment
-        benefits_terms = re.findall(r'\b(?:voluntary benefits|benefits|employee benefits|critical illness|accident insurance|hospital indemnity|legal plans|pet insurance|financial wellness|BenefitsTech|carriers|enrollment planning|rate design|plan design)\b', jd_text, re.IGNORECASE)
-        if benefits_terms:
-            segment_indicators['benefits'] = benefits_terms
-        
-        # SaaS/Technology segment  
-        saas_terms = re.findall(r'\b(?:SaaS|Fortune 500|mid-market|enterprise|productivity tools|software|platform|product adoption|user onboarding|feature adoption|churn reduction)\b', jd_text, re.IGNORECASE)
-        if saas_terms:
-            segment_indicators['saas'] = saas_terms
-        
-        # Revenue/Sales segment
-        revenue_terms = re.findall(r'\b(?:high-ticket|revenue|sales|pipeline|deal sizes|quota|commission|closing|prospecting|lead generation)\b', jd_text, re.IGNORECASE)
-        if revenue_terms:
-            segment_indicators['revenue'] = revenue_terms
-        
-        # Operations segment
-        ops_terms = re.findall(r'\b(?:operations|process improvement|efficiency|scaling|workflow|automation|systems)\b', jd_text, re.IGNORECASE)
-        if ops_terms:
-            segment_indicators['operations'] = ops_terms
-        
-        # Dynamic cross-functional partners identification
-        cross_functional_patterns = [
-            r'\b(?:Client Executives|carrier contacts|carriers|legal departments|legal)\b',
-            r'\b(?:Sales|Product|Engineering|Account Management|Customer Education|support teams)\b',
-            r'\b(?:Marketing|Finance|Operations|Implementation|Onboarding|Training)\b'
-        ]
-        cross_functional = []
-        for pattern in cross_functional_patterns:
-            cross_functional.extend(re.findall(pattern, jd_text, re.IGNORECASE))
-        
-        # Dynamic success metrics extraction
-        metrics_patterns = [
-            r'\b(?:enrollment planning|rate design|plan design|adoption|retention|expansion)\b',
-            r'\b(?:renewals|churn|contraction|utilization|growth|satisfaction|NPS)\b',
-            r'\b(?:conversion|close rate|pipeline velocity|revenue growth|customer lifetime value)\b'
-        ]
-        success_metrics = []
-        for pattern in metrics_patterns:
-            success_metrics.extend(re.findall(pattern, jd_text, re.IGNORECASE))
-        
-        # Platform nouns (expanded dynamically)
-        platform_patterns = [
-            r'\b(?:Salesforce|Smartsheet|PowerBI|Microsoft Office|Notion|Intercom|Zendesk|HubSpot)\b',
-            r'\b(?:Slack|Asana|Jira|Confluence|Tableau|Google Analytics|Marketo|Pardot)\b'
-        ]
-        platform_nouns = []
-        for pattern in platform_patterns:
-            platform_nouns.extend(re.findall(pattern, jd_text, re.IGNORECASE))
+        segment_indicators = {segment: jd_terms[segment] for segment in SEGMENT_CATEGORIES if jd_terms[segment]}
+        
+        cross_functional = jd_terms['cross_functional']
+        success_metrics = jd_terms['success_metrics']
+        platform_nouns = jd_terms['platform_nouns']
         
         # v1JSON Step 2: "mine source resume for segment/program/tool/metric tags; retain only supported claims"  
         # This provides context for what we can truthfully claim based on resume content
@@ -266,11 +331,11 @@ class HTMLContentProcessor(ContentProcessor):
         return list(set(keywords))  # Remove duplicates
     
     def _resolve_photo_path(self, photo_path: Optional[str]) -> Optional[str]:
-        """Resolve photo path for template"""
+        """Resolve photo path for template, preferring the cached print-sized copy"""
         import os
         
         if photo_path and os.path.exists(photo_path):
-            return os.path.abspath(photo_path)
+            return prepare_photo(os.path.abspath(photo_path))
         
         # Try to find photo in current directory
         possible_paths = [
@@ -282,7 +347,7 @@ class HTMLContentProcessor(ContentProcessor):
         
         for path in possible_paths:
             if os.path.exists(path):
-                return os.path.abspath(path)
+                return prepare_photo(os.path.abspath(path))
                 
         return None
     
@@ -533,9 +598,8 @@ class HTMLContentProcessor(ContentProcessor):
         
         return languages[:3]  # Limit to 3 languages
     
-    def _process_technical_for_html(self, raw_technical: str) -> List[Dict[str, str]]:
-        """Process technical skills dynamically based on v1JSON.json JD analysis - 'only tools actually used or studied; mirror JD terms'"""
-        # Extract all available tools from Technical Skills section
+    def _parse_technical_tools(self, raw_technical: str) -> List[str]:
+        """Extract all available tools from Technical Skills section"""
         available_tools = []
         if raw_technical:
             lines = raw_technical.split('\n')
@@ -548,6 +612,15 @@ class HTMLContentProcessor(ContentProcessor):
                     if tool.endswith(':'):
                         tool = tool[:-1]
                     available_tools.append(tool)
+        return available_tools
+    
+    def _process_technical_for_html(self, raw_technical: str, available_tools: Optional[List[str]] = None,
+                                    scorer=None) -> List[Dict[str, str]]:
+        """Process technical skills dynamically based on v1JSON.json JD analysis - 'only tools actually used or studied; mirror JD terms'"""
+        # Extract all available tools from Technical Skills section
+        if available_tools is None:
+            available_tools = self._parse_technical_tools(raw_technical)
+        available_tools = list(available_tools)
         
         # Default tools from source resume if none found
         if not available_tools:
@@ -559,74 +632,74 @@ class HTMLContentProcessor(ContentProcessor):
         
         # v1JSON: "choose emphasis based on JD priorities" for tool selection and ordering
         if self.jd_analysis and 'primary_focus' in self.jd_analysis:
-            prioritized_tools = self._prioritize_tools_by_jd(available_tools)
+            # The resume's scorer scores its own tool list; the default list is scored directly
+            tool_scores = scorer.tool_scores(self.jd_analysis) if scorer and scorer.tools == available_tools else None
+            prioritized_tools = self._prioritize_tools_by_jd(available_tools, tool_scores)
         else:
             prioritized_tools = available_tools
         
         # v1JSON.json constraint: "no wrapper headers; plain text" - return without "TOOLS" heading
         return [{"title": "", "skills": ", ".join(prioritized_tools)}]
     
-    def _prioritize_tools_by_jd(self, available_tools: list) -> list:
-        """Prioritize and filter tools based on JD analysis (v1JSON approach: 'mirror JD terms')"""
+    def _prioritize_tools_by_jd(self, available_tools: list, tool_scores: Optional[List[int]] = None) -> list:
+        """
+        Prioritize and filter tools based on JD analysis (v1JSON approach: 'mirror JD terms')
+        
+        Args:
+            available_tools: Tools from the Technical Skills section
+            tool_scores: Precomputed score per tool, e.g. from a relevance scorer
+        
+        Returns:
+            list: Up to 10 tools, JD-relevant ones first
+        """
+        # Score tools based on JD relevance
+        if tool_scores is None:
+            tool_scores = [self._score_tool(tool) for tool in available_tools]
+        
+        # Every JD-relevant tool, at least 6 and at most 10 for space
+        count = min(10, max(6, sum(1 for score in tool_scores if score > 0)))
+        
+        # Top tools by score, highest first and in resume order among equal scores
+        top = heapq.nsmallest(count, range(len(available_tools)), key=lambda index: (-tool_scores[index], index))
+        prioritized = [available_tools[index] for index in top]
+        
+        return prioritized if prioritized else available_tools[:8]
+    
+    def _score_tool(self, tool: str) -> int:
+        """Score one tool for prioritization against the JD analysis"""
         focus = self.jd_analysis['primary_focus']
         jd_skills = self.jd_analysis.get('must_have_skills', [])
         platform_nouns = self.jd_analysis.get('platform_nouns', [])
         primary_segment = focus.get('primary')
         
-        # Score tools based on JD relevance
-        tool_scores = []
-        for tool in available_tools:
-            score = 0
-            tool_lower = tool.lower()
-            
-            # High priority: Direct matches with JD skills/platforms
-            for jd_skill in jd_skills:
-                if jd_skill.lower() in tool_lower or tool_lower in jd_skill.lower():
-                    score += 100
-            
-            for platform in platform_nouns:
-                if platform.lower() in tool_lower or tool_lower in platform.lower():
-                    score += 90
-            
-            # Medium priority: Segment-specific tool relevance
-            if primary_segment == 'benefits':
-                if any(term in tool_lower for term in ['salesforce', 'excel', 'powerbi', 'smartsheet']):
-                    score += 75
-            elif primary_segment == 'saas':
-                if any(term in tool_lower for term in ['analytics', 'api', 'automation', 'python', 'sql']):
-                    score += 75
-            elif primary_segment == 'revenue':
-                if any(term in tool_lower for term in ['crm', 'salesforce', 'analytics', 'hubspot']):
-                    score += 75
-            elif primary_segment == 'operations':
-                if any(term in tool_lower for term in ['automation', 'python', 'sql', 'make.com']):
-                    score += 75
-            
-            # Base relevance for professional tools
-            if any(term in tool_lower for term in ['certified', 'certification', 'master', 'analytics', 'automation']):
-                score += 25
-            
-            tool_scores.append((tool, score))
+        score = 0
+        tool_lower = tool.lower()
         
-        # Sort by score (highest first) and return top tools
-        tool_scores.sort(key=lambda x: x[1], reverse=True)
+        # High priority: Direct matches with JD skills/platforms
+        for jd_skill in jd_skills:
+            if jd_skill.lower() in tool_lower or tool_lower in jd_skill.lower():
+                score += TOOL_SKILL_WEIGHT
         
-        # Return prioritized tools (top 8-10 to fit space, focusing on JD-relevant ones)
-        prioritized = []
-        for tool, score in tool_scores:
-            if score > 0 or len(prioritized) < 6:  # Include at least 6 tools
-                prioritized.append(tool)
-            if len(prioritized) >= 10:  # Cap at 10 tools for space
-                break
+        for platform in platform_nouns:
+            if platform.lower() in tool_lower or tool_lower in platform.lower():
+                score += TOOL_PLATFORM_WEIGHT
         
-        return prioritized if prioritized else available_tools[:8]
+        # Medium priority: Segment-specific tool relevance
+        if any(term in tool_lower for term in SEGMENT_TOOL_TERMS.get(primary_segment, [])):
+            score += TOOL_SEGMENT_WEIGHT
+        
+        # Base relevance for professional tools
+        if any(term in tool_lower for term in PROFESSIONAL_TOOL_TERMS):
+            score += TOOL_PROFESSIONAL_WEIGHT
+        
+        return score
     
-    def _process_experiences_for_html(self, raw_experience: str) -> List[Dict[str, any]]:
-        """Process work experience into structured format"""
+    def _parse_experience_sections(self, raw_experience: str) -> List[Dict[str, any]]:
+        """Split work experience into jobs with cleaned titles, company info, dates and achievements"""
         if not raw_experience:
             return []
         
-        experiences = []
+        jobs = []
         # Split by job sections
         job_sections = re.split(r'###\s+', raw_experience)[1:]  # Skip empty first element
         
@@ -635,67 +708,10 @@ class HTMLContentProcessor(ContentProcessor):
             if not lines:
                 continue
             
-            # Extract job title and apply dynamic prioritization based on JD
+            # Extract job title
             title = lines[0].strip()
             title = re.sub(r'\*\*', '', title)  # Remove markdown
             
-            # Apply v1JSON dynamic job title transformation using actual JD keywords
-            if self.jd_analysis and 'primary_focus' in self.jd_analysis:
-                focus = self.jd_analysis['primary_focus']
-                primary_segment = focus.get('primary')
-                role_keywords = focus.get('role_keywords', [])
-                segment_terms = focus.get('segment_terms', {})
-                
-                # v1JSON approach: Use actual JD terms instead of hardcoded mappings
-                if 'Client Success Lead' in title:
-                    # Use JD-specific keywords to determine the appropriate transformation
-                    if primary_segment == 'benefits' and any(term.lower() in ['benefits', 'enrollment', 'carriers'] for term in segment_terms.get('benefits', [])):
-                        # Use actual JD terminology instead of generic "Benefits Operations"
-                        key_term = next((term for term in segment_terms.get('benefits', []) if term.lower() in ['benefits', 'enrollment']), 'Benefits')
-                        title = title.replace('Client Success Lead', f'{key_term.title()} Success Specialist')
-                    elif primary_segment == 'saas' and any(term.lower() in ['growth', 'product', 'adoption'] for term in segment_terms.get('saas', [])):
-                        # Use actual SaaS JD terminology
-                        key_term = next((term for term in segment_terms.get('saas', []) if term.lower() in ['growth', 'product']), 'Growth')
-                        title = title.replace('Client Success Lead', f'{key_term.title()} Success Manager')
-                    elif primary_segment == 'revenue':
-                        # Use actual revenue JD terminology
-                        key_term = next((term for term in segment_terms.get('revenue', []) if term.lower() in ['revenue', 'sales']), 'Revenue')
-                        title = title.replace('Client Success Lead', f'{key_term.title()} Success Specialist')
-                    else:
-                        # Default: avoid generic "Customer" - use the most relevant JD keyword
-                        primary_keyword = role_keywords[0] if role_keywords else 'Client'
-                        title = title.replace('Client Success Lead', f'{primary_keyword} Success Specialist')
-                        
-                elif 'GTM Content Enablement Manager' in title:
-                    # Use JD-specific terminology for enablement roles
-                    if primary_segment == 'benefits':
-                        key_term = next((term for term in segment_terms.get('benefits', []) if term.lower() in ['benefits', 'enrollment']), 'Benefits')
-                        title = title.replace('GTM Content Enablement Manager', f'{key_term.title()} Enablement Manager')
-                    elif primary_segment == 'saas':
-                        key_term = next((term for term in segment_terms.get('saas', []) if term.lower() in ['growth', 'product']), 'Growth')  
-                        title = title.replace('GTM Content Enablement Manager', f'{key_term.title()} Enablement Manager')
-                    elif primary_segment == 'revenue':
-                        title = title.replace('GTM Content Enablement Manager', 'Revenue Enablement Manager')
-                    else:
-                        # Use most relevant JD keyword instead of generic "Customer"
-                        primary_keyword = role_keywords[0] if role_keywords else 'GTM'
-                        title = title.replace('GTM Content Enablement Manager', f'{primary_keyword} Enablement Manager')
-                        
-                elif 'Revenue Operations & Enablement Specialist' in title:
-                    # Transform based on actual JD focus, not hardcoded rules
-                    if primary_segment == 'benefits':
-                        key_term = next((term for term in segment_terms.get('benefits', []) if term.lower() in ['benefits', 'enrollment']), 'Benefits')
-                        title = title.replace('Revenue Operations & Enablement Specialist', f'{key_term.title()} Operations Specialist')
-                    elif primary_segment == 'saas':
-                        key_term = next((term for term in segment_terms.get('saas', []) if term.lower() in ['growth', 'product']), 'Growth')
-                        title = title.replace('Revenue Operations & Enablement Specialist', f'{key_term.title()} Operations Specialist')
-                    elif primary_segment == 'revenue':
-                        title = title.replace('Revenue Operations & Enablement Specialist', 'Revenue Operations Specialist')
-                    else:
-                        # Use most relevant JD keyword instead of generic "Customer"
-                        primary_keyword = role_keywords[0] if role_keywords else 'Operations'
-                        title = title.replace('Revenue Operations & Enablement Specialist', f'{primary_keyword} Operations Specialist')
-            
             # Extract company info and dates
             company = ""
             dates = ""
@@ -721,116 +737,204 @@ class HTMLContentProcessor(ContentProcessor):
                     # Clean markdown formatting from achievements
                     achievement = re.sub(r'\*\*', '', achievement)  # Remove bold markdown
                     achievement = re.sub(r'\*', '', achievement)    # Remove italic markdown
-                    
-                    # Score achievements for dynamic selection (v1JSON-style prioritization + JD analysis)
-                    score = 0
-                    # Highest priority: quantified results with metrics
-                    if re.search(r'\d+[%KMB$]|\$[\d,]+|\d+\+|increased.*\d+|grew.*\d+|reduced.*\d+', achievement, re.IGNORECASE):
-                        score += 100
-                    
-                    # JD-AWARE SCORING: Boost achievements matching v1JSON dynamic analysis  
-                    if self.jd_analysis and 'primary_focus' in self.jd_analysis:
-                        focus = self.jd_analysis['primary_focus']
-                        primary_segment = focus.get('primary')
-                        segment_terms = focus.get('segment_terms', {})
-                        
-                        # Dynamic scoring based on actual JD terms (v1JSON approach)
-                        if primary_segment == 'benefits':
-                            # Check for any benefits-related terms from actual JD
-                            for term in segment_terms.get('benefits', []):
-                                if term.lower() in achievement.lower():
-                                    score += 75  # High boost for matching JD benefits terms
-                            # Additional benefits-focused terms
-                            if re.search(r'carrier|legal|compliance|Salesforce|plan design|rate|voluntary', achievement, re.IGNORECASE):
-                                score += 60
-                        
-                        elif primary_segment == 'saas':
-                            # Check for any SaaS-related terms from actual JD  
-                            for term in segment_terms.get('saas', []):
-                                if term.lower() in achievement.lower():
-                                    score += 75  # High boost for matching JD SaaS terms
-                            # Additional SaaS-focused terms
-                            if re.search(r'adoption|retention|expansion|growth|onboarding|utilization|product', achievement, re.IGNORECASE):
-                                score += 60
-                                
-                        elif primary_segment == 'revenue':
-                            # Check for any revenue-related terms from actual JD
-                            for term in segment_terms.get('revenue', []):
-                                if term.lower() in achievement.lower():
-                                    score += 75  # High boost for matching JD revenue terms
-                            # Additional revenue-focused terms
-                            if re.search(r'CRM|deal|conversion|close|quota|commission', achievement, re.IGNORECASE):
-                                score += 60
-                                
-                        else:  # operations or default
-                            # Check for any operations-related terms from actual JD
-                            for segment in segment_terms:
-                                for term in segment_terms[segment]:
-                                    if term.lower() in achievement.lower():
-                                        score += 50  # Medium boost for matching any JD terms
-                            # Additional operations-focused terms
-                            if re.search(r'support|client|troubleshooting|resolution|satisfaction|service|efficiency', achievement, re.IGNORECASE):
-                                score += 40
-                        
-                        # Boost achievements containing JD-specific skills/tools
-                        jd_skills = self.jd_analysis.get('must_have_skills', [])
-                        for skill in jd_skills:
-                            if skill.lower() in achievement.lower():
-                                score += 30  # Bonus for each JD skill match
-                        
-                        # Boost achievements containing JD success metrics
-                        jd_metrics = self.jd_analysis.get('success_metrics', [])
-                        for metric in jd_metrics:
-                            if metric.lower() in achievement.lower():
-                                score += 25  # Bonus for each JD success metric match
-                    else:
-                        # Fallback: Original AI/automation scoring when no JD analysis
-                        if re.search(r'AI|automation|intelligent|machine|data|analytics|optimization', achievement, re.IGNORECASE):
-                            score += 50
-                    
-                    # Medium priority: leadership/management
-                    if re.search(r'led|managed|orchestrated|spearheaded|architected', achievement, re.IGNORECASE):
-                        score += 30
-                    # Medium priority: technical tools and processes
-                    if re.search(r'Python|SQL|ChatGPT|Make\.com|LangChain|prompt|API|Salesforce|Zendesk', achievement, re.IGNORECASE):
-                        score += 25
-                    # Bonus for longer, detailed achievements (more informative)
-                    if len(achievement) > 100:
-                        score += 10
-                    
-                    achievements.append({'text': achievement, 'score': score})
+                    achievements.append(achievement)
             
             # Clean dates - remove markdown italic formatting (underscores)
             dates = re.sub(r'_([^_]+)_', r'\1', dates).strip()  # Remove _text_ patterns
             dates = re.sub(r'_', '', dates).strip()  # Remove any remaining underscores
             
-            # Sort achievements by score (highest first) and select top 2-6 dynamically
-            achievements.sort(key=lambda x: x['score'], reverse=True)
+            jobs.append({
+                "title": title,
+                "company": company,
+                "dates": dates,
+                "achievements": achievements
+            })
+        
+        return jobs
+    
+    @traced("score_achievements")
+    def _process_experiences_for_html(self, raw_experience: str, jobs: Optional[List[Dict[str, any]]] = None,
+                                      achievement_scores: Optional[Dict[str, int]] = None,
+                                      title_segment: Optional[str] = None,
+                                      selection_thresholds: Tuple[float, float] = (50, 30)) -> List[Dict[str, any]]:
+        """Process work experience into structured format; selection_thresholds are the scorer's (high, medium) cutoffs"""
+        if jobs is None:
+            jobs = self._parse_experience_sections(raw_experience)
+        
+        experiences = []
+        
+        for job in jobs:
+            # Apply dynamic prioritization based on JD
+            title = self._transform_job_title(job['title'], title_segment)
+            
+            # Score achievements for dynamic selection (precomputed scores come from the relevance scorer)
+            if achievement_scores is not None:
+                achievements = [{'text': achievement, 'score': achievement_scores[achievement]}
+                                for achievement in job['achievements']]
+            else:
+                achievements = [{'text': achievement, 'score': self._score_achievement(achievement)}
+                                for achievement in job['achievements']]
             
             # Dynamic selection: 2-6 bullets based on quality
             if len(achievements) >= 6:
                 # Many achievements: select top 5-6 if scores are high
-                high_scoring = [a for a in achievements if a['score'] >= 50]
+                high_scoring = [a for a in achievements if a['score'] >= selection_thresholds[0]]
                 selected_count = min(6, max(4, len(high_scoring)))
             elif len(achievements) >= 4:
                 # Medium achievements: select 3-5 based on score distribution
-                high_scoring = [a for a in achievements if a['score'] >= 30]
+                high_scoring = [a for a in achievements if a['score'] >= selection_thresholds[1]]
                 selected_count = min(5, max(3, len(high_scoring)))
             else:
                 # Few achievements: use all available
                 selected_count = len(achievements)
             
-            selected_achievements = [a['text'] for a in achievements[:selected_count]]
+            # Top achievements by score, highest first and in resume order among equal scores
+            top = heapq.nsmallest(selected_count, range(len(achievements)),
+                                  key=lambda index: (-achievements[index]['score'], index))
+            selected_achievements = [achievements[index]['text'] for index in top]
             
             experiences.append({
                 "title": title,
-                "company": company,
-                "dates": dates,
+                "company": job['company'],
+                "dates": job['dates'],
                 "achievements": selected_achievements
             })
         
         return experiences
     
+    def _transform_job_title(self, title: str, title_segment: Optional[str] = None) -> str:
+        """
+        Retitle a job toward the JD's focus using the JD's own terms
+        
+        Args:
+            title: Job title from the resume
+            title_segment: Segment ('benefits', 'saas', 'revenue' or 'operations') to
+                           tailor toward instead of the JD's primary focus
+        
+        Returns:
+            str: Transformed title, or the original when no rule applies
+        """
+        # Apply v1JSON dynamic job title transformation using actual JD keywords
+        if title_segment is not None or (self.jd_analysis and 'primary_focus' in self.jd_analysis):
+            focus = (self.jd_analysis or {}).get('primary_focus', {})
+            primary_segment = title_segment or focus.get('primary')
+            role_keywords = focus.get('role_keywords', [])
+            segment_terms = focus.get('segment_terms', {})
+            
+            # v1JSON approach: Use actual JD terms instead of hardcoded mappings
+            if 'Client Success Lead' in title:
+                # Use JD-specific keywords to determine the appropriate transformation
+                if primary_segment == 'benefits' and any(term.lower() in ['benefits', 'enrollment', 'carriers'] for term in segment_terms.get('benefits', [])):
+                    # Use actual JD terminology instead of generic "Benefits Operations"
+                    key_term = next((term for term in segment_terms.get('benefits', []) if term.lower() in ['benefits', 'enrollment']), 'Benefits')
+                    title = title.replace('Client Success Lead', f'{key_term.title()} Success Specialist')
+                elif primary_segment == 'saas' and any(term.lower() in ['growth', 'product', 'adoption'] for term in segment_terms.get('saas', [])):
+                    # Use actual SaaS JD terminology
+                    key_term = next((term for term in segment_terms.get('saas', []) if term.lower() in ['growth', 'product']), 'Growth')
+                    title = title.replace('Client Success Lead', f'{key_term.title()} Success Manager')
+                elif primary_segment == 'revenue':
+                    # Use actual revenue JD terminology
+                    key_term = next((term for term in segment_terms.get('revenue', []) if term.lower() in ['revenue', 'sales']), 'Revenue')
+                    title = title.replace('Client Success Lead', f'{key_term.title()} Success Specialist')
+                else:
+                    # Default: avoid generic "Customer" - use the most relevant JD keyword
+                    primary_keyword = role_keywords[0] if role_keywords else 'Client'
+                    title = title.replace('Client Success Lead', f'{primary_keyword} Success Specialist')
+            
+            elif 'GTM Content Enablement Manager' in title:
+                # Use JD-specific terminology for enablement roles
+                if primary_segment == 'benefits':
+                    key_term = next((term for term in segment_terms.get('benefits', []) if term.lower() in ['benefits', 'enrollment']), 'Benefits')
+                    title = title.replace('GTM Content Enablement Manager', f'{key_term.title()} Enablement Manager')
+                elif primary_segment == 'saas':
+                    key_term = next((term for term in segment_terms.get('saas', []) if term.lower() in ['growth', 'product']), 'Growth')  
+                    title = title.replace('GTM Content Enablement Manager', f'{key_term.title()} Enablement Manager')
+                elif primary_segment == 'revenue':
+                    title = title.replace('GTM Content Enablement Manager', 'Revenue Enablement Manager')
+                else:
+                    # Use most relevant JD keyword instead of generic "Customer"
+                    primary_keyword = role_keywords[0] if role_keywords else 'GTM'
+                    title = title.replace('GTM Content Enablement Manager', f'{primary_keyword} Enablement Manager')
+            
+            elif 'Revenue Operations & Enablement Specialist' in title:
+                # Transform based on actual JD focus, not hardcoded rules
+                if primary_segment == 'benefits':
+                    key_term = next((term for term in segment_terms.get('benefits', []) if term.lower() in ['benefits', 'enrollment']), 'Benefits')
+                    title = title.replace('Revenue Operations & Enablement Specialist', f'{key_term.title()} Operations Specialist')
+                elif primary_segment == 'saas':
+                    key_term = next((term for term in segment_terms.get('saas', []) if term.lower() in ['growth', 'product']), 'Growth')
+                    title = title.replace('Revenue Operations & Enablement Specialist', f'{key_term.title()} Operations Specialist')
+                elif primary_segment == 'revenue':
+                    title = title.replace('Revenue Operations & Enablement Specialist', 'Revenue Operations Specialist')
+                else:
+                    # Use most relevant JD keyword instead of generic "Customer"
+                    primary_keyword = role_keywords[0] if role_keywords else 'Operations'
+                    title = title.replace('Revenue Operations & Enablement Specialist', f'{primary_keyword} Operations Specialist')
+        
+        return title
+    
+    def _score_achievement(self, achievement: str) -> int:
+        """Score one achievement for dynamic selection (v1JSON-style prioritization + JD analysis)"""
+        score = 0
+        achievement_lower = achievement.lower()
+        # Highest priority: quantified results with metrics
+        if METRIC_RESULT_RE.search(achievement):
+            score += METRIC_RESULT_WEIGHT
+        
+        # JD-AWARE SCORING: Boost achievements matching v1JSON dynamic analysis  
+        if self.jd_analysis and 'primary_focus' in self.jd_analysis:
+            focus = self.jd_analysis['primary_focus']
+            primary_segment = focus.get('primary')
+            segment_terms = focus.get('segment_terms', {})
+            
+            # Dynamic scoring based on actual JD terms (v1JSON approach)
+            if primary_segment in FOCUSED_SEGMENTS:
+                # Check for any segment-related terms from actual JD
+                for term in segment_terms.get(primary_segment, []):
+                    if term.lower() in achievement_lower:
+                        score += PRIMARY_TERM_WEIGHT  # High boost for matching JD segment terms
+                # Additional segment-focused terms
+                if SEGMENT_ACHIEVEMENT_RES[primary_segment].search(achievement):
+                    score += PRIMARY_PATTERN_WEIGHT
+                    
+            else:  # operations or default
+                # Check for any operations-related terms from actual JD
+                for segment in segment_terms:
+                    for term in segment_terms[segment]:
+                        if term.lower() in achievement_lower:
+                            score += SEGMENT_TERM_WEIGHT  # Medium boost for matching any JD terms
+                # Additional operations-focused terms
+                if SEGMENT_ACHIEVEMENT_RES['operations'].search(achievement):
+                    score += OPERATIONS_PATTERN_WEIGHT
+            
+            # Boost achievements containing JD-specific skills/tools
+            jd_skills = self.jd_analysis.get('must_have_skills', [])
+            for skill in jd_skills:
+                if skill.lower() in achievement_lower:
+                    score += JD_SKILL_WEIGHT  # Bonus for each JD skill match
+            
+            # Boost achievements containing JD success metrics
+            jd_metrics = self.jd_analysis.get('success_metrics', [])
+            for metric in jd_metrics:
+                if metric.lower() in achievement_lower:
+                    score += JD_METRIC_WEIGHT  # Bonus for each JD success metric match
+        else:
+            # Fallback: Original AI/automation scoring when no JD analysis
+            if AI_FOCUS_RE.search(achievement):
+                score += AI_FOCUS_WEIGHT
+        
+        # Medium priority: leadership/management
+        if LEADERSHIP_RE.search(achievement):
+            score += LEADERSHIP_WEIGHT
+        # Medium priority: technical tools and processes
+        if TOOL_MENTION_RE.search(achievement):
+            score += TOOL_MENTION_WEIGHT
+        # Bonus for longer, detailed achievements (more informative)
+        if len(achievement) > DETAIL_MIN_LENGTH:
+            score += DETAIL_WEIGHT
+        
+        return score
+    
     def _process_professional_development(self, raw_sections: Dict[str, str]) -> List[str]:
         """Extract professional development/training information"""
         dev_items = []
@@ -856,12 +960,13 @@ class HTMLContentProcessor(ContentProcessor):
         
         return dev_items[:5]  # Limit to 5 items
     
+    @traced("optimize_heuristic")
     def optimize_for_single_page(self, content: StructuredContent) -> StructuredContent:
         """
         Post-process content to ensure it fits on a single page by intelligently trimming
         achievements while preserving the most impactful ones selected by the original prompt
         """
-        print("[OPTIMIZE] Optimizing content for single-page layout...")
+        events.debug("optimize.start", "Optimizing content for single-page layout...")
         
         # Calculate approximate content length for single-page estimation
         total_content_estimate = 0
@@ -889,19 +994,19 @@ class HTMLContentProcessor(ContentProcessor):
         OPTIMAL_CONTENT_MIN = 3500  # Minimum for large fonts
         OPTIMAL_CONTENT_MAX = 4200  # Maximum for standard fonts
         
-        print(f"[OPTIMIZE] Estimated content length: {total_content_estimate} chars")
-        print(f"[OPTIMIZE] Single-page target: {SINGLE_PAGE_LIMIT} chars")
+        events.debug("optimize.estimate", "Estimated content length: {chars} chars (single-page target: {limit} chars)",
+                     chars=total_content_estimate, limit=SINGLE_PAGE_LIMIT)
         
         # Use Option 2's font scaling (1.0x) for consistent PDF output
         content.font_scale_factor = 1.0
-        print(f"[OPTIMIZE] Using Option 2 font scaling: {content.font_scale_factor}x")
         
         if total_content_estimate <= SINGLE_PAGE_LIMIT:
-            print("[OPTIMIZE] Content fits on single page with dynamic font scaling")
+            events.info("optimize.fits", "Content fits on single page at {font_scale}x",
+                        chars=total_content_estimate, font_scale=content.font_scale_factor)
             return content
         
         # Need to trim - reduce achievements per job progressively
-        print("[OPTIMIZE] Content exceeds single page, trimming achievements...")
+        events.debug("optimize.trim_start", "Content exceeds single page, trimming achievements...")
         
         # Try different achievement limits until we fit (more conservative approach)
         for max_achievements in [5, 4, 3, 2]:
@@ -922,20 +1027,23 @@ class HTMLContentProcessor(ContentProcessor):
             
             trimmed_total = total_content_estimate - experience_content + trimmed_experience_content
             
-            print(f"[OPTIMIZE] With {max_achievements} achievements per job: {trimmed_total} chars")
+            events.debug("optimize.attempt", "With {achievement_cap} achievements per job: {chars} chars",
+                         achievement_cap=max_achievements, chars=trimmed_total)
             
             if trimmed_total <= SINGLE_PAGE_LIMIT:
-                print(f"[OPTIMIZE] Optimized to {max_achievements} achievements per job")
                 content.experiences = trimmed_experiences
                 
                 # Maintain Option 2's font scaling (1.0x) for consistent PDF output
                 content.font_scale_factor = 1.0
-                print("[OPTIMIZE] Maintaining Option 2 font scaling for trimmed content: 1.0x")
+                events.info("optimize.trimmed", "Optimized to {achievement_cap} achievements per job at {font_scale}x",
+                            achievement_cap=max_achievements, chars=trimmed_total,
+                            font_scale=content.font_scale_factor)
                 
                 return content
         
         # If still too long, trim to 2 achievements and reduce professional development
-        print("[OPTIMIZE] Final trim: 2 achievements + reduced professional development")
+        events.info("optimize.final_trim", "Final trim: 2 achievements + reduced professional development",
+                    achievement_cap=2)
         for exp in content.experiences:
             exp['achievements'] = exp.get('achievements', [])[:2]
         content.professional_development = content.professional_development[:3]
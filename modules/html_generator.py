@@ -7,13 +7,17 @@ Generates professional HTML resume from structured content using Jinja2 templati
 import os
 from pathlib import Path
 from typing import Optional
-try:
-    from jinja2 import Environment, FileSystemLoader, select_autoescape
-except ImportError:
-    print("Jinja2 not installed. Run: pip install jinja2")
-    raise
 
-from .html_content_processor import HTMLContentProcessor, StructuredContent
+from html_content_processor import HTMLContentProcessor, StructuredContent
+
+def _template_env():
+    """Import the Jinja-backed template helpers when rendering first needs them"""
+    try:
+        import template_env
+    except ImportError:
+        print("Jinja2 not installed. Run: pip install jinja2")
+        raise
+    return template_env
 
 class HTMLResumeGenerator:
     """
@@ -34,15 +38,14 @@ class HTMLResumeGenerator:
         
         self.template_dir = Path(template_dir)
         
-        # Initialize Jinja2 environment
-        self.env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
-        
         # Content processor
         self.content_processor = HTMLContentProcessor()
     
+    @property
+    def env(self):
+        """Shared Jinja2 environment, with compiled templates cached on disk"""
+        return _template_env().get_environment(str(self.template_dir))
+    
     def generate_html_from_markdown(self, 
                                   markdown_path: str, 
                                   output_path: str,
@@ -95,14 +98,7 @@ class HTMLResumeGenerator:
             bool: Success status
         """
         try:
-            # Load template
-            template = self.env.get_template(template_name)
-            
-            # Convert structured content to template variables
-            template_vars = self._content_to_template_vars(content)
-            
-            # Render template
-            html_output = template.render(**template_vars)
+            html_output = self.render_html(content, template_name)
             
             # Ensure output directory exists
             output_dir = Path(output_path).parent
@@ -119,6 +115,42 @@ class HTMLResumeGenerator:
             print(f"[ERROR] Error generating HTML: {e}")
             return False
     
+    def render_html(self, content: StructuredContent,
+                    template_name: str = "resume_template.html") -> str:
+        """
+        Render structured content to an HTML string without writing a file
+        
+        Args:
+            content: StructuredContent object with resume data
+            template_name: Name of template file to use
+            
+        Returns:
+            str: Rendered HTML
+        """
+        renderer = _template_env().get_fragment_renderer(template_name, str(self.template_dir))
+        return renderer.render(**self._content_to_template_vars(content))
+    
+    def render_html_from_markdown(self,
+                                  markdown_path: str,
+                                  photo_path: Optional[str] = None,
+                                  template_name: str = "resume_template.html") -> str:
+        """
+        Process a markdown resume and render it to an HTML string
+        
+        Args:
+            markdown_path: Path to markdown resume file
+            photo_path: Optional path to photo file
+            template_name: Name of template file to use
+            
+        Returns:
+            str: Rendered HTML
+        """
+        structured_content = self.content_processor.process_for_html_template(
+            markdown_path, photo_path
+        )
+        structured_content = self.content_processor.optimize_for_single_page(structured_content)
+        return self.render_html(structured_content, template_name)
+    
     def _content_to_template_vars(self, content: StructuredContent) -> dict:
         """
         Convert StructuredContent to template variables
@@ -5,25 +5,76 @@ Converts HTML resume to high-quality PDF using WeasyPrint
 """
 
 import os
-import tempfile
+import importlib.util
 from pathlib import Path
 from typing import Optional
 
-try:
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
-    WEASYPRINT_AVAILABLE = True
-except ImportError as e:
-    # WeasyPrint not available or has dependency issues
-    HTML = None
-    CSS = None
-    FontConfiguration = None
-    WEASYPRINT_AVAILABLE = False
+# WeasyPrint and its Pango/cairo bindings take a few hundred milliseconds to import,
+# so they are loaded by the first HTMLPDFGenerator rather than with this module
+HTML = None
+CSS = None
+WEASYPRINT_AVAILABLE = importlib.util.find_spec('weasyprint') is not None
+
+def _load_weasyprint() -> bool:
+    """Import WeasyPrint on first use; False when it or its native libraries are missing"""
+    global HTML, CSS, WEASYPRINT_AVAILABLE
+    
+    if WEASYPRINT_AVAILABLE and HTML is None:
+        try:
+            from weasyprint import HTML, CSS
+        except (ImportError, OSError):
+            # WeasyPrint not available or has dependency issues
+            WEASYPRINT_AVAILABLE = False
+    
+    return WEASYPRINT_AVAILABLE
 
 # Add archive modules to path for HTMLResumeGenerator
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'archive', 'modules'))
-from html_generator import HTMLResumeGenerator
+from stage_timing import traced
+from font_config import get_font_configuration, get_font_stylesheets
+import events
+
+# Additional CSS for PDF optimization, applied on top of the template's own styles
+PDF_PAGE_CSS = """
+    @page {
+        size: Letter;
+        margin: 0;
+        -webkit-print-color-adjust: exact;
+        print-color-adjust: exact;
+    }
+    
+    body {
+        -webkit-print-color-adjust: exact;
+        print-color-adjust: exact;
+    }
+    
+    .resume-container {
+        width: 100%;
+        height: 100vh;
+        max-width: none;
+    }
+    
+    /* Ensure colors print correctly */
+    .header {
+        -webkit-print-color-adjust: exact !important;
+        print-color-adjust: exact !important;
+    }
+    
+    /* Better font rendering for PDF */
+    body {
+        font-size: 11px;
+        line-height: 1.3;
+    }
+    
+    .header-name {
+        font-size: 42px;
+    }
+    
+    .header-tagline {
+        font-size: 16px;
+    }
+"""
 
 class HTMLPDFGenerator:
     """
@@ -31,11 +82,113 @@ class HTMLPDFGenerator:
     """
     
     def __init__(self):
-        """Initialize PDF generator with font configuration"""
-        if not WEASYPRINT_AVAILABLE:
+        """Initialize PDF generator with the shared font configuration"""
+        if not _load_weasyprint():
             raise ImportError("WeasyPrint is not available or has dependency issues")
-        self.font_config = FontConfiguration()
-        self.html_generator = HTMLResumeGenerator()
+        self.font_config = get_font_configuration()
+        self._html_generator = None
+        self._stylesheets = None
+    
+    @property
+    def html_generator(self):
+        """Markdown-to-HTML generator, created when a markdown conversion first needs it"""
+        if self._html_generator is None:
+            from html_generator import HTMLResumeGenerator
+            self._html_generator = HTMLResumeGenerator()
+        return self._html_generator
+    
+    def _get_stylesheets(self) -> list:
+        """Parse the bundled fonts and PDF optimization CSS once and reuse them for every render"""
+        if self._stylesheets is None:
+            self._stylesheets = get_font_stylesheets() + [CSS(string=PDF_PAGE_CSS, font_config=self.font_config)]
+        return self._stylesheets
+    
+    @traced("weasyprint_layout")
+    def render_document(self, html_content: str, base_url: Optional[str] = None):
+        """
+        Run WeasyPrint's layout pass on an HTML string
+        
+        The returned Document exposes the laid-out pages for measuring and can
+        be written to PDF without laying it out again.
+        
+        Args:
+            html_content: Rendered resume HTML
+            base_url: Base for resolving relative URLs (default: current directory)
+            
+        Returns:
+            weasyprint.Document
+        """
+        html_doc = HTML(string=html_content, base_url=base_url or os.getcwd())
+        return html_doc.render(
+            stylesheets=self._get_stylesheets(),
+            font_config=self.font_config,
+            optimize_images=True
+        )
+    
+    @traced("weasyprint_render")
+    def render_pdf_bytes(self, html_content: str, base_url: Optional[str] = None) -> bytes:
+        """
+        Render an HTML string straight to PDF bytes, with no files involved
+        
+        Args:
+            html_content: Rendered resume HTML
+            base_url: Base for resolving relative URLs (default: current directory)
+            
+        Returns:
+            bytes: PDF data
+        """
+        html_doc = HTML(string=html_content, base_url=base_url or os.getcwd())
+        return html_doc.write_pdf(
+            stylesheets=self._get_stylesheets(),
+            font_config=self.font_config,
+            optimize_images=True
+        )
+    
+    @traced("pdf_write")
+    def document_to_pdf_bytes(self, document) -> bytes:
+        """Write an already laid-out Document to PDF bytes"""
+        return document.write_pdf(optimize_images=True)
+    
+    @traced("pdf_write")
+    def write_document(self, document, pdf_output_path: str) -> bool:
+        """
+        Write an already laid-out Document to PDF
+        
+        Args:
+            document: Document returned by render_document
+            pdf_output_path: Where to save the PDF file
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            output_dir = Path(pdf_output_path).parent
+            output_dir.mkdir(parents=True, exist_ok=True)
+            
+            document.write_pdf(pdf_output_path, optimize_images=True)
+            
+            events.info("pdf.generated", "PDF generated successfully: {path}", path=pdf_output_path)
+            return self._verify_pdf(pdf_output_path)
+            
+        except Exception as e:
+            events.error("pdf.write_failed", "Error writing PDF: {error}", error=str(e))
+            return False
+    
+    def _verify_pdf(self, pdf_output_path: str) -> bool:
+        """Verify PDF was created and has reasonable size"""
+        if os.path.exists(pdf_output_path):
+            file_size = os.path.getsize(pdf_output_path)
+            if file_size > 1000:  # At least 1KB
+                events.debug("pdf.size", "PDF file size: {size_kb:.1f} KB", path=pdf_output_path,
+                             size_kb=file_size / 1024)
+                return True
+            else:
+                events.warning("pdf.too_small", "PDF file seems too small, may be corrupted",
+                               path=pdf_output_path, size=file_size)
+                return False
+        else:
+            events.error("pdf.missing", "PDF file was not created", path=pdf_output_path)
+            return False
     
     def generate_pdf_from_markdown(self, 
                                  markdown_path: str,
@@ -57,42 +210,37 @@ class HTMLPDFGenerator:
             bool: Success status
         """
         try:
-            print(f"🔄 Starting PDF generation from {markdown_path}...")
+            events.debug("pdf.start", "Starting PDF generation from {source}...", source=markdown_path)
             
-            # Generate HTML first
             if keep_html and html_output_path:
-                html_path = html_output_path
-            else:
-                # Create temporary HTML file
-                temp_html = tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8')
-                html_path = temp_html.name
-                temp_html.close()
-            
-            # Generate HTML resume
-            success = self.html_generator.generate_html_from_markdown(
-                markdown_path, html_path, photo_path
-            )
-            
-            if not success:
-                print("❌ Failed to generate HTML resume")
-                return False
+                # Generate HTML resume on disk, then convert it
+                success = self.html_generator.generate_html_from_markdown(
+                    markdown_path, html_output_path, photo_path
+                )
+                
+                if not success:
+                    events.error("pdf.html_failed", "Failed to generate HTML resume", source=markdown_path)
+                    return False
+                
+                return self.convert_html_to_pdf(html_output_path, pdf_output_path)
             
-            # Convert HTML to PDF
-            success = self.convert_html_to_pdf(html_path, pdf_output_path)
+            # Render HTML in memory and write only the PDF
+            html_content = self.html_generator.render_html_from_markdown(markdown_path, photo_path)
+            pdf_bytes = self.render_pdf_bytes(html_content, str(self.html_generator.template_dir))
             
-            # Clean up temporary HTML if not keeping it
-            if not keep_html and html_path != html_output_path:
-                try:
-                    os.unlink(html_path)
-                except:
-                    pass
+            output_dir = Path(pdf_output_path).parent
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with open(pdf_output_path, 'wb') as f:
+                f.write(pdf_bytes)
             
-            return success
+            events.info("pdf.generated", "PDF generated successfully: {path}", path=pdf_output_path)
+            return self._verify_pdf(pdf_output_path)
             
         except Exception as e:
-            print(f"❌ Error generating PDF from markdown: {e}")
+            events.error("pdf.markdown_failed", "Error generating PDF from markdown: {error}", error=str(e))
             return False
     
+    @traced("weasyprint_convert")
     def convert_html_to_pdf(self, html_path: str, pdf_output_path: str) -> bool:
         """
         Convert HTML file to PDF using WeasyPrint
@@ -105,85 +253,33 @@ class HTMLPDFGenerator:
             bool: Success status
         """
         try:
-            print(f"📄 Converting HTML to PDF...")
+            events.debug("pdf.convert", "Converting HTML to PDF...", source=html_path)
             
             if not os.path.exists(html_path):
-                print(f"❌ HTML file not found: {html_path}")
+                events.error("pdf.html_missing", "HTML file not found: {source}", source=html_path)
                 return False
             
             # Ensure output directory exists
             output_dir = Path(pdf_output_path).parent
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Additional CSS for PDF optimization
-            pdf_css = CSS(string="""
-                @page {
-                    size: Letter;
-                    margin: 0;
-                    -webkit-print-color-adjust: exact;
-                    print-color-adjust: exact;
-                }
-                
-                body {
-                    -webkit-print-color-adjust: exact;
-                    print-color-adjust: exact;
-                }
-                
-                .resume-container {
-                    width: 100%;
-                    height: 100vh;
-                    max-width: none;
-                }
-                
-                /* Ensure colors print correctly */
-                .header {
-                    -webkit-print-color-adjust: exact !important;
-                    print-color-adjust: exact !important;
-                }
-                
-                /* Better font rendering for PDF */
-                body {
-                    font-size: 11px;
-                    line-height: 1.3;
-                }
-                
-                .header-name {
-                    font-size: 42px;
-                }
-                
-                .header-tagline {
-                    font-size: 16px;
-                }
-            """, font_config=self.font_config)
-            
             # Convert HTML to PDF
             html_doc = HTML(filename=html_path)
             
             # Generate PDF with custom CSS
             html_doc.write_pdf(
                 pdf_output_path, 
-                stylesheets=[pdf_css],
+                stylesheets=self._get_stylesheets(),
                 font_config=self.font_config,
                 optimize_images=True
             )
             
-            print(f"✅ PDF generated successfully: {pdf_output_path}")
+            events.info("pdf.generated", "PDF generated successfully: {path}", path=pdf_output_path)
             
-            # Verify PDF was created and has reasonable size
-            if os.path.exists(pdf_output_path):
-                file_size = os.path.getsize(pdf_output_path)
-                if file_size > 1000:  # At least 1KB
-                    print(f"📊 PDF file size: {file_size / 1024:.1f} KB")
-                    return True
-                else:
-                    print("⚠️ PDF file seems too small, may be corrupted")
-                    return False
-            else:
-                print("❌ PDF file was not created")
-                return False
+            return self._verify_pdf(pdf_output_path)
                 
         except Exception as e:
-            print(f"❌ Error converting HTML to PDF: {e}")
+            events.error("pdf.convert_failed", "Error converting HTML to PDF: {error}", error=str(e))
             return False
     
     def generate_pdf_with_custom_css(self, 
@@ -225,15 +321,15 @@ class HTMLPDFGenerator:
             html_doc = HTML(filename=html_path)
             html_doc.write_pdf(
                 pdf_output_path,
-                stylesheets=[css], 
+                stylesheets=get_font_stylesheets() + [css], 
                 font_config=self.font_config
             )
             
-            print(f"✅ PDF with custom CSS generated: {pdf_output_path}")
+            events.info("pdf.generated", "PDF with custom CSS generated: {path}", path=pdf_output_path)
             return True
             
         except Exception as e:
-            print(f"❌ Error generating PDF with custom CSS: {e}")
+            events.error("pdf.custom_css_failed", "Error generating PDF with custom CSS: {error}", error=str(e))
             return False
     
     def validate_dependencies(self) -> bool:
@@ -248,18 +344,18 @@ class HTMLPDFGenerator:
             from weasyprint import HTML, CSS
             
             # Test font configuration
-            font_config = FontConfiguration()
+            get_font_configuration()
             
             # Test basic HTML rendering
             test_html = "<html><body><h1>Test</h1></body></html>"
             HTML(string=test_html)
             
-            print("✅ All PDF generation dependencies are available")
+            events.info("pdf.dependencies_ok", "All PDF generation dependencies are available")
             return True
             
         except Exception as e:
-            print(f"❌ Missing dependencies for PDF generation: {e}")
-            print("💡 Install with: pip install weasyprint")
+            events.error("pdf.dependencies_missing", "Missing dependencies for PDF generation: {error} "
+                         "(install with: pip install weasyprint)", error=str(e))
             return False
 
 class PDFOptimizer:
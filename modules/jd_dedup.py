@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+JD Dedup
+MinHash/LSH index of processed JDs, so reposted jobs reuse an earlier JD's analysis and PDF
+
+The same job is often reposted across boards with only boilerplate changes.
+Each JD is reduced to a MinHash signature over its normalized word shingles;
+locality-sensitive hashing of signature bands finds likely near-duplicates
+without comparing against every stored JD, and the signatures themselves
+estimate the Jaccard similarity of the candidates.
+"""
+
+import os
+import re
+import json
+import base64
+import random
+import struct
+import hashlib
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from cache_paths import get_cache_dir
+import events
+
+NUM_PERM = 128
+BANDS = 16              # 16 bands of 8 rows: a pair at 0.85 similarity shares a band 99% of the time
+ROWS = NUM_PERM // BANDS
+SIGNATURE_BYTES = NUM_PERM * 4
+SHINGLE_WORDS = 4
+DEFAULT_THRESHOLD = 0.85
+MAX_ENTRIES = 5000
+MAX_CONTEXTS = 4        # logs kept for recently used contexts, e.g. one per --scorer in use
+
+# Bump when normalization, shingling or hashing changes so stored signatures are rebuilt
+INDEX_VERSION = 1
+
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Multiply-shift hashing of 32-bit shingle hashes: the top 32 bits of (a * x + b) mod 2^64.
+# numpy's uint64 arithmetic wraps the same way, so both paths give identical signatures
+_MASK64 = (1 << 64) - 1
+_random = random.Random(INDEX_VERSION)
+_COEFF_A = [_random.randrange(1 << 64) | 1 for _ in range(NUM_PERM)]
+_COEFF_B = [_random.randrange(1 << 64) for _ in range(NUM_PERM)]
+
+if NUMPY_AVAILABLE:
+    _NP_COEFF_A = np.array(_COEFF_A, dtype=np.uint64)[:, None]
+    _NP_COEFF_B = np.array(_COEFF_B, dtype=np.uint64)[:, None]
+
+class JDFingerprint:
+    """
+    A JD's normalized identity and MinHash signature
+    
+    The exact key is cheap and computed up front; the signature is computed on
+    first use, so exact reposts never pay for it.
+    """
+    
+    def __init__(self, jd_text: str):
+        self._words = WORD_RE.findall(jd_text.lower())
+        self.key = hashlib.sha256(' '.join(self._words).encode('utf-8')).hexdigest()
+        self._signature = None
+    
+    @property
+    def signature(self) -> List[int]:
+        if self._signature is None:
+            self._signature = minhash(shingle_hashes(self._words))
+        return self._signature
+
+@dataclass
+class JDMatch:
+    """A stored JD similar enough to reuse"""
+    key: str
+    similarity: float
+    analysis: Optional[Dict]
+    pdf_key: Optional[str]
+
+def shingle_hashes(words: List[str]) -> List[int]:
+    """Distinct 32-bit hashes of every run of SHINGLE_WORDS consecutive words"""
+    if len(words) <= SHINGLE_WORDS:
+        return [zlib.crc32(' '.join(words).encode('utf-8'))] if words else []
+    return list({zlib.crc32(' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8'))
+                 for i in range(len(words) - SHINGLE_WORDS + 1)})
+
+def minhash(hashes: List[int]) -> List[int]:
+    """MinHash signature: the minimum of each of NUM_PERM hash permutations over the shingles"""
+    if not hashes:
+        return [0xFFFFFFFF] * NUM_PERM
+    
+    if NUMPY_AVAILABLE:
+        values = np.array(hashes, dtype=np.uint64)
+        return ((_NP_COEFF_A * values + _NP_COEFF_B) >> np.uint64(32)).min(axis=1).tolist()
+    
+    return [min(((a * x + b) & _MASK64) >> 32 for x in hashes) for a, b in zip(_COEFF_A, _COEFF_B)]
+
+def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERM
+
+class JDIndex:
+    """
+    Persistent near-duplicate index of processed JDs
+    
+    Entries are appended to a log under .cache/jd_index, one log per
+    context (the resume, template, photo, scorer and content code the stored
+    PDFs were made with), so a PDF is never reused across resume versions.
+    The logs of the MAX_CONTEXTS most recently opened contexts are kept, so
+    runs alternating between scorers keep their own indexes. Every process
+    picks up entries other processes appended since its last lookup, and the
+    log is compacted once superseded lines outnumber live entries. Appends and
+    compaction hold an exclusive lock on <log>.lock, so no line lands in a log
+    that is being rewritten; where fcntl is unavailable (Windows), an entry
+    appended during another process's compaction can be lost.
+    """
+    
+    def __init__(self, context: str = '', threshold: Optional[float] = None,
+                 index_dir: Optional[str] = None, max_entries: int = MAX_ENTRIES):
+        """
+        Initialize index
+        
+        Args:
+            context: Digest of everything besides the JD that stored PDFs depend on
+            threshold: Minimum estimated similarity to reuse a JD (default:
+                       RESUME_JD_DEDUP_THRESHOLD env var or 0.85)
+            index_dir: Index directory (default: .cache/jd_index)
+            max_entries: JDs kept; the oldest are dropped at compaction
+        """
+        if threshold is None:
+            threshold = float(os.environ.get('RESUME_JD_DEDUP_THRESHOLD', DEFAULT_THRESHOLD))
+        
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.index_dir = index_dir or get_cache_dir('jd_index')
+        context_digest = hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(self.index_dir, f"jds-v{INDEX_VERSION}-{context_digest}.log")
+        self.stats = {"exact": 0, "near": 0, "misses": 0}
+        
+        self._entries = {}
+        self._bands = [{} for _ in range(BANDS)]
+        self._file_id = None
+        self._offset = 0
+        self._lines = 0
+        
+        self._drop_stale_contexts()
+        self._refresh()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def lookup(self, fingerprint: JDFingerprint) -> Optional[JDMatch]:
+        """
+        Find the most similar stored JD at or above the threshold
+        
+        Args:
+            fingerprint: JDFingerprint of the new JD
+        
+        Returns:
+            JDMatch, or None when no stored JD is similar enough
+        """
+        self._refresh()
+        
+        if fingerprint.key in self._entries:
+            self.stats["exact"] += 1
+            return self._match(fingerprint.key, 1.0)
+        
+        signature = fingerprint.signature
+        packed = _pack(signature)
+        candidates = set()
+        for band, table in enumerate(self._bands):
+            candidates.update(table.get(_band_key(packed, band), ()))
+        
+        best_key, best_similarity = None, 0.0
+        for key in candidates:
+            score = similarity(signature, _unpack(self._entries[key][0]))
+            if score > best_similarity:
+                best_key, best_similarity = key, score
+        
+        if best_key is None or best_similarity < self.threshold:
+            self.stats["misses"] += 1
+            return None
+        
+        self.stats["near"] += 1
+        return self._match(best_key, best_similarity)
+    
+    def add(self, fingerprint: JDFingerprint, analysis: Optional[Dict], pdf_key: Optional[str]):
+        """
+        Store a processed JD
+        
+        Args:
+            fingerprint: JDFingerprint of the JD
+            analysis: Its HTMLContentProcessor JD analysis (the raw JD text is not stored)
+            pdf_key: PDF cache key of its rendered resume
+        """
+        try:
+            if analysis is not None:
+                analysis = {name: value for name, value in analysis.items() if name != 'raw_jd_text'}
+            analysis_json = json.dumps(analysis, separators=(',', ':'), sort_keys=True)
+        except (TypeError, ValueError) as e:
+            events.warning("dedup.write_failed", "Could not store JD analysis: {error}", error=str(e))
+            return
+        
+        self._refresh()
+        if self._entries.get(fingerprint.key, (None,))[1:] == (pdf_key or '', analysis_json):
+            return
+        
+        try:
+            with self._locked(), open(self.path, 'a', encoding='utf-8') as f:
+                f.write(_record(fingerprint.key, _pack(fingerprint.signature), pdf_key or '', analysis_json))
+        except OSError as e:
+            events.warning("dedup.write_failed", "Could not write JD index: {error}", error=str(e))
+            return
+        self._refresh()
+        
+        if self._lines > 2 * max(len(self._entries), 100) or len(self._entries) > self.max_entries:
+            self._compact()
+    
+    def _refresh(self):
+        """Load entries appended since the last read, or everything after a compaction"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._entries = {}
+            self._bands = [{} for _ in range(BANDS)]
+            self._file_id, self._offset, self._lines = file_id, 0, 0
+        if stat.st_size == self._offset:
+            return
+        
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        
+        # A line another process is still writing has no newline yet; leave it for the next read
+        complete = data[:data.rfind(b'\n') + 1]
+        self._offset += len(complete)
+        for line in complete.decode('utf-8', 'replace').splitlines():
+            # key, signature, PDF key, analysis JSON; the analysis is parsed only when matched
+            fields = line.split('\t', 3)
+            try:
+                packed = base64.b64decode(fields[1])
+            except (IndexError, ValueError):
+                continue
+            if len(fields) == 4 and len(packed) == SIGNATURE_BYTES:
+                self._remember(fields[0], packed, fields[2], fields[3])
+                self._lines += 1
+    
+    def _remember(self, key: str, packed: bytes, pdf_key: str, analysis_json: str):
+        # Signatures stay packed: bytes band keys make loading a large index cheap
+        if key not in self._entries:
+            for band, table in enumerate(self._bands):
+                band_key = _band_key(packed, band)
+                keys = table.get(band_key)
+                if keys is None:
+                    table[band_key] = [key]
+                else:
+                    keys.append(key)
+        else:
+            del self._entries[key]  # re-added entries move to the newest position
+        self._entries[key] = (packed, pdf_key, analysis_json)
+    
+    def _match(self, key: str, score: float) -> JDMatch:
+        _, pdf_key, analysis_json = self._entries[key]
+        try:
+            analysis = json.loads(analysis_json)
+        except ValueError:
+            analysis = None
+        return JDMatch(key, score, analysis if isinstance(analysis, dict) else None, pdf_key or None)
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the log's exclusive lock (a separate file, since compaction replaces the log itself)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _compact(self):
+        """Rewrite the log with only the newest max_entries live entries"""
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with self._locked():
+                # Lines other processes appended since our last read must survive the rewrite
+                self._refresh()
+                keep = list(self._entries.items())[-self.max_entries:]
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    for key, entry in keep:
+                        f.write(_record(key, *entry))
+                os.replace(temp_path, self.path)
+        except OSError as e:
+            events.warning("dedup.write_failed", "Could not compact JD index: {error}", error=str(e))
+            return
+        self._file_id = None
+        self._refresh()
+    
+    def _drop_stale_contexts(self):
+        """Mark this context's log as used and delete all but the MAX_CONTEXTS most recently used logs"""
+        current, stale = [], []
+        try:
+            if os.path.exists(self.path):
+                os.utime(self.path)
+            for name in os.listdir(self.index_dir):
+                path = os.path.join(self.index_dir, name)
+                if name.startswith('jds-') and name.endswith('.log') and path != self.path:
+                    # Logs of other index versions can never be read again
+                    logs = current if name.startswith(f"jds-v{INDEX_VERSION}-") else stale
+                    logs.append((os.stat(path).st_mtime_ns, path))
+        except OSError:
+            return
+        
+        stale += sorted(current, reverse=True)[MAX_CONTEXTS - 1:]
+        for _, path in stale:
+            for stale_path in (path, f"{path}.lock"):
+                try:
+                    os.unlink(stale_path)
+                except OSError:
+                    pass
+
+def _band_key(packed: bytes, band: int) -> bytes:
+    return packed[band * ROWS * 4:(band + 1) * ROWS * 4]
+
+def _pack(signature: List[int]) -> bytes:
+    return struct.pack(f'<{NUM_PERM}I', *signature)
+
+def _record(key: str, packed: bytes, pdf_key: str, analysis_json: str) -> str:
+    return f"{key}\t{base64.b64encode(packed).decode('ascii')}\t{pdf_key}\t{analysis_json}\n"
+
+def _unpack(packed: bytes) -> List[int]:
+    return list(struct.unpack(f'<{NUM_PERM}I', packed))
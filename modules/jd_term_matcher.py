@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+JD Term Matcher
+Single-pass multi-pattern scanner for the v1JSON job description term vocabulary
+"""
+
+import re
+from collections import namedtuple
+from typing import Dict, List
+
+# v1JSON Step 1 vocabulary: "parse JD for must-have skills/tools, customer segment,
+# delivery modes, lifecycle moments, success metrics, cross-functional partners,
+# analytics stack, platform nouns".
+#
+# Each category is a list of alternation groups. A group behaves exactly like one
+# r'\b(?:term|term|...)\b' pattern run through re.findall(..., re.IGNORECASE):
+# earlier terms win at the same position and matches never overlap within a group.
+# Groups of the same category may overlap each other, as separate findall calls do.
+JD_TERM_CATEGORIES = [
+    ('must_have_skills', [
+        ['Salesforce', 'PowerBI', 'Excel', 'Smartsheet', 'Python', 'JavaScript', 'SQL', 'API', 'CRM',
+         'HubSpot', 'Zendesk', 'Intercom', 'Notion'],
+        ['automation', 'analytics', 'data analysis', 'troubleshooting', 'onboarding', 'retention',
+         'expansion', 'adoption'],
+        ['enrollment', 'planning', 'implementation', 'optimization', 'integration', 'migration'],
+    ]),
+    # Customer segments, in the order segment_indicators is built
+    ('benefits', [
+        ['voluntary benefits', 'benefits', 'employee benefits', 'critical illness', 'accident insurance',
+         'hospital indemnity', 'legal plans', 'pet insurance', 'financial wellness', 'BenefitsTech',
+         'carriers', 'enrollment planning', 'rate design', 'plan design'],
+    ]),
+    ('saas', [
+        ['SaaS', 'Fortune 500', 'mid-market', 'enterprise', 'productivity tools', 'software', 'platform',
+         'product adoption', 'user onboarding', 'feature adoption', 'churn reduction'],
+    ]),
+    ('revenue', [
+        ['high-ticket', 'revenue', 'sales', 'pipeline', 'deal sizes', 'quota', 'commission', 'closing',
+         'prospecting', 'lead generation'],
+    ]),
+    ('operations', [
+        ['operations', 'process improvement', 'efficiency', 'scaling', 'workflow', 'automation', 'systems'],
+    ]),
+    ('cross_functional', [
+        ['Client Executives', 'carrier contacts', 'carriers', 'legal departments', 'legal'],
+        ['Sales', 'Product', 'Engineering', 'Account Management', 'Customer Education', 'support teams'],
+        ['Marketing', 'Finance', 'Operations', 'Implementation', 'Onboarding', 'Training'],
+    ]),
+    ('success_metrics', [
+        ['enrollment planning', 'rate design', 'plan design', 'adoption', 'retention', 'expansion'],
+        ['renewals', 'churn', 'contraction', 'utilization', 'growth', 'satisfaction', 'NPS'],
+        ['conversion', 'close rate', 'pipeline velocity', 'revenue growth', 'customer lifetime value'],
+    ]),
+    ('platform_nouns', [
+        ['Salesforce', 'Smartsheet', 'PowerBI', 'Microsoft Office', 'Notion', 'Intercom', 'Zendesk', 'HubSpot'],
+        ['Slack', 'Asana', 'Jira', 'Confluence', 'Tableau', 'Google Analytics', 'Marketo', 'Pardot'],
+    ]),
+]
+
+SEGMENT_CATEGORIES = ['benefits', 'saas', 'revenue', 'operations']
+
+JDTermHit = namedtuple('JDTermHit', ['category', 'term', 'start', 'end'])
+
+_WORD_RE = re.compile(r'\w+')
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+# Non-ASCII characters that re.IGNORECASE folds onto ASCII letters (İ, ı, ſ, Kelvin sign)
+_IGNORECASE_SPECIALS = re.compile('[\u0130\u0131\u017f\u212a]')
+
+class JDTermMatcher:
+    """
+    Precompiled term automaton over the whole JD vocabulary
+    
+    The JD is tokenized once; every word start is looked up in a first-word
+    index, and each candidate term is verified in place. Per-group findall
+    semantics are then replayed over the position-ordered hits, so results
+    are identical to running one re.findall per group.
+    """
+    
+    def __init__(self, categories=JD_TERM_CATEGORIES):
+        self.categories = categories
+        self._groups = []        # (category, [term, ...]) in findall order
+        self._first_word = {}    # first word -> [(term_lower, [(group_index, alt_index), ...])]
+        self._group_regexes = [] # precompiled fallback for texts with special case folds
+        
+        term_slots = {}
+        for category, groups in categories:
+            for terms in groups:
+                group_index = len(self._groups)
+                self._groups.append((category, terms))
+                self._group_regexes.append(re.compile(
+                    r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\b', re.IGNORECASE))
+                for alt_index, term in enumerate(terms):
+                    term_slots.setdefault(term.lower(), []).append((group_index, alt_index))
+        
+        for term_lower, slots in term_slots.items():
+            first_word = _WORD_RE.match(term_lower).group(0)
+            self._first_word.setdefault(first_word, []).append((term_lower, slots))
+    
+    def scan(self, jd_text: str) -> List[JDTermHit]:
+        """
+        Find every vocabulary hit in the JD
+        
+        Args:
+            jd_text: Job description text
+        
+        Returns:
+            List of JDTermHit(category, term, start, end), grouped by category and
+            pattern group in the same order re.findall would produce them
+        """
+        if not jd_text:
+            return []
+        
+        if _IGNORECASE_SPECIALS.search(jd_text):
+            return self._scan_with_regex(jd_text)
+        
+        lowered = jd_text.translate(_ASCII_LOWER)
+        length = len(lowered)
+        
+        # Candidate matches per group: start -> (alt_index, end)
+        candidates = [{} for _ in self._groups]
+        for token in _WORD_RE.finditer(lowered):
+            entries = self._first_word.get(token.group(0))
+            if not entries:
+                continue
+            start = token.start()
+            for term_lower, slots in entries:
+                end = start + len(term_lower)
+                if not lowered.startswith(term_lower, start):
+                    continue
+                if end < length and (lowered[end].isalnum() or lowered[end] == '_'):
+                    continue
+                for group_index, alt_index in slots:
+                    best = candidates[group_index].get(start)
+                    if best is None or alt_index < best[0]:
+                        candidates[group_index][start] = (alt_index, end)
+        
+        hits = []
+        for (category, _), group_candidates in zip(self._groups, candidates):
+            last_end = 0
+            for start in sorted(group_candidates):
+                if start < last_end:
+                    continue
+                end = group_candidates[start][1]
+                hits.append(JDTermHit(category, jd_text[start:end], start, end))
+                last_end = end
+        
+        return hits
+    
+    def _scan_with_regex(self, jd_text: str) -> List[JDTermHit]:
+        """Per-group regex scan, used when the JD contains characters with special case folding"""
+        hits = []
+        for (category, _), regex in zip(self._groups, self._group_regexes):
+            for match in regex.finditer(jd_text):
+                hits.append(JDTermHit(category, match.group(0), match.start(), match.end()))
+        return hits
+    
+    def extract(self, jd_text: str) -> Dict[str, List[str]]:
+        """
+        Collect matched terms per category
+        
+        Args:
+            jd_text: Job description text
+        
+        Returns:
+            Dict mapping every category name to its matched terms (original casing,
+            duplicates and findall order preserved)
+        """
+        terms = {category: [] for category, _ in self.categories}
+        for hit in self.scan(jd_text):
+            terms[hit.category].append(hit.term)
+        return terms
+
+_default_matcher = None
+
+def get_jd_term_matcher() -> JDTermMatcher:
+    """Return the process-wide matcher, building it on first use"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = JDTermMatcher()
+    return _default_matcher
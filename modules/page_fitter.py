@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Single Page Fitter
+Fits resume content to one page by measuring WeasyPrint layouts instead of estimating length
+"""
+
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from stage_timing import traced
+import events
+
+# Achievement caps are searched between these bounds; font scales are tried in order
+MIN_ACHIEVEMENT_CAP = 2
+FONT_SCALES = [1.0, 0.95, 0.9]
+
+# Mixed into PDF cache keys for fitted renders, so they never collide with heuristic-trimmed ones
+FIT_CACHE_TAG = "layout-fit-v1"
+
+@dataclass
+class FitResult:
+    """Outcome of fitting content to a single page"""
+    content: any              # StructuredContent that was laid out
+    html: str
+    document: any             # weasyprint.Document, ready for write_pdf
+    pages: int
+    fill_ratio: Optional[float]  # Lowest line bottom / page height on the last page
+    achievement_cap: int
+    font_scale: float
+    layouts: int              # Layout passes run while searching
+    
+    @property
+    def fits(self) -> bool:
+        return self.pages == 1 and (self.fill_ratio is None or self.fill_ratio <= 1.0)
+
+def measure_document(document) -> Tuple[int, Optional[float]]:
+    """
+    Read page count and vertical fill from a laid-out Document
+    
+    Fill is measured from line boxes rather than block boxes because the
+    resume container is sized to the full page height regardless of content.
+    
+    Args:
+        document: weasyprint.Document
+    
+    Returns:
+        tuple: (page count, fill ratio of the last page or None if unavailable)
+    """
+    pages = document.pages
+    if not pages:
+        return 0, None
+    
+    last_page = pages[-1]
+    try:
+        from weasyprint.formatting_structure import boxes
+        bottom = 0.0
+        for box in last_page._page_box.descendants():
+            if isinstance(box, boxes.LineBox):
+                bottom = max(bottom, box.position_y + box.height)
+    except (ImportError, AttributeError):
+        # Box tree layout is internal to WeasyPrint; fall back to page count only
+        return len(pages), None
+    
+    return len(pages), bottom / last_page.height if last_page.height else None
+
+class SinglePageFitter:
+    """
+    Picks the largest achievement cap and font scale whose real layout fits one page
+    
+    Each probe renders the template and runs WeasyPrint's layout pass once; the
+    winning probe's Document is written directly, so the PDF is never laid out twice.
+    """
+    
+    def __init__(self, pdf_generator, render_html: Callable[[any], str], base_url: Optional[str] = None):
+        """
+        Initialize fitter
+        
+        Args:
+            pdf_generator: HTMLPDFGenerator used for layout
+            render_html: Renders StructuredContent to template HTML
+            base_url: Base for resolving relative URLs in the HTML
+        """
+        self.pdf_generator = pdf_generator
+        self.render_html = render_html
+        self.base_url = base_url
+    
+    @traced("page_fit")
+    def fit(self, content, first_html: Optional[str] = None, font_scales: Optional[List[float]] = None,
+            min_cap: int = MIN_ACHIEVEMENT_CAP) -> FitResult:
+        """
+        Fit content to a single page
+        
+        The untrimmed content is laid out first; most resumes fit and need no
+        further passes. Otherwise the achievement cap is binary-searched at each
+        font scale in turn, keeping the largest font that fits any cap.
+        
+        Args:
+            content: StructuredContent with achievements already ranked per job
+            first_html: Already rendered HTML for the untrimmed content, if any
+            font_scales: Font scales to try, largest first (default: FONT_SCALES);
+                         a single scale pins it
+            min_cap: Smallest achievement cap to search; pass the content's own
+                     cap to pin it
+        
+        Returns:
+            FitResult for the chosen layout
+        """
+        font_scales = font_scales or FONT_SCALES
+        max_cap = max((len(exp.get('achievements', [])) for exp in content.experiences), default=0)
+        min_cap = min(min_cap, max_cap)
+        probes: Dict[Tuple[int, float, bool], FitResult] = {}
+        
+        def probe(cap: int, scale: float, trim_development: bool = False) -> FitResult:
+            key = (cap, scale, trim_development)
+            if key not in probes:
+                trial = self._apply_limits(content, cap, scale, trim_development)
+                html = first_html if (cap >= max_cap and scale == content.font_scale_factor
+                                      and not trim_development and first_html) else self.render_html(trial)
+                document = self.pdf_generator.render_document(html, self.base_url)
+                pages, fill_ratio = measure_document(document)
+                probes[key] = FitResult(trial, html, document, pages, fill_ratio, cap, scale, 0)
+                if events.enabled(events.DEBUG):
+                    events.debug("fit.probe", "{achievement_cap} achievements/job at {font_scale}x: "
+                                 "{pages} page(s), fill {fill}", achievement_cap=cap, font_scale=scale,
+                                 pages=pages, fill_ratio=fill_ratio,
+                                 fill=f"{fill_ratio:.0%}" if fill_ratio is not None else "n/a")
+            return probes[key]
+        
+        def finish(result: FitResult) -> FitResult:
+            result.layouts = len(probes)
+            events.info("fit.done", "Using {achievement_cap} achievements/job at {font_scale}x "
+                        "after {layouts} layout pass(es)", achievement_cap=result.achievement_cap,
+                        font_scale=result.font_scale, layouts=result.layouts, pages=result.pages)
+            return result
+        
+        result = probe(max_cap, font_scales[0])
+        if result.fits:
+            return finish(result)
+        
+        for scale in font_scales:
+            low, high = min_cap, max_cap
+            best = None
+            while low <= high:
+                cap = (low + high) // 2
+                if probe(cap, scale).fits:
+                    best = cap
+                    low = cap + 1
+                else:
+                    high = cap - 1
+            if best is not None:
+                return finish(probe(best, scale))
+        
+        # Nothing fits: same final trim as the heuristic, at the smallest font
+        events.info("fit.final_trim", "Final trim: {achievement_cap} achievements + reduced professional development",
+                    achievement_cap=min_cap)
+        return finish(probe(min_cap, font_scales[-1], trim_development=True))
+    
+    def _apply_limits(self, content, cap: int, scale: float, trim_development: bool):
+        """Copy content with achievements capped per job and the given font scale"""
+        experiences = []
+        for exp in content.experiences:
+            trimmed_exp = exp.copy()
+            trimmed_exp['achievements'] = exp.get('achievements', [])[:cap]
+            experiences.append(trimmed_exp)
+        
+        professional_development = content.professional_development
+        if trim_development:
+            professional_development = professional_development[:3]
+        
+        return replace(content, experiences=experiences, font_scale_factor=scale,
+                       professional_development=professional_development)
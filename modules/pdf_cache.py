@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+PDF Output Cache
+Content-addressed cache of rendered resume PDFs with size-bounded LRU eviction
+"""
+
+import os
+import hashlib
+from typing import Optional
+
+from cache_paths import get_cache_dir
+import events
+
+DEFAULT_MAX_MB = 256
+
+# Eviction trims the cache to this share of its cap, so a full cache is not rescanned on every store
+EVICT_TO = 0.9
+
+class PDFCache:
+    """
+    Stores rendered PDFs under the hash of everything that determines their bytes
+    
+    Entries are plain files named <key>.pdf; a hit refreshes the entry's mtime,
+    and eviction removes the least recently used entries until the cache fits
+    under its size cap. The directory size is counted once and then kept as a
+    running total of this process's stores, so it is only listed again when
+    the total passes the cap. Stores by other processes sharing the directory
+    (batch workers) are picked up at that rescan, which makes the cap soft
+    while several of them write.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize PDF cache
+        
+        Args:
+            cache_dir: Cache directory (default: .cache/pdf)
+            max_bytes: Size cap (default: RESUME_PDF_CACHE_MB env var or 256 MB;
+                       0 disables the cache)
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('RESUME_PDF_CACHE_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        
+        self.max_bytes = max_bytes
+        self.cache_dir = (cache_dir or get_cache_dir('pdf')) if max_bytes > 0 else None
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._photo_digests = {}
+        self._size = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores and serves entries"""
+        return self.max_bytes > 0
+    
+    def make_key(self, html_content: str, stylesheet: str = "", photo_path: Optional[str] = None) -> str:
+        """
+        Build the cache key for a render
+        
+        The rendered HTML already encodes the JD analysis, the source resume
+        content and the template, so together with the PDF stylesheet and the
+        photo bytes it fully determines the output.
+        
+        Args:
+            html_content: Rendered resume HTML
+            stylesheet: Extra CSS applied by the PDF renderer
+            photo_path: Photo referenced by the HTML, if any
+        
+        Returns:
+            str: Hex digest identifying the render
+        """
+        digest = hashlib.sha256()
+        digest.update(html_content.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(stylesheet.encode('utf-8'))
+        digest.update(b'\0')
+        if photo_path:
+            digest.update(self._photo_digest(photo_path).encode('ascii'))
+        return digest.hexdigest()
+    
+    def _photo_digest(self, photo_path: str) -> str:
+        """Hash photo contents, memoized on path, size and mtime"""
+        try:
+            stat = os.stat(photo_path)
+        except OSError:
+            return "missing"
+        
+        memo_key = (photo_path, stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._photo_digests:
+            with open(photo_path, 'rb') as f:
+                self._photo_digests[memo_key] = hashlib.sha256(f.read()).hexdigest()
+        return self._photo_digests[memo_key]
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+    
+    def get_bytes(self, key: str, probe: bool = False) -> Optional[bytes]:
+        """
+        Return cached PDF bytes, or None on a miss
+        
+        Args:
+            key: Cache key from make_key
+            probe: Speculative lookup ahead of the render's own one (e.g. the
+                   PDF of a near-duplicate JD); a miss is not counted in stats,
+                   so every render counts one lookup
+        
+        Returns:
+            bytes or None
+        """
+        if not self.enabled:
+            return None
+        
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                data = f.read()
+            os.utime(entry_path)
+        except OSError:
+            if not probe:
+                self.stats["misses"] += 1
+            return None
+        
+        self.stats["hits"] += 1
+        return data
+    
+    def put_bytes(self, key: str, data: bytes):
+        """Store rendered PDF bytes under key and evict down to the size cap"""
+        if not self.enabled:
+            return
+        
+        if self._size is None:
+            self._scan()
+        
+        entry_path = self._entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            replaced = os.path.getsize(entry_path)
+        except OSError:
+            replaced = 0
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            events.warning("cache.store_failed", "Could not store rendered PDF: {error}", error=str(e))
+            return
+        
+        self.stats["stores"] += 1
+        self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+    
+    def _scan(self) -> list:
+        """List cache entries as (mtime, size, path) and reset the running size total"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        self._size = total
+        return entries
+        
+    def _evict(self):
+        """Remove least recently used entries until the cache is back under EVICT_TO of max_bytes"""
+        entries = self._scan()
+        if self._size <= self.max_bytes:
+            return
+        
+        target = self.max_bytes * EVICT_TO
+        entries.sort()
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                os.unlink(path)
+                self._size -= size
+                self.stats["evictions"] += 1
+            except OSError:
+                pass
+    
\ No newline at end of file
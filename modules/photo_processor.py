@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Photo Processor
+One-time crop, downsample and recompress of the profile photo to its printed size
+"""
+
+import os
+import importlib.util
+from typing import Optional
+
+# Pillow is only imported when a photo actually has to be processed; cached photos
+# are served without it
+PILLOW_AVAILABLE = importlib.util.find_spec('PIL') is not None
+
+from cache_paths import get_cache_dir
+from resume_cache import hash_file
+from stage_timing import traced
+import events
+
+# Rendered size of the square header photo and the resolution it is printed at
+PHOTO_RENDER_SIZE_IN = 1.25
+PRINT_DPI = 300
+JPEG_QUALITY = 85
+
+# Bump when the processing steps change so stale entries are ignored
+PHOTO_PROCESSOR_VERSION = 1
+
+# Source path, size and mtime -> processed path, so repeat renders skip hashing
+_prepared = {}
+
+@traced("photo_prepare")
+def prepare_photo(photo_path: str, size_px: Optional[int] = None, cache_dir: Optional[str] = None) -> str:
+    """
+    Return a print-sized copy of the photo, creating it on first use
+    
+    The photo is cropped to a square, resized to the rendered size at
+    print DPI and saved as an optimized JPEG under .cache/photos, keyed by the
+    source hash. Falls back to the original file when Pillow is unavailable or
+    processing fails.
+    
+    Args:
+        photo_path: Source photo
+        size_px: Output edge length (default: PHOTO_RENDER_SIZE_IN at PRINT_DPI)
+        cache_dir: Cache directory (default: .cache/photos)
+    
+    Returns:
+        str: Absolute path of the photo to reference from the template
+    """
+    if not PILLOW_AVAILABLE:
+        return photo_path
+    
+    size_px = size_px or round(PHOTO_RENDER_SIZE_IN * PRINT_DPI)
+    
+    try:
+        stat = os.stat(photo_path)
+        memo_key = (photo_path, size_px, stat.st_size, stat.st_mtime_ns)
+        if memo_key in _prepared and os.path.exists(_prepared[memo_key]):
+            return _prepared[memo_key]
+        
+        cache_dir = cache_dir or get_cache_dir('photos')
+        source_hash = hash_file(photo_path)
+        cache_path = os.path.join(
+            cache_dir, f"{source_hash[:16]}-v{PHOTO_PROCESSOR_VERSION}-{size_px}.jpg"
+        )
+        
+        if not os.path.exists(cache_path):
+            _write_print_photo(photo_path, cache_path, size_px)
+            events.info("photo.prepared", "Prepared {size_px}px print photo: {source_kb:.0f} KB -> {prepared_kb:.0f} KB",
+                        size_px=size_px, source_kb=stat.st_size / 1024,
+                        prepared_kb=os.path.getsize(cache_path) / 1024)
+        
+        _prepared[memo_key] = cache_path
+        return cache_path
+    
+    except (OSError, ValueError) as e:
+        events.warning("photo.prepare_failed", "Could not preprocess photo, using original: {error}", error=str(e))
+        return photo_path
+
+def _write_print_photo(photo_path: str, cache_path: str, size_px: int):
+    """Crop, resize and recompress photo_path into cache_path atomically"""
+    from PIL import Image, ImageOps
+    
+    with Image.open(photo_path) as source:
+        image = ImageOps.exif_transpose(source).convert('RGB')
+        # Bias the crop slightly upward to keep the face centered in headshots
+        image = ImageOps.fit(image, (size_px, size_px), Image.LANCZOS, centering=(0.5, 0.4))
+    
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    image.save(temp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True,
+               progressive=True, dpi=(PRINT_DPI, PRINT_DPI))
+    os.replace(temp_path, cache_path)
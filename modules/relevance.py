@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Relevance
+Pluggable achievement and tool scorers, including BM25 ranking over resume corpus statistics
+
+A scorer turns one JD analysis into a score per resume achievement and per
+Technical Skills tool; HTMLContentProcessor then keeps the top-scoring ones.
+"legacy" is the hand-tuned additive scoring (AchievementIndex); "bm25" ranks
+the same items against the JD text with Okapi BM25, using term statistics of
+the source resume and the previous successful resumes.
+"""
+
+import os
+import re
+import math
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from cache_paths import PROJECT_ROOT
+from stage_timing import traced
+
+SCORERS = ('legacy', 'bm25')
+DEFAULT_SCORER = 'legacy'
+
+# Corpus the BM25 document frequencies and average length come from, one document per line
+CORPUS_FILES = ('cetola_resume.md', 'Previous_Successful_Resumes.md')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_K3 = 8.0           # query term frequency saturation: JDs repeat their key terms
+
+# Achievement points per unit of BM25 score, added to the legacy JD-independent priors. Calibrated on
+# benchmarks/scorer_benchmark.py's JDs so as many (JD, achievement) pairs gain 50+ points as with the
+# legacy JD-term matches; BM25 spreads small scores over most achievements, hence higher cutoffs
+BM25_POINTS = 1.0
+BM25_SELECTION_THRESHOLDS = (60, 40)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.+#][a-z0-9]+)*")
+MARKDOWN_RE = re.compile(r"\*\*|\\|^[\s*#>-]+")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to
+we will with you your who what us all any can may must per via than then they them
+""".split())
+
+# Indexes kept per process, one per scorer and distinct resume
+MAX_SCORERS = 8
+
+_scorers = {}
+_corpus_stats = {}
+
+def scorer_name() -> str:
+    """The configured scorer: RESUME_SCORER, or legacy"""
+    name = os.environ.get('RESUME_SCORER', DEFAULT_SCORER)
+    return name if name in SCORERS else DEFAULT_SCORER
+
+def get_scorer(jobs: List[Dict[str, any]], tools: List[str], name: Optional[str] = None) -> 'AchievementScorer':
+    """
+    Return the scorer for ParsedResume.jobs and .tools, building it once per process
+    
+    Args:
+        jobs: Parsed jobs with their achievement texts
+        tools: Technical Skills entries
+        name: One of SCORERS (default: scorer_name())
+    
+    Returns:
+        AchievementScorer shared by every JD tailored against this resume
+    """
+    name = name or scorer_name()
+    if name == 'bm25':
+        scorer_class = BM25Scorer
+    else:
+        from achievement_index import AchievementIndex
+        scorer_class = AchievementIndex
+    
+    key = (name, tuple(achievement for job in jobs for achievement in job['achievements']), tuple(tools))
+    scorer = _scorers.get(key)
+    if scorer is None:
+        if len(_scorers) >= MAX_SCORERS:
+            _scorers.clear()
+        scorer = _scorers[key] = scorer_class(list(key[1]), tools)
+    return scorer
+
+class AchievementScorer(ABC):
+    """
+    Interface every achievement and tool scorer implements
+    
+    HTMLContentProcessor keeps 4-6 bullets of jobs with 6+ achievements
+    depending on how many reach selection_thresholds[0], and 3-5 of jobs with
+    4-5 depending on selection_thresholds[1]; each scorer sets the cutoffs
+    for its own score scale. Tools scoring above zero count as JD-relevant.
+    """
+    
+    name = None
+    selection_thresholds = (50, 30)
+    
+    def __init__(self, achievements: List[str], tools: List[str]):
+        self.achievements = list(dict.fromkeys(achievements))
+        self.tools = list(tools)
+    
+    @abstractmethod
+    def scores(self, jd_analysis: Optional[Dict]) -> List[float]:
+        """Score every achievement against one JD, in self.achievements order"""
+    
+    def score_map(self, jd_analysis: Optional[Dict]) -> Dict[str, float]:
+        """
+        Score one JD as an {achievement: score} dict
+        
+        The dict can be passed as achievement_scores to
+        HTMLContentProcessor.process_parsed_resume.
+        """
+        return dict(zip(self.achievements, self.scores(jd_analysis)))
+    
+    def score_batch(self, jd_analyses: List[Optional[Dict]]) -> List[List[float]]:
+        """
+        Score every achievement against a window of JDs
+        
+        Scorers that can score a whole window in one matrix product override
+        this; by default each JD is scored in turn. Rows equal scores().
+        
+        Args:
+            jd_analyses: One HTMLContentProcessor.jd_analysis per JD
+        
+        Returns:
+            list: One row of achievement scores per JD, in self.achievements order
+        """
+        return [self.scores(jd_analysis) for jd_analysis in jd_analyses]
+    
+    def score_maps(self, jd_analyses: List[Optional[Dict]]) -> List[Dict[str, float]]:
+        """Score a window of JDs as one {achievement: score} dict per JD, as score_map does for one"""
+        return [dict(zip(self.achievements, row)) for row in self.score_batch(jd_analyses)]
+    
+    @abstractmethod
+    def tool_scores(self, jd_analysis: Dict) -> List[float]:
+        """Score every tool against a JD analysis with a primary focus, in self.tools order"""
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Strip common English inflections, so "automated", "automates" and "automating" share a term"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    for suffix in ('ing', 'ed', 'es', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith('ss'):
+            return word[:-len(suffix)]
+    return word
+
+def terms(text: str) -> List[str]:
+    """Stemmed, stopword-free terms of a text"""
+    return [stem(token) for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+@lru_cache(maxsize=65536)
+def _chunk_terms(chunk: str) -> tuple:
+    """terms() of one whitespace-free chunk of lowercased text"""
+    return tuple(stem(token) for token in TOKEN_RE.findall(chunk) if token not in STOPWORDS)
+
+def term_counts(text: str) -> Counter:
+    """
+    Counter of terms(text)
+    
+    TOKEN_RE never matches whitespace, so the text is split and counted by
+    str.split and Counter, and only each distinct chunk goes through the
+    regex and stemmer, once per process since JDs share most of their words.
+    """
+    counts = {}
+    for chunk, count in Counter(text.lower().split()).items():
+        for term in _chunk_terms(chunk):
+            counts[term] = counts.get(term, 0) + count
+    return Counter(counts)
+
+class CorpusStats:
+    """Document frequencies and average document length of the BM25 corpus"""
+    
+    def __init__(self, documents: List[str]):
+        """
+        Count the corpus
+        
+        Args:
+            documents: Corpus documents, e.g. the lines of the resume markdown files
+        """
+        self.document_count = 0
+        self.document_frequency = Counter()
+        total_length = 0
+        for document in documents:
+            document_terms = terms(document)
+            if not document_terms:
+                continue
+            self.document_count += 1
+            total_length += len(document_terms)
+            self.document_frequency.update(set(document_terms))
+        self.average_length = total_length / self.document_count if self.document_count else 1.0
+    
+    @classmethod
+    def for_files(cls, paths: tuple = CORPUS_FILES) -> 'CorpusStats':
+        """Statistics of the given markdown files (relative to the project), counted once per process"""
+        stats = _corpus_stats.get(paths)
+        if stats is None:
+            documents = []
+            for path in paths:
+                try:
+                    with open(os.path.join(PROJECT_ROOT, path), 'r', encoding='utf-8') as f:
+                        documents.extend(MARKDOWN_RE.sub(' ', line) for line in f)
+                except OSError:
+                    continue
+            stats = _corpus_stats[paths] = cls(documents)
+        return stats
+    
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency, floored at zero by the + 1 inside the log"""
+        frequency = self.document_frequency.get(term, 0)
+        return math.log(1 + (self.document_count - frequency + 0.5) / (frequency + 0.5))
+
+class BM25Scorer(AchievementScorer):
+    """
+    Okapi BM25 ranking of achievements and tools against the JD text
+    
+    Each achievement and each tool is a document. Their per-term BM25 weights
+    (IDF times saturated, length-normalized term frequency) depend only on
+    the resume and the corpus, so they are stored as postings when the scorer
+    is built. A JD is scored term at a time: each distinct JD term adds its
+    query-weighted postings to the accumulators of the documents containing
+    it, so the cost grows with the JD rather than with the resume.
+    
+    BM25 only measures JD relevance, so scores add BM25_POINTS per unit of
+    BM25 score to the legacy JD-independent priors (metric results,
+    leadership, tool mentions, detail and focus patterns). Points are
+    absolute rather than relative to the JD's best match, so how many bullets
+    reach the selection thresholds does not depend on one JD's maximum.
+    Without a JD there is no query, and the priors alone are the legacy
+    no-JD scores.
+    """
+    
+    name = 'bm25'
+    selection_thresholds = BM25_SELECTION_THRESHOLDS
+    
+    def __init__(self, achievements: List[str], tools: List[str], stats: Optional[CorpusStats] = None):
+        """
+        Build the postings
+        
+        Args:
+            achievements: Achievement texts, usually every bullet of the parsed resume
+            tools: Technical Skills entries, in resume order
+            stats: Corpus statistics (default: CORPUS_FILES)
+        """
+        from achievement_index import achievement_priors, tool_priors
+        
+        super().__init__(achievements, tools)
+        self.stats = stats or CorpusStats.for_files()
+        self._postings = self._build_postings(self.achievements)
+        self._tool_postings = self._build_postings(self.tools)
+        self._priors = achievement_priors(self.achievements)
+        self._tool_priors = tool_priors(self.tools)
+        self._last_query = (None, Counter())
+    
+    def _build_postings(self, documents: List[str]) -> Dict[str, list]:
+        """term -> [(document ID, BM25 term weight)]"""
+        postings = {}
+        for document_id, document in enumerate(documents):
+            counts = term_counts(document)
+            length = sum(counts.values())
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.stats.average_length)
+            for term, frequency in counts.items():
+                weight = self.stats.idf(term) * frequency * (BM25_K1 + 1) / (frequency + norm)
+                postings.setdefault(term, []).append((document_id, weight))
+        return postings
+    
+    def _query(self, jd_analysis: Dict) -> Counter:
+        """JD term frequencies, kept for the tool_scores call that follows scores"""
+        jd_text = jd_analysis.get('raw_jd_text') or ''
+        if self._last_query[0] != jd_text:
+            self._last_query = (jd_text, term_counts(jd_text))
+        return self._last_query[1]
+    
+    @staticmethod
+    def _accumulate(postings: Dict[str, list], query: Counter, count: int) -> List[float]:
+        scores = [0.0] * count
+        for term, frequency in query.items():
+            documents = postings.get(term)
+            if documents is None:
+                continue
+            query_weight = (BM25_K3 + 1) * frequency / (BM25_K3 + frequency)
+            for document_id, weight in documents:
+                scores[document_id] += query_weight * weight
+        return scores
+    
+    @traced("score_achievements_bm25")
+    def scores(self, jd_analysis: Optional[Dict]) -> List[float]:
+        """
+        Score every achievement against one JD
+        
+        Args:
+            jd_analysis: HTMLContentProcessor.jd_analysis, or None for the no-JD scoring
+        
+        Returns:
+            list: Priors plus BM25 points in self.achievements order
+        """
+        from achievement_index import FOCUSED_SEGMENTS
+        
+        if not jd_analysis or 'primary_focus' not in jd_analysis:
+            return list(self._priors[None])
+        
+        primary_segment = jd_analysis['primary_focus'].get('primary')
+        priors = self._priors[primary_segment if primary_segment in FOCUSED_SEGMENTS else 'operations']
+        relevance = self._accumulate(self._postings, self._query(jd_analysis), len(self.achievements))
+        return [prior + round(BM25_POINTS * score, 2) for prior, score in zip(priors, relevance)]
+    
+    def tool_scores(self, jd_analysis: Dict) -> List[float]:
+        """
+        Score every tool against one JD
+        
+        Args:
+            jd_analysis: HTMLContentProcessor.jd_analysis with a primary focus
+        
+        Returns:
+            list: Legacy tool priors plus BM25 scores in self.tools order
+        """
+        priors = self._tool_priors.get(jd_analysis['primary_focus'].get('primary'), self._tool_priors[None])
+        relevance = self._accumulate(self._tool_postings, self._query(jd_analysis), len(self.tools))
+        return [prior + round(score, 2) for prior, score in zip(priors, relevance)]
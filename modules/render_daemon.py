@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Render Daemon
+Long-lived localhost HTTP service that keeps the resume pipeline warm between requests
+"""
+
+import os
+import hmac
+import json
+import time
+import socket
+import secrets
+from typing import Callable, Optional
+
+from cache_paths import get_cache_dir
+import events
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = int(os.environ.get('RESUME_DAEMON_PORT', '8765'))
+
+# Host and Origin names a request may carry; anything else is a browser on another site or a rebound DNS name
+LOCAL_HOSTNAMES = frozenset(['127.0.0.1', 'localhost', '::1'])
+TOKEN_HEADER = 'X-Render-Token'
+
+def token_path(port: int) -> str:
+    """Path of the file holding the daemon's request token, readable only by its user"""
+    daemon_dir = get_cache_dir('daemon')
+    os.chmod(daemon_dir, 0o700)
+    return os.path.join(daemon_dir, f"token-{port}")
+
+def _write_token(port: int) -> str:
+    """Create a fresh token for this daemon run and store it with 0600 permissions"""
+    token = secrets.token_hex(32)
+    path = token_path(port)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+    return token
+
+def _read_token(port: int) -> Optional[str]:
+    """The running daemon's token, or None when no daemon of this user has written one"""
+    try:
+        with open(token_path(port), 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _hostname(value: str) -> str:
+    """Host name of a Host header or Origin, without scheme, port or IPv6 brackets"""
+    value = value.split('://', 1)[-1].split('/', 1)[0]
+    if value.startswith('['):
+        return value[1:].split(']', 1)[0]
+    return value.rsplit(':', 1)[0] if value.count(':') == 1 else value
+
+class _RenderRequestHandler:
+    """
+    Handles /health, /render and /shutdown requests for the render daemon
+    
+    Mixed into BaseHTTPRequestHandler by serve(), so clients and --help never load http.server.
+    Every request must come from a local Host (and Origin, when a browser sends
+    one) and carry the token from token_path(); POST bodies must be JSON. A web
+    page cannot set the token header or a JSON content type on a cross-origin
+    "simple" request, so it can neither render nor stop the daemon.
+    """
+    
+    server_version = "ResumeRenderDaemon/1.0"
+    
+    def _authorized(self, require_json: bool = False) -> bool:
+        """Check the request's Host, Origin, token and content type, answering 403 when one fails"""
+        origin = self.headers.get('Origin')
+        content_type = (self.headers.get('Content-Type') or '').split(';', 1)[0].strip().lower()
+        if _hostname(self.headers.get('Host', '')) not in LOCAL_HOSTNAMES:
+            reason = "Host is not localhost"
+        elif origin is not None and _hostname(origin) not in LOCAL_HOSTNAMES:
+            reason = "Origin is not localhost"
+        elif not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), self.server.token):
+            reason = "Missing or invalid token"
+        elif require_json and content_type != 'application/json':
+            reason = "Content-Type must be application/json"
+        else:
+            return True
+        self._send_json(403, {"error": reason})
+        return False
+    
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == '/health':
+            self._send_json(200, {"status": "ok", "pid": os.getpid(),
+                                  "renders": self.server.render_count})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+    
+    def do_POST(self):
+        if not self._authorized(require_json=True):
+            return
+        
+        if self.path == '/shutdown':
+            self._send_json(200, {"status": "stopping"})
+            self.server.should_stop = True
+            return
+        
+        if self.path == '/render.pdf':
+            self._render_bytes()
+            return
+        
+        if self.path != '/render':
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            jd_text = payload['jd_text']
+            output_filename = payload['output']
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": f"Invalid render request: {e}"})
+            return
+        if not self._settings_match(payload):
+            return
+        
+        # The PDF may only land inside the daemon's output directory
+        output_path = os.path.realpath(str(output_filename))
+        if not output_path.endswith('.pdf') or \
+                os.path.commonpath([output_path, self.server.output_dir]) != self.server.output_dir:
+            self._send_json(403, {"error": f"Output must be a .pdf inside {self.server.output_dir}"})
+            return
+        
+        started = time.perf_counter()
+        try:
+            output = self.server.render_func(jd_text, output_path)
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        
+        self.server.render_count += 1
+        self._send_json(200, {"output": output,
+                              "seconds": round(time.perf_counter() - started, 4)})
+    
+    def _render_bytes(self):
+        """Render a JD and answer with the PDF itself instead of writing it to disk"""
+        if not self.server.render_bytes_func:
+            self._send_json(404, {"error": "This daemon does not serve PDF bytes"})
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            jd_text = payload['jd_text']
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"error": f"Invalid render request: {e}"})
+            return
+        if not self._settings_match(payload):
+            return
+        
+        started = time.perf_counter()
+        try:
+            pdf_bytes = self.server.render_bytes_func(jd_text)
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        
+        self.server.render_count += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(pdf_bytes)))
+        self.send_header('X-Render-Seconds', f"{time.perf_counter() - started:.4f}")
+        self.end_headers()
+        self.wfile.write(pdf_bytes)
+    
+    def _settings_match(self, payload: dict) -> bool:
+        """Check that the client runs with the daemon's settings, answering 409 when it does not"""
+        settings = payload.get('settings') or {}
+        differing = sorted(name for name in set(settings) | set(self.server.settings)
+                           if settings.get(name) != self.server.settings.get(name))
+        if differing:
+            self._send_json(409, {"error": f"Daemon runs with different {', '.join(differing)}"})
+            return False
+        return True
+    
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        """Silence per-request access logging"""
+        pass
+
+def serve(render_func: Callable[[str, str], str],
+          host: str = DEFAULT_HOST,
+          port: int = DEFAULT_PORT,
+          warmup: Optional[Callable[[], None]] = None,
+          render_bytes_func: Optional[Callable[[str], bytes]] = None,
+          output_dir: Optional[str] = None,
+          settings: Optional[dict] = None):
+    """
+    Run the render daemon until a /shutdown request or Ctrl+C
+    
+    Requests are handled one at a time in this process, so everything the
+    warmup callable loads (WeasyPrint, fonts, compiled template, parsed
+    resume) stays resident and is reused by every render. A new token is
+    written to token_path(port) for each run and removed on exit; only
+    clients that can read it are served.
+    
+    Args:
+        render_func: Callable taking (jd_text, output_filename) and returning the output path
+        host: Interface to bind (localhost only by default)
+        port: TCP port to listen on
+        warmup: Optional callable run once before accepting requests
+        render_bytes_func: Optional callable taking jd_text and returning PDF
+                           bytes, served from /render.pdf
+        output_dir: The only directory /render writes PDFs to (default: the current directory)
+        settings: Options the renders depend on; a client sending different
+                  ones is declined and renders in-process
+    """
+    if warmup:
+        started = time.perf_counter()
+        warmup()
+        events.info("daemon.warmed", "Warmed up in {seconds:.2f}s", seconds=time.perf_counter() - started)
+    
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    
+    handler = type('RenderRequestHandler', (_RenderRequestHandler, BaseHTTPRequestHandler), {})
+    server = HTTPServer((host, port), handler)
+    server.render_func = render_func
+    server.render_bytes_func = render_bytes_func
+    server.render_count = 0
+    server.should_stop = False
+    server.output_dir = os.path.realpath(output_dir or os.getcwd())
+    server.settings = settings or {}
+    server.token = _write_token(port)
+    
+    events.info("daemon.listening", "Listening on http://{host}:{port}, writing to {output_dir}",
+                host=host, port=port, output_dir=server.output_dir)
+    try:
+        while not server.should_stop:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if _read_token(port) == server.token:
+            os.unlink(token_path(port))
+        events.info("daemon.stopped", "Stopped", renders=server.render_count)
+
+class RenderClient:
+    """
+    Thin client for the render daemon
+    """
+    
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 120.0,
+                 settings: Optional[dict] = None):
+        """
+        Initialize render client
+        
+        Args:
+            host: Daemon host
+            port: Daemon port
+            timeout: Seconds to wait for a render to finish
+            settings: Options this client would render with, compared with the daemon's (see serve)
+        """
+        self.address = (host, port)
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+        self.port = port
+        self.settings = settings or {}
+    
+    def _request(self, path: str, body: Optional[dict] = None):
+        """Build an authenticated request, or None when no daemon has written a token"""
+        import urllib.request
+        
+        token = _read_token(self.port)
+        if token is None:
+            return None
+        headers = {TOKEN_HEADER: token, 'Content-Type': 'application/json'}
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        return urllib.request.Request(self.base_url + path, data=data, headers=headers)
+    
+    def is_available(self) -> bool:
+        """Check whether a daemon is listening, without waiting long if not"""
+        # The token file and a bare connect settle the usual no-daemon case before paying for urllib
+        if _read_token(self.port) is None:
+            return False
+        try:
+            socket.create_connection(self.address, timeout=0.5).close()
+        except OSError:
+            return False
+        
+        import urllib.request
+        import urllib.error
+        request = self._request('/health')
+        if request is None:
+            return False
+        try:
+            with urllib.request.urlopen(request, timeout=0.5) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+    
+    def render(self, jd_text: str, output_filename: str) -> Optional[str]:
+        """
+        Ask the daemon to generate a resume
+        
+        Args:
+            jd_text: Job description text
+            output_filename: Where to save the PDF (made absolute, since the
+                             daemon may run in a different working directory);
+                             it must be inside the daemon's output directory
+        
+        Returns:
+            Output path reported by the daemon, or None if no daemon is
+            reachable, it declined the request or the render failed
+        """
+        if not self.is_available():
+            return None
+        
+        import urllib.request
+        import urllib.error
+        request = self._request('/render', {"jd_text": jd_text, "output": os.path.abspath(output_filename),
+                                            "settings": self.settings})
+        if request is None:
+            return None
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                result = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            self._report_http_error(e)
+            return None
+        except (urllib.error.URLError, OSError) as e:
+            events.warning("daemon.unreachable", "Daemon unreachable: {error}", error=str(e))
+            return None
+        
+        events.info("daemon.rendered", "Rendered in {seconds:.2f}s: {output}", seconds=result['seconds'],
+                    output=result['output'])
+        return result['output']
+    
+    def render_bytes(self, jd_text: str) -> Optional[bytes]:
+        """
+        Ask the daemon for a resume PDF without it touching the filesystem
+        
+        Args:
+            jd_text: Job description text
+        
+        Returns:
+            PDF bytes, or None if no daemon is reachable or the render failed
+        """
+        if not self.is_available():
+            return None
+        
+        import urllib.request
+        import urllib.error
+        request = self._request('/render.pdf', {"jd_text": jd_text, "settings": self.settings})
+        if request is None:
+            return None
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            self._report_http_error(e)
+            return None
+        except (urllib.error.URLError, OSError) as e:
+            events.warning("daemon.unreachable", "Daemon unreachable: {error}", error=str(e))
+            return None
+    
+    @staticmethod
+    def _report_http_error(error):
+        """Log a daemon error response; a declined request is rendered in-process by the caller"""
+        message = error.read().decode('utf-8', 'replace')
+        if error.code in (403, 409):
+            events.info("daemon.declined", "Daemon declined the request, rendering in-process: {error}",
+                        error=message)
+        else:
+            events.error("daemon.render_failed", "Render failed: {error}", error=message)
+    
+    def shutdown(self) -> bool:
+        """Stop a running daemon"""
+        import urllib.request
+        import urllib.error
+        request = self._request('/shutdown', {})
+        if request is None:
+            return False
+        try:
+            with urllib.request.urlopen(request, timeout=2) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Resume Bundle
+Streams rendered resumes into one zip or tar archive with a manifest, without staging files on disk
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import hashlib
+import tarfile
+import zipfile
+from typing import Dict, Optional
+
+BUNDLE_FORMATS = ('zip', 'tar', 'tgz')
+BUNDLE_EXTENSIONS = {'.zip': 'zip', '.tar': 'tar', '.tar.gz': 'tgz', '.tgz': 'tgz'}
+MANIFEST_NAME = 'manifest.json'
+
+def bundle_format(path: str, format: Optional[str] = None) -> str:
+    """
+    Choose the archive format for a bundle path
+    
+    Args:
+        path: Archive path, or "-" for stdout
+        format: Explicit format, one of BUNDLE_FORMATS
+    
+    Returns:
+        str: The explicit format, else the one the extension implies, else zip
+    """
+    if format:
+        if format not in BUNDLE_FORMATS:
+            raise ValueError(f"Unknown bundle format: {format}")
+        return format
+    for extension, implied in BUNDLE_EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return implied
+    return 'zip'
+
+class ResumeBundle:
+    """
+    Zip or tar archive of rendered resumes, written as a stream
+    
+    Each PDF goes from memory straight into the archive when it is added.
+    manifest.json, with one entry per resume including failures, is written
+    last, so the archive can be sent to a pipe. PDFs are stored uncompressed
+    in zip archives since their content streams are already compressed.
+    """
+    
+    def __init__(self, path: str, format: Optional[str] = None):
+        """
+        Open the archive for writing
+        
+        Args:
+            path: Archive path, or "-" to write to stdout
+            format: One of BUNDLE_FORMATS (default: from the path's extension, else zip)
+        """
+        self.path = path
+        self.format = bundle_format(path, format)
+        self.entries = []
+        self._names = set()
+        self._started = time.time()
+        
+        if path == '-':
+            # The process's stdout even while logging is redirected off it
+            self._file = sys.__stdout__.buffer
+            self._owns_file = False
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(path, 'wb')
+            self._owns_file = True
+        
+        if self.format == 'zip':
+            self._archive = zipfile.ZipFile(self._file, 'w', compression=zipfile.ZIP_STORED)
+        else:
+            # Stream mode ('w|'), so the archive never seeks back
+            self._archive = tarfile.open(fileobj=self._file, mode='w|gz' if self.format == 'tgz' else 'w|')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def add(self, entry: Dict[str, any], pdf_bytes: Optional[bytes] = None) -> Dict[str, any]:
+        """
+        Record a resume in the manifest and write its PDF into the archive
+        
+        Args:
+            entry: Manifest fields for the resume; "output" names its archive
+                   member (default: <id>.pdf) and is replaced by "file"
+            pdf_bytes: PDF data, or None for a failed resume
+        
+        Returns:
+            dict: The manifest entry, with "file", "sha256" and "bytes" when a PDF was written
+        """
+        entry = dict(entry)
+        name = entry.pop('output', None) or f"{entry.get('id', len(self.entries) + 1)}.pdf"
+        entry['file'] = None
+        
+        if pdf_bytes is not None:
+            entry['file'] = self._write(self._unique_name(name), pdf_bytes, compress=False)
+            entry['sha256'] = hashlib.sha256(pdf_bytes).hexdigest()
+            entry['bytes'] = len(pdf_bytes)
+        
+        self.entries.append(entry)
+        return entry
+    
+    def close(self):
+        """Write the manifest and finish the archive"""
+        if self._archive is None:
+            return
+        
+        manifest = {
+            "created": time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self._started)),
+            "seconds": round(time.time() - self._started, 3),
+            "resumes": len(self.entries),
+            "failed": sum(1 for entry in self.entries if entry['file'] is None),
+            "entries": self.entries
+        }
+        self._write(MANIFEST_NAME, json.dumps(manifest, indent=2).encode('utf-8'), compress=True)
+        
+        self._archive.close()
+        self._archive = None
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+    
+    def _unique_name(self, name: str) -> str:
+        """Archive member name for a resume, suffixed when an earlier resume took it"""
+        name = os.path.basename(name.replace('\\', '/')) or 'resume.pdf'
+        stem, extension = os.path.splitext(name)
+        candidate, counter = name, 1
+        while candidate in self._names or candidate == MANIFEST_NAME:
+            counter += 1
+            candidate = f"{stem}-{counter}{extension}"
+        self._names.add(candidate)
+        return candidate
+    
+    def _write(self, name: str, data: bytes, compress: bool) -> str:
+        """Add one member from memory"""
+        if self.format == 'zip':
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            info.external_attr = 0o644 << 16
+            self._archive.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = time.time()
+            info.mode = 0o644
+            self._archive.addfile(info, io.BytesIO(data))
+        return name
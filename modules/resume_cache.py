@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Parsed Resume Cache
+On-disk cache of the JD-independent parse of the source resume, keyed by content hash
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+from cache_paths import get_cache_dir
+import events
+
+# Bump when the parsed layout or the cleaning rules change so stale entries are ignored
+PARSED_RESUME_VERSION = 1
+
+@dataclass
+class ParsedResume:
+    """JD-independent parse of the source resume markdown"""
+    raw_sections: Dict[str, str]
+    jobs: List[Dict[str, any]]  # title, company, dates and cleaned achievement texts
+    tools: List[str]            # Technical Skills entries with markdown removed
+    source_hash: str = ""
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_parsed_resume(md_file_path: str,
+                       parse_func: Callable[[str], ParsedResume],
+                       cache_dir: Optional[str] = None) -> ParsedResume:
+    """
+    Load a parsed resume from cache, parsing and storing it on a miss
+    
+    The cache file is written atomically, so batch workers can read it
+    concurrently while another process refreshes it.
+    
+    Args:
+        md_file_path: Path to markdown resume file
+        parse_func: Parses the markdown into a ParsedResume on a cache miss
+        cache_dir: Cache directory (default: .cache/parsed_resume)
+    
+    Returns:
+        ParsedResume for the current file contents
+    """
+    cache_dir = cache_dir or get_cache_dir('parsed_resume')
+    source_hash = hash_file(md_file_path)
+    stem = os.path.splitext(os.path.basename(md_file_path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}-v{PARSED_RESUME_VERSION}-{source_hash[:16]}.json")
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('source_hash') == source_hash:
+            return ParsedResume(**data)
+    except (OSError, ValueError, TypeError):
+        pass
+    
+    parsed = parse_func(md_file_path)
+    parsed.source_hash = source_hash
+    
+    try:
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(parsed), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, cache_path)
+        
+        # Drop entries for older versions of the same resume
+        for name in os.listdir(cache_dir):
+            if name.startswith(f"{stem}-") and name.endswith('.json') and \
+                    os.path.join(cache_dir, name) != cache_path:
+                os.unlink(os.path.join(cache_dir, name))
+    except OSError as e:
+        events.warning("resume_cache.write_failed", "Could not write parsed resume cache: {error}", error=str(e))
+    
+    return parsed
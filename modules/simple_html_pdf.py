@@ -5,13 +5,13 @@ Alternative PDF generation using browser-based rendering or ReportLab fallback
 """
 
 import os
-import tempfile
-import subprocess
 from pathlib import Path
 from typing import Optional
 import sys
 
-from .html_generator import HTMLResumeGenerator
+# Absolute import so spans land in the same trace context as the other pipeline modules
+from stage_timing import traced
+import events
 
 class SimpleHTMLPDFGenerator:
     """
@@ -19,7 +19,15 @@ class SimpleHTMLPDFGenerator:
     """
     
     def __init__(self):
-        self.html_generator = HTMLResumeGenerator()
+        self._html_generator = None
+    
+    @property
+    def html_generator(self):
+        """Markdown-to-HTML generator, created when a markdown conversion first needs it"""
+        if self._html_generator is None:
+            from html_generator import HTMLResumeGenerator
+            self._html_generator = HTMLResumeGenerator()
+        return self._html_generator
     
     def generate_pdf_from_markdown(self, 
                                  markdown_path: str,
@@ -41,13 +49,14 @@ class SimpleHTMLPDFGenerator:
             bool: Success status
         """
         try:
-            print(f"[PDF] Starting PDF generation from {markdown_path}...")
+            events.debug("pdf.start", "Starting PDF generation from {source}...", source=markdown_path)
             
             # Generate HTML first
             if keep_html and html_output_path:
                 html_path = html_output_path
             else:
                 # Create temporary HTML file
+                import tempfile
                 temp_html = tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8')
                 html_path = temp_html.name
                 temp_html.close()
@@ -58,7 +67,7 @@ class SimpleHTMLPDFGenerator:
             )
             
             if not success:
-                print("[ERROR] Failed to generate HTML resume")
+                events.error("pdf.html_failed", "Failed to generate HTML resume", source=markdown_path)
                 return False
             
             # Try different PDF conversion methods
@@ -66,12 +75,12 @@ class SimpleHTMLPDFGenerator:
             
             # Method 1: Try Chrome/Edge if available
             if self._has_browser():
-                print("[BROWSER] Using browser-based PDF generation...")
+                events.debug("browser.convert", "Using browser-based PDF generation...")
                 pdf_success = self._convert_with_browser(html_path, pdf_output_path)
             
             # Method 2: Fallback to enhanced HTML with print styles
             if not pdf_success:
-                print("[HTML] Using enhanced HTML with print instructions...")
+                events.info("html.fallback", "Using enhanced HTML with print instructions...")
                 pdf_success = self._create_print_html(html_path, pdf_output_path)
             
             # Clean up temporary HTML if not keeping it
@@ -84,49 +93,18 @@ class SimpleHTMLPDFGenerator:
             return pdf_success
             
         except Exception as e:
-            print(f"[ERROR] Error generating PDF from markdown: {e}")
+            events.error("pdf.markdown_failed", "Error generating PDF from markdown: {error}", error=str(e))
             return False
     
     def _has_browser(self) -> bool:
         """Check if Chrome or Edge is available for PDF generation"""
-        browsers = [
-            "chrome", "google-chrome", "chromium",
-            "msedge", "microsoft-edge"
-        ]
-        
-        for browser in browsers:
-            if self._command_exists(browser):
-                return True
-        
-        # Check Windows-specific paths
-        windows_chrome_paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-        ]
-        
-        windows_edge_paths = [
-            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"
-        ]
-        
-        for path in windows_chrome_paths + windows_edge_paths:
-            if os.path.exists(path):
-                return True
-        
-        return False
-    
-    def _command_exists(self, command: str) -> bool:
-        """Check if a command exists in PATH"""
-        try:
-            subprocess.run([command, "--version"], 
-                         capture_output=True, 
-                         timeout=5)
-            return True
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return self._find_browser_command() is not None
     
+    @traced("browser_pdf")
     def _convert_with_browser(self, html_path: str, pdf_output_path: str) -> bool:
         """Convert HTML to PDF using browser's print-to-PDF functionality"""
+        import subprocess
+        
         try:
             # Ensure output directory exists
             output_dir = Path(pdf_output_path).parent
@@ -141,6 +119,10 @@ class SimpleHTMLPDFGenerator:
             html_abs_path = os.path.abspath(html_path)
             pdf_abs_path = os.path.abspath(pdf_output_path)
             
+            # Prefer the persistent Chrome tab pool; launch a browser per file only without it
+            if self._convert_with_chrome_pool(browser_cmd, html_abs_path, pdf_abs_path):
+                return True
+            
             # Browser command for PDF generation with single-page enforcement
             cmd = [
                 browser_cmd,
@@ -169,42 +151,49 @@ class SimpleHTMLPDFGenerator:
             if result.returncode == 0 and os.path.exists(pdf_output_path):
                 file_size = os.path.getsize(pdf_output_path)
                 if file_size > 1000:  # At least 1KB
-                    print(f"[OK] PDF generated via browser: {pdf_output_path}")
-                    print(f"[INFO] PDF size: {file_size / 1024:.1f} KB")
+                    events.info("pdf.generated", "PDF generated via browser: {path} ({size_kb:.1f} KB)",
+                                path=pdf_output_path, size_kb=file_size / 1024, renderer="browser")
                     return True
             
             # Log error if available
             if result.stderr:
-                print(f"Browser error: {result.stderr}")
+                events.warning("browser.failed", "Browser error: {stderr}", returncode=result.returncode,
+                               stderr=result.stderr)
             
             return False
             
         except Exception as e:
-            print(f"Browser PDF conversion error: {e}")
+            events.error("browser.convert_failed", "Browser PDF conversion error: {error}", error=str(e))
             return False
     
-    def _find_browser_command(self) -> Optional[str]:
-        """Find the best available browser command"""
-        # Try common command names first
-        browsers = ["chrome", "google-chrome", "chromium", "msedge"]
+    def _convert_with_chrome_pool(self, browser_cmd: str, html_path: str, pdf_output_path: str) -> bool:
+        """Print HTML to PDF over DevTools with a long-lived Chrome"""
+        from chrome_devtools import get_chrome_pool, ChromeDevToolsError
         
-        for browser in browsers:
-            if self._command_exists(browser):
-                return browser
+        pool = get_chrome_pool(browser_cmd)
+        if not pool:
+            return False
         
-        # Try Windows-specific paths
-        windows_paths = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"
-        ]
+        try:
+            with open(html_path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            pdf_bytes = pool.render_pdf(html_content, base_dir=os.path.dirname(html_path))
+        except ChromeDevToolsError as e:
+            events.info("chrome.render_failed", "Persistent Chrome render failed ({error}), launching browser directly...",
+                        error=str(e))
+            return False
         
-        for path in windows_paths:
-            if os.path.exists(path):
-                return path
+        with open(pdf_output_path, 'wb') as f:
+            f.write(pdf_bytes)
         
-        return None
+        events.info("pdf.generated", "PDF generated via persistent Chrome: {path} ({size_kb:.1f} KB)",
+                    path=pdf_output_path, size_kb=len(pdf_bytes) / 1024, renderer="persistent Chrome")
+        return True
+    
+    def _find_browser_command(self) -> Optional[str]:
+        """Find the best available browser, from the persisted discovery result when still valid"""
+        from browser_discovery import find_browser_path
+        return find_browser_path()
     
     def _create_print_html(self, html_path: str, pdf_output_path: str) -> bool:
         """Create an enhanced HTML file with print instructions"""
@@ -228,14 +217,14 @@ class SimpleHTMLPDFGenerator:
             with open(html_pdf_path, 'w', encoding='utf-8') as f:
                 f.write(enhanced_html)
             
-            print(f"[OK] Print-optimized HTML created: {html_pdf_path}")
-            print("[TIP] Open this file in your browser and print to PDF (Ctrl+P)")
-            print("   Set margins to 'None' and check 'Background graphics'")
+            events.info("html.created", "Print-optimized HTML created: {path}", path=html_pdf_path)
+            events.info("html.tip", "Open this file in your browser and print to PDF (Ctrl+P); "
+                        "set margins to 'None' and check 'Background graphics'")
             
             return True
             
         except Exception as e:
-            print(f"Error creating print HTML: {e}")
+            events.error("html.create_failed", "Error creating print HTML: {error}", error=str(e))
             return False
     
     def _add_print_enhancements(self, html_content: str) -> str:
@@ -368,17 +357,17 @@ class SimpleHTMLPDFGenerator:
     
     def validate_dependencies(self) -> bool:
         """Validate PDF generation capabilities"""
-        print("[CHECK] Checking PDF generation capabilities...")
+        events.debug("check.start", "Checking PDF generation capabilities...")
         
         browser_available = self._has_browser()
         
         if browser_available:
             browser_cmd = self._find_browser_command()
-            print(f"[OK] Browser found: {browser_cmd}")
+            events.info("check.browser", "Browser found: {path}", path=browser_cmd)
         else:
-            print("[WARN] No browser found for direct PDF generation")
+            events.warning("check.no_browser", "No browser found for direct PDF generation")
         
-        print("[OK] Print-optimized HTML generation available")
+        events.info("check.print_html", "Print-optimized HTML generation available")
         
         return True  # Always return True since we have fallback methods
 
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Stage Timing
+Lightweight per-stage spans for the resume pipeline, exported as JSON or Chrome trace events
+"""
+
+import os
+import json
+import time
+import functools
+import contextvars
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+# Trace collecting spans for the resume being generated in this context, if any
+_active_trace = contextvars.ContextVar('resume_trace', default=None)
+
+_NO_SPAN = nullcontext()
+
+class Trace:
+    """
+    Monotonic stage timings for one resume
+    
+    Spans nest; each records its offset from the start of the trace, its
+    duration and its nesting depth. A wall-clock anchor lets traces from
+    different worker processes share one timeline.
+    """
+    
+    def __init__(self, name: str, **metadata):
+        """
+        Initialize trace
+        
+        Args:
+            name: Label for the traced unit of work (e.g. job id or output file)
+            **metadata: Extra fields stored with the trace
+        """
+        self.name = name
+        self.metadata = metadata
+        self.pid = os.getpid()
+        self.wall_start = time.time()
+        self.perf_start = time.perf_counter()
+        self.spans = []
+        self._depth = 0
+    
+    @contextmanager
+    def span(self, stage: str, **args):
+        """Time the enclosed block as one stage"""
+        started = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record = {
+                "name": stage,
+                "start": round(started - self.perf_start, 6),
+                "seconds": round(time.perf_counter() - started, 6),
+                "depth": self._depth
+            }
+            if args:
+                record["args"] = args
+            self.spans.append(record)
+    
+    def stage_totals(self) -> Dict[str, float]:
+        """Total seconds per stage name"""
+        totals = {}
+        for record in self.spans:
+            totals[record["name"]] = round(totals.get(record["name"], 0.0) + record["seconds"], 6)
+        return totals
+    
+    def to_dict(self) -> dict:
+        """JSON-serializable trace with spans in start order"""
+        return {
+            "name": self.name,
+            "pid": self.pid,
+            "wall_start": self.wall_start,
+            "total_seconds": round(time.perf_counter() - self.perf_start, 6),
+            "metadata": self.metadata,
+            "stages": self.stage_totals(),
+            "spans": sorted(self.spans, key=lambda record: (record["start"], record["depth"]))
+        }
+    
+    def write_json(self, path: str):
+        """Write this trace as JSON"""
+        write_json_trace(self.to_dict(), path)
+
+@contextmanager
+def activate(trace: Optional[Trace]):
+    """Collect spans into trace for the duration of the block"""
+    token = _active_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _active_trace.reset(token)
+
+def current_trace() -> Optional[Trace]:
+    """Trace collecting spans in this context, or None"""
+    return _active_trace.get()
+
+def span(stage: str, **args):
+    """
+    Time a block as a stage of the active trace
+    
+    Costs a context variable lookup when no trace is active.
+    
+    Args:
+        stage: Stage name
+        **args: Extra details stored with the span
+    """
+    trace = _active_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return trace.span(stage, **args)
+
+def traced(stage: str):
+    """Decorator recording each call of a function as a stage of the active trace"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _active_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def write_json_trace(trace: dict, path: str):
+    """Write one trace dict as JSON, creating the directory"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace, f, indent=2)
+
+def chrome_trace_events(trace: dict) -> List[dict]:
+    """
+    Convert a trace dict to Chrome trace "complete" events
+    
+    Args:
+        trace: Trace.to_dict() output (possibly from another process)
+    
+    Returns:
+        list: Events for chrome://tracing / Perfetto, microsecond timestamps
+    """
+    events = []
+    for record in trace["spans"]:
+        event = {
+            "name": record["name"],
+            "cat": "resume",
+            "ph": "X",
+            "ts": round((trace["wall_start"] + record["start"]) * 1e6),
+            "dur": round(record["seconds"] * 1e6),
+            "pid": trace["pid"],
+            "tid": trace["pid"],
+            "args": dict(record.get("args", {}), resume=trace["name"])
+        }
+        events.append(event)
+    return events
+
+def write_chrome_trace(traces: List[dict], path: str):
+    """
+    Write several traces (e.g. a batch run) as one Chrome trace file
+    
+    Each worker process becomes its own track, labelled with its pid.
+    
+    Args:
+        traces: Trace dicts
+        path: Output .json path, loadable in chrome://tracing or Perfetto
+    """
+    events = []
+    for pid in sorted({trace["pid"] for trace in traces}):
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": pid,
+                       "args": {"name": f"resume worker {pid}"}})
+    for trace in traces:
+        events.extend(chrome_trace_events(trace))
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Template Environment
+Shared Jinja environment with an on-disk bytecode cache, so new processes skip template compilation
+
+Usage:
+    python modules/template_env.py    # precompile every template ahead of time
+"""
+
+import os
+import sys
+import json
+import hashlib
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+
+from cache_paths import PROJECT_ROOT, get_cache_dir
+from template_renderer import FragmentRenderer, INVARIANT_BLOCKS, find_block_inputs
+import events
+
+TEMPLATE_DIR = os.path.join(PROJECT_ROOT, 'templates')
+DEFAULT_TEMPLATE = 'resume_template.html'
+
+# Bump when find_block_inputs changes so stored block analyses are recomputed
+BLOCK_INPUTS_VERSION = 1
+
+_environments = {}
+_renderers = {}
+
+def get_environment(template_dir: Optional[str] = None, autoescape: bool = True) -> Environment:
+    """
+    Return the process-wide environment for a template directory
+    
+    Compiled templates are stored in .cache/jinja, so only the first process
+    after a template edit compiles it. Escaping is part of the compiled code,
+    which is why each autoescape setting gets its own environment and cache.
+    
+    Args:
+        template_dir: Directory containing templates (default: <project>/templates)
+        autoescape: Escape HTML/XML templates (HTMLResumeGenerator) or render raw (generate_dynamic_resume)
+    
+    Returns:
+        Environment shared by every caller with the same arguments
+    """
+    template_dir = os.path.abspath(template_dir or TEMPLATE_DIR)
+    key = (template_dir, autoescape)
+    
+    if key not in _environments:
+        cache_dir = get_cache_dir(os.path.join('jinja', 'autoescape' if autoescape else 'raw'))
+        _environments[key] = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(['html', 'xml']) if autoescape else False,
+            bytecode_cache=FileSystemBytecodeCache(cache_dir)
+        )
+    
+    return _environments[key]
+
+def get_fragment_renderer(template_name: str = DEFAULT_TEMPLATE,
+                          template_dir: Optional[str] = None,
+                          autoescape: bool = True) -> FragmentRenderer:
+    """
+    Return a FragmentRenderer for a template, rebuilt when the template file changes
+    
+    The block analysis is stored next to the bytecode, keyed by the template
+    source, so a warm process never parses the template either.
+    
+    Args:
+        template_name: Template file name inside template_dir
+        template_dir: Directory containing templates (default: <project>/templates)
+        autoescape: As for get_environment
+    
+    Returns:
+        FragmentRenderer shared by every caller with the same arguments
+    """
+    environment = get_environment(template_dir, autoescape)
+    template = environment.get_template(template_name)
+    
+    key = (id(environment), template_name)
+    renderer = _renderers.get(key)
+    if renderer is None or renderer.template is not template:
+        source = environment.loader.get_source(environment, template_name)[0]
+        renderer = FragmentRenderer(template, block_inputs=_load_block_inputs(environment, source))
+        _renderers[key] = renderer
+    
+    return renderer
+
+def _load_block_inputs(environment: Environment, source: str) -> Dict[str, List[str]]:
+    """find_block_inputs, read from .cache/jinja when this source was analyzed before"""
+    digest = hashlib.sha256(f"{BLOCK_INPUTS_VERSION}:{','.join(INVARIANT_BLOCKS)}:{source}".encode('utf-8')).hexdigest()
+    cache_path = os.path.join(get_cache_dir('jinja'), f"blocks-{digest[:16]}.json")
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    block_inputs = find_block_inputs(environment, source)
+    try:
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(block_inputs, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        events.warning("template.cache_write_failed", "Could not write template block cache: {error}", error=str(e))
+    
+    return block_inputs
+
+def precompile_templates(template_dir: Optional[str] = None) -> int:
+    """
+    Compile every template into the bytecode cache ahead of time
+    
+    Args:
+        template_dir: Directory containing templates (default: <project>/templates)
+    
+    Returns:
+        int: Number of templates compiled, counting each autoescape setting
+    """
+    compiled = 0
+    for autoescape in (True, False):
+        environment = get_environment(template_dir, autoescape)
+        for template_name in environment.list_templates(extensions=['html', 'xml']):
+            get_fragment_renderer(template_name, template_dir, autoescape)
+            compiled += 1
+    return compiled
+
+def main():
+    """Precompile templates from the command line"""
+    template_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    compiled = precompile_templates(template_dir)
+    print(f"[OK] Precompiled {compiled} template(s) into {get_cache_dir('jinja')}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
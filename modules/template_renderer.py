@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Template Renderer
+Renders the resume template with its JD-invariant blocks cached between resumes
+"""
+
+import json
+from collections import Counter
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, Template, nodes
+
+# Template blocks whose output does not depend on the JD. The template marks each
+# section with {% block <name> %}; blocks it does not declare are rendered normally.
+INVARIANT_BLOCKS = ('header', 'contact', 'photo', 'languages', 'education')
+
+# Distinct resume versions kept per renderer before the fragment cache is cleared
+MAX_FRAGMENTS = 64
+
+class FragmentRenderer:
+    """
+    Jinja template renderer that reuses invariant block output
+    
+    Each cacheable block is keyed on the values of exactly the variables it
+    reads, found from the template AST, so a fragment is rendered once per
+    source-resume version and stitched into every later render. Blocks that
+    read variables assigned elsewhere in the template are never cached.
+    """
+    
+    def __init__(self, template: Template, source: Optional[str] = None, cached_blocks=INVARIANT_BLOCKS,
+                 block_inputs: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize renderer
+        
+        Args:
+            template: Compiled resume template
+            source: Template source, parsed once to find each block's inputs
+            cached_blocks: Names of blocks safe to render once per resume version
+            block_inputs: Result of find_block_inputs, to skip parsing the source
+        """
+        self.template = template
+        if block_inputs is None:
+            block_inputs = find_block_inputs(template.environment, source, cached_blocks)
+        self.block_inputs = block_inputs
+        self._fragments = {}
+    
+    def render(self, **variables) -> str:
+        """
+        Render the full template, reusing cached invariant blocks
+        
+        Args:
+            **variables: Template variables, as for Template.render
+        
+        Returns:
+            str: Rendered HTML, identical to template.render(**variables)
+        """
+        if not self.block_inputs:
+            return self.template.render(**variables)
+        
+        context = self.template.new_context(variables)
+        for name, inputs in self.block_inputs.items():
+            html = self._fragment(name, inputs, variables)
+            context.blocks[name] = [lambda _context, html=html: (html,)]
+        
+        return self.template.environment.concat(self.template.root_render_func(context))
+    
+    def _fragment(self, name: str, inputs: List[str], variables: Dict) -> str:
+        """Rendered output of one invariant block for these variable values"""
+        key = (name, json.dumps({var: variables.get(var) for var in inputs}, sort_keys=True, default=repr))
+        html = self._fragments.get(key)
+        if html is None:
+            if len(self._fragments) >= MAX_FRAGMENTS * len(self.block_inputs):
+                self._fragments.clear()
+            block = self.template.blocks[name]
+            html = self.template.environment.concat(block(self.template.new_context(variables)))
+            self._fragments[key] = html
+        return html
+
+def find_block_inputs(environment: Environment, source: str, cached_blocks=INVARIANT_BLOCKS) -> Dict[str, List[str]]:
+    """
+    Map each cacheable block to the template variables it reads
+    
+    Args:
+        environment: Environment the template is compiled in
+        source: Template source
+        cached_blocks: Candidate block names
+    
+    Returns:
+        dict: {block name: sorted variable names} for blocks that can be cached
+    """
+    ast = environment.parse(source)
+    
+    # Names defined elsewhere in the template ({% set %}, macros, imports, loop variables)
+    # live in the render context rather than the variables, so blocks reading them are not cached
+    defined = Counter(_defined_names(ast))
+    
+    # Blocks inside loops depend on the loop variable; blocks wrapping other blocks would hide them
+    looped = {id(block) for loop in ast.find_all(nodes.For) for block in loop.find_all(nodes.Block)}
+    
+    inputs = {}
+    for block in ast.find_all(nodes.Block):
+        if block.name not in cached_blocks or id(block) in looped or any(block.find_all(nodes.Block)):
+            continue
+        own = Counter(_defined_names(block))
+        loaded = {name.name for name in block.find_all(nodes.Name) if name.ctx == 'load'} - set(own)
+        if loaded & set(defined - own):
+            continue
+        inputs[block.name] = sorted(loaded)
+    return inputs
+
+
+def _defined_names(node: nodes.Node) -> List[str]:
+    """Every name a template node assigns, once per assignment"""
+    names = []
+    for child in node.find_all((nodes.Name, nodes.Macro, nodes.Import, nodes.FromImport)):
+        if isinstance(child, nodes.Name):
+            if child.ctx in ('store', 'param'):
+                names.append(child.name)
+        elif isinstance(child, nodes.Macro):
+            names.append(child.name)
+        elif isinstance(child, nodes.Import):
+            names.append(child.target)
+        else:
+            names.extend(name[1] if isinstance(name, tuple) else name for name in child.names)
+    return names
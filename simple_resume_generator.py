@@ -14,8 +14,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
 
 try:
     from modules.simple_html_pdf import SimpleHTMLPDFGenerator
-    from modules.html_generator import HTMLResumeGenerator
-    from modules.html_content_processor import HTMLContentProcessor
 except ImportError as e:
     print(f"❌ Error importing modules: {e}")
     print("💡 Make sure Jinja2 is installed: pip install jinja2")
@@ -28,8 +26,21 @@ class SimpleResumeGenerator:
     
     def __init__(self):
         self.pdf_generator = SimpleHTMLPDFGenerator()
-        self.html_generator = HTMLResumeGenerator()
-        self.content_processor = HTMLContentProcessor()
+    
+    @property
+    def html_generator(self):
+        """Markdown-to-HTML generator, shared with the PDF generator and imported on first use"""
+        try:
+            return self.pdf_generator.html_generator
+        except ImportError as e:
+            print(f"❌ Error importing modules: {e}")
+            print("💡 Make sure Jinja2 is installed: pip install jinja2")
+            sys.exit(1)
+    
+    @property
+    def content_processor(self):
+        """Content processor shared with the HTML generator"""
+        return self.html_generator.content_processor
     
     def generate_resume(self, 
                        markdown_path: str, 